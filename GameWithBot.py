@@ -1,11 +1,12 @@
-"""Run a trained PPO model inside the live game window for visual inspection."""
+"""Run a trained PPO model (or the search planner) inside the live game window for visual inspection."""
 
 import argparse
 from pathlib import Path
 
-from stable_baselines3 import PPO
-
+from rl.numpy_policy import load_policy
 from rl.pirate_game_env import PirateGameEnv
+from rl.planner import PLANNER_ALGORITHMS, PlannerConfig, SearchPlanner
+from rl.profiling import enable_process_profiling
 
 
 def parse_args():
@@ -13,7 +14,13 @@ def parse_args():
     parser.add_argument(
         "--model-path",
         default="runs/ppo_easy_proof/checkpoints/best_model.zip",
-        help="Path to a PPO .zip checkpoint (best_model.zip, final_model.zip, ...)",
+        help="Path to a PPO .zip checkpoint (best_model.zip, final_model.zip, ...) or exported .npz policy",
+    )
+    parser.add_argument(
+        "--policy-backend",
+        default="auto",
+        choices=["auto", "sb3", "numpy"],
+        help="Inference backend; 'auto' uses NumPy for .npz files (no torch import) and SB3 otherwise.",
     )
     parser.add_argument("--level-path", default="level_easy.txt", help="Level file to play")
     parser.add_argument("--action-preset", default="simple", choices=["forward", "simple", "full"])
@@ -25,6 +32,25 @@ def parse_args():
         action="store_true",
         help="Auto-restart after episode end.",
     )
+    parser.add_argument(
+        "--profile",
+        default="off",
+        choices=["off", "cprofile", "sampling"],
+        help="Profile the game loop into --profile-dir (.prof and collapsed stacks).",
+    )
+    parser.add_argument("--profile-dir", default="profiles")
+    parser.add_argument("--profile-start", type=int, default=0, help="Env step at which profiling starts.")
+    parser.add_argument("--profile-steps", type=int, default=0, help="Env steps to profile; 0 = until the game is closed.")
+    parser.add_argument(
+        "--planner",
+        default="off",
+        choices=["off", *PLANNER_ALGORITHMS],
+        help="Let the search planner play instead of the model (--model-path is then ignored).",
+    )
+    parser.add_argument("--planner-budget", type=int, default=300, help="Simulated env steps per planning decision.")
+    parser.add_argument("--planner-horizon", type=int, default=8, help="Macro actions searched ahead.")
+    parser.add_argument("--planner-macro-steps", type=int, default=3, help="Env steps each macro action is held.")
+    parser.add_argument("--planner-beam-width", type=int, default=4)
     action_group = parser.add_mutually_exclusive_group()
     action_group.add_argument(
         "--deterministic",
@@ -43,12 +69,17 @@ def parse_args():
 
 
 def run_ppo_bot(args):
-    """Load one PPO checkpoint and execute it episode-by-episode."""
+    """Load one PPO checkpoint (or set up the planner) and execute it episode-by-episode."""
 
     model_path = Path(args.model_path)
-    if not model_path.exists():
+    if args.planner == "off" and not model_path.exists():
         raise FileNotFoundError(f"Model file not found: {model_path}")
 
+    if args.profile != "off":
+        stop = args.profile_start + args.profile_steps if args.profile_steps > 0 else None
+        enable_process_profiling(
+            args.profile, args.profile_dir, args.profile_start, stop, name="bot", include_current=True
+        )
     env = PirateGameEnv(
         level_path=args.level_path,
         headless=False,
@@ -57,9 +88,20 @@ def run_ppo_bot(args):
         frame_skip=args.frame_skip,
         action_preset=args.action_preset,
         obs_profile=args.obs_profile,
+        sim_clock=args.planner != "off",
     )
 
-    model = PPO.load(str(model_path), device="cpu")
+    if args.planner != "off":
+        config = PlannerConfig(
+            algorithm=args.planner,
+            budget=args.planner_budget,
+            horizon=args.planner_horizon,
+            macro_steps=args.planner_macro_steps,
+            beam_width=args.planner_beam_width,
+        )
+        model = SearchPlanner(env, config)
+    else:
+        model = load_policy(str(model_path), backend=args.policy_backend)
 
     try:
         obs, _ = env.reset()
@@ -0,0 +1,73 @@
+"""Check level files for solvability before spending training steps on them."""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+
+from rl.level_analysis import collect_level_paths, validate_levels
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Analyze level files for reachability of the chest.")
+    parser.add_argument("paths", nargs="+", help="Level files and/or directories containing level files.")
+    parser.add_argument("--pattern", default="level*.txt", help="Glob used inside directories.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel analyzer processes.")
+    parser.add_argument("--cache-dir", default=".level_cache", help="Directory for cached reports (by content hash).")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write cached reports.")
+    parser.add_argument("--json", action="store_true", help="Print one JSON report per line instead of a table.")
+    parser.add_argument(
+        "--fail-on-unsolvable",
+        action="store_true",
+        help="Exit with status 1 if any level is not solvable (stomp-only routes count as unsolvable).",
+    )
+    return parser.parse_args()
+
+
+def format_report(report):
+    if report.error and not report.solvable:
+        return f"{report.level_path}: ERROR {report.error}"
+    if not report.solvable:
+        return (
+            f"{report.level_path}: {report.verdict.upper()} "
+            f"(max reachable x={report.max_reachable_x:.0f}/{report.level_width:.0f}, "
+            f"reachable tiles={report.reachable_tiles}, enemies={report.enemies})"
+        )
+    gap = report.hardest_gap
+    gap_text = "none"
+    if gap is not None:
+        gap_text = (
+            f"{gap['gap_tiles']} tiles, rise {gap['rise_tiles']}, "
+            f"span {gap['span_px']}px ({gap['span_ratio']:.0%} of flat jump) at {gap['from_tile']}"
+        )
+    source = "cached" if report.cached else f"{report.elapsed_ms:.1f}ms"
+    return f"{report.level_path}: OK min_jumps={report.min_jumps} hardest_gap={gap_text} [{source}]"
+
+
+def main():
+    args = parse_args()
+    level_paths = collect_level_paths(args.paths, pattern=args.pattern)
+    if not level_paths:
+        raise FileNotFoundError(f"No level files found in: {args.paths}")
+
+    reports = validate_levels(
+        level_paths,
+        workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        use_cache=not args.no_cache,
+    )
+    for report in reports:
+        if args.json:
+            print(json.dumps({**asdict(report), "verdict": report.verdict}))
+        else:
+            print(format_report(report))
+
+    unsolvable = [report for report in reports if not report.solvable]
+    if not args.json:
+        print(f"Levels: {len(reports)} | solvable: {len(reports) - len(unsolvable)} | unsolvable: {len(unsolvable)}")
+    if args.fail_on_unsolvable and unsolvable:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
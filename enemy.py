@@ -20,9 +20,10 @@
 
 
 import pygame
-from pygame import *
 from loguru import logger
 
+_sprite_cache = {}  # (right sprites, left sprites) per (width, height), loaded once per process on first use
+
 
 class Enemy(pygame.sprite.Sprite):
     """Enemy:
@@ -130,11 +131,18 @@ class Enemy(pygame.sprite.Sprite):
 
         """
 
+        cached_sprites = _sprite_cache.get((self.__width, self.__height))
+        if cached_sprites is not None:     #reuse sprites already loaded by an earlier enemy
+            self.__runRightSprites.extend(cached_sprites[0])
+            self.__runLeftSprites.extend(cached_sprites[1])
+            return
+
         for image in range(3):
             enemy = pygame.image.load('img/enemy_img/e1_r' + str(image) + '.png')
             self.__runRightSprites.append(pygame.transform.scale(enemy, (self.__width, self.__height)))
             enemy = pygame.image.load('img/enemy_img/e1_l' + str(image) + '.png')
             self.__runLeftSprites.append(pygame.transform.scale(enemy, (self.__width, self.__height)))  
+        _sprite_cache[(self.__width, self.__height)] = (list(self.__runRightSprites), list(self.__runLeftSprites))
 
 
     def movement(self):
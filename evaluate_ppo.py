@@ -2,19 +2,31 @@
 
 import argparse
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from pathlib import Path
 import statistics
 
+import numpy as np
 from loguru import logger
-from stable_baselines3 import PPO
 
+from rl.numpy_policy import load_policy, resolve_policy_backend
 from rl.pirate_game_env import PirateGameEnv
+from rl.planner import PLANNER_ALGORITHMS, PlannerConfig, SearchPlanner
+from rl.profiling import enable_process_profiling
 
 logger.remove()
 
 
 def parse_args():
-    parser = argparse.ArgumentParser(description="Evaluate a PPO model over multiple episodes.")
-    parser.add_argument("--model-path", required=True, help="Path to PPO .zip model file.")
+    parser = argparse.ArgumentParser(description="Evaluate a PPO model (or the search planner) over multiple episodes.")
+    parser.add_argument("--model-path", default=None, help="Path to PPO .zip model file or exported .npz policy.")
+    parser.add_argument(
+        "--policy-backend",
+        default="auto",
+        choices=["auto", "sb3", "numpy"],
+        help="Inference backend; 'auto' uses NumPy for .npz files and SB3 otherwise.",
+    )
     parser.add_argument("--level-path", default="level_medium.txt")
     parser.add_argument("--action-preset", default="simple", choices=["forward", "simple", "full"])
     parser.add_argument("--obs-profile", default="balanced", choices=["balanced", "legacy"])
@@ -22,17 +34,50 @@ def parse_args():
     parser.add_argument("--max-episode-steps", type=int, default=1800)
     parser.add_argument("--episodes", type=int, default=50)
     parser.add_argument("--seed-start", type=int, default=0, help="First seed; each episode uses seed_start + i.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of evaluation processes.")
+    parser.add_argument(
+        "--envs-per-worker",
+        type=int,
+        default=1,
+        help="Environments stepped together per worker; their observations share one predict call.",
+    )
+    parser.add_argument(
+        "--profile",
+        default="off",
+        choices=["off", "cprofile", "sampling"],
+        help="Profile each evaluation process into --profile-dir (.prof and collapsed stacks).",
+    )
+    parser.add_argument("--profile-dir", default="profiles")
+    parser.add_argument("--profile-start", type=int, default=0, help="Env step (per process) at which profiling starts.")
+    parser.add_argument("--profile-steps", type=int, default=0, help="Env steps to profile per process; 0 = until the end.")
+    parser.add_argument(
+        "--planner",
+        default="off",
+        choices=["off", *PLANNER_ALGORITHMS],
+        help="Play with the search planner instead of a model (reference win rate, demonstrations).",
+    )
+    parser.add_argument("--planner-budget", type=int, default=300, help="Simulated env steps per planning decision.")
+    parser.add_argument("--planner-horizon", type=int, default=8, help="Macro actions searched ahead.")
+    parser.add_argument("--planner-macro-steps", type=int, default=3, help="Env steps each macro action is held.")
+    parser.add_argument("--planner-beam-width", type=int, default=4)
+    parser.add_argument(
+        "--save-demos",
+        default=None,
+        metavar="PATH",
+        help="Write every episode's observations/actions to this .npz (e.g. planner demonstrations).",
+    )
     mode = parser.add_mutually_exclusive_group()
     mode.add_argument("--deterministic", dest="deterministic", action="store_true")
     mode.add_argument("--stochastic", dest="deterministic", action="store_false")
     parser.set_defaults(deterministic=True)
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.planner == "off" and not args.model_path:
+        parser.error("--model-path is required unless --planner is set")
+    return args
 
 
-def main():
-    args = parse_args()
-    model = PPO.load(args.model_path, device="cpu")
-    env = PirateGameEnv(
+def make_eval_env(args):
+    return PirateGameEnv(
         level_path=args.level_path,
         headless=True,
         render_mode="none",
@@ -40,8 +85,127 @@ def main():
         frame_skip=args.frame_skip,
         action_preset=args.action_preset,
         obs_profile=args.obs_profile,
+        # The planner needs frame-based cooldowns so its cloned lookahead matches the real game.
+        sim_clock=args.planner != "off",
     )
 
+
+def load_model(args, seed=None):
+    return load_policy(args.model_path, backend=args.policy_backend, seed=seed)
+
+
+def make_planner(args, env, seed=0):
+    config = PlannerConfig(
+        algorithm=args.planner,
+        budget=args.planner_budget,
+        horizon=args.planner_horizon,
+        macro_steps=args.planner_macro_steps,
+        beam_width=args.planner_beam_width,
+        seed=seed,
+    )
+    return SearchPlanner(env, config)
+
+
+def run_episodes(args, episode_ids, model=None):
+    """Play the given episode ids with `--envs-per-worker` envs and batched predictions.
+
+    Returns one record per episode; records are independent of scheduling order,
+    so results from several workers can be merged by episode id.
+    """
+
+    episode_ids = list(episode_ids)
+    if not episode_ids:
+        return []
+    if model is None and args.planner == "off":
+        model = load_model(args, seed=args.seed_start + episode_ids[0])
+
+    envs = [make_eval_env(args) for _ in range(max(1, min(int(args.envs_per_worker), len(episode_ids))))]
+    planners = [make_planner(args, env, args.seed_start + episode_ids[0]) for env in envs] if args.planner != "off" else None
+    pending = list(reversed(episode_ids))
+    active = {}
+    records = []
+
+    def start_episode(env_index):
+        episode = pending.pop()
+        obs, _ = envs[env_index].reset(seed=args.seed_start + episode)
+        active[env_index] = {
+            "episode": episode,
+            "obs": obs,
+            "reward": 0.0,
+            "actions": Counter(),
+            "trajectory": [] if args.save_demos else None,
+        }
+        if planners is not None:
+            planners[env_index].reset()
+
+    try:
+        for env_index in range(len(envs)):
+            start_episode(env_index)
+
+        while active:
+            env_indices = sorted(active)
+            if planners is not None:
+                actions = [planners[env_index].act() for env_index in env_indices]
+            else:
+                batch = np.stack([active[env_index]["obs"] for env_index in env_indices])
+                actions, _ = model.predict(batch, deterministic=args.deterministic)
+            for env_index, action in zip(env_indices, np.asarray(actions).reshape(-1)):
+                state = active[env_index]
+                action = int(action)
+                state["actions"][action] += 1
+                if state["trajectory"] is not None:
+                    state["trajectory"].append((state["obs"], action))
+                obs, reward, terminated, truncated, info = envs[env_index].step(action)
+                state["obs"] = obs
+                state["reward"] += float(reward)
+                if not (terminated or truncated):
+                    continue
+
+                records.append(
+                    {
+                        "episode": state["episode"],
+                        "reward": state["reward"],
+                        "is_win": bool(info.get("is_win")),
+                        "is_dead": bool(info.get("is_dead")),
+                        "progress": float(info.get("max_progress_x", 0.0)),
+                        "length": int(info.get("step_count", 0)),
+                        "actions": dict(state["actions"]),
+                        "trajectory": state["trajectory"],
+                    }
+                )
+                del active[env_index]
+                if pending:
+                    start_episode(env_index)
+    finally:
+        for env in envs:
+            env.close()
+    return records
+
+
+def _worker_run_episodes(args, episode_ids):
+    if args.planner == "off" and resolve_policy_backend(args.model_path, args.policy_backend) == "sb3":
+        import torch
+
+        torch.set_num_threads(1)
+    logger.remove()
+    return run_episodes(args, episode_ids)
+
+
+def run_parallel(args):
+    """Spread episodes round-robin over a spawn-based process pool."""
+
+    workers = max(1, min(int(args.workers), int(args.episodes)))
+    chunks = [list(range(worker, args.episodes, workers)) for worker in range(workers)]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        results = pool.map(_worker_run_episodes, [args] * workers, chunks)
+        return [record for chunk in results for record in chunk]
+
+
+def summarize(args, records):
+    """Print the evaluation summary; records are merged in episode order first."""
+
+    records = sorted(records, key=lambda record: record["episode"])
     wins = 0
     deaths = 0
     truncations = 0
@@ -51,36 +215,23 @@ def main():
     action_hist = Counter()
     death_bins = Counter()
 
-    for episode in range(args.episodes):
-        obs, _ = env.reset(seed=args.seed_start + episode)
-        done = False
-        total_reward = 0.0
-        info = {}
-        while not done:
-            action, _ = model.predict(obs, deterministic=args.deterministic)
-            action = int(action)
-            action_hist[action] += 1
-            obs, reward, terminated, truncated, info = env.step(action)
-            total_reward += float(reward)
-            done = terminated or truncated
-
-        wins += int(bool(info.get("is_win")))
-        is_dead = bool(info.get("is_dead"))
+    for record in records:
+        action_hist.update(record["actions"])
+        wins += int(record["is_win"])
+        is_dead = record["is_dead"]
         deaths += int(is_dead)
-        truncations += int((not bool(info.get("is_win"))) and (not is_dead))
-        rewards.append(total_reward)
-        final_progress = float(info.get("max_progress_x", 0.0))
+        truncations += int((not record["is_win"]) and (not is_dead))
+        rewards.append(record["reward"])
+        final_progress = record["progress"]
         progress.append(final_progress)
-        episode_lengths.append(int(info.get("step_count", 0)))
+        episode_lengths.append(record["length"])
         if is_dead:
             death_bins[int(final_progress // 600)] += 1
 
-    env.close()
-
     total_actions = sum(action_hist.values())
     max_action_share = max((count / max(1, total_actions) for count in action_hist.values()), default=0.0)
 
-    print(f"Model: {args.model_path}")
+    print(f"Model: {args.model_path}" if args.planner == "off" else f"Planner: {args.planner} (budget {args.planner_budget})")
     print(f"Episodes: {args.episodes}")
     print(
         f"Win rate: {wins / max(1, args.episodes):.3f} "
@@ -96,5 +247,40 @@ def main():
     print(f"Top death bins (600px): {death_bins.most_common(10)}")
 
 
+def save_demos(path, records):
+    """Flat (observation, action) arrays in episode order, with each step's episode id and outcome."""
+
+    records = sorted(records, key=lambda record: record["episode"])
+    steps = [(record, obs, action) for record in records for obs, action in record["trajectory"]]
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        observations=np.asarray([obs for _, obs, _ in steps], dtype=np.float32).reshape(len(steps), -1),
+        actions=np.asarray([action for _, _, action in steps], dtype=np.int64),
+        episodes=np.asarray([record["episode"] for record, _, _ in steps], dtype=np.int64),
+        episode_wins=np.asarray([record["is_win"] for record, _, _ in steps], dtype=bool),
+    )
+
+
+def main():
+    args = parse_args()
+    if args.profile != "off":
+        stop = args.profile_start + args.profile_steps if args.profile_steps > 0 else None
+        # Spawned workers inherit the request and write one file per process.
+        enable_process_profiling(
+            args.profile, args.profile_dir, args.profile_start, stop, name="eval", include_current=True
+        )
+    if args.workers > 1:
+        records = run_parallel(args)
+    else:
+        records = run_episodes(args, range(args.episodes))
+    summarize(args, records)
+    if args.save_demos:
+        save_demos(args.save_demos, records)
+        print(f"Demonstrations written to: {args.save_demos}")
+    if args.profile != "off":
+        print(f"Profiles written to: {args.profile_dir}")
+
+
 if __name__ == "__main__":
     main()
@@ -1,15 +1,55 @@
 import argparse
+import csv
+import os
 from pathlib import Path
 from typing import Optional
 
-import matplotlib.pyplot as plt
-import pandas as pd
-
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Export training metrics to PNG plots.")
     parser.add_argument("--run-dir", default=None, help="Path to one run directory (e.g. runs/ppo_YYYYMMDD_HHMMSS).")
     parser.add_argument("--window", type=int, default=50, help="Rolling window for smoothed curves.")
+    parser.add_argument(
+        "--source",
+        default="auto",
+        choices=["auto", "csv", "columnar"],
+        help="Episode log to read; 'auto' prefers the columnar log when present.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only read rows appended since the last export and plot decimated series (for live dashboards).",
+    )
+    parser.add_argument(
+        "--max-points",
+        type=int,
+        default=2000,
+        help="Maximum points drawn per series (incremental and compare modes).",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=1_000_000,
+        help="Incremental mode: rows read per chunk.",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="+",
+        default=None,
+        metavar="GLOB",
+        help="Compare every run matching these globs (e.g. 'runs/ppo_*'); curriculum stages are included.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="runs/comparison",
+        help="Compare mode: directory for overlay plots and the summary table.",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Compare mode: loader processes.")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Incremental mode: discard saved export state and reprocess the whole log.",
+    )
     return parser.parse_args()
 
 
@@ -22,7 +62,54 @@ def resolve_run_dir(run_dir: Optional[str]):
     return runs[-1]
 
 
+def resolve_metrics_dir(run_dir: Path):
+    """Return the metrics directory of a run, falling back to the latest curriculum stage."""
+
+    metrics_dir = run_dir / "metrics"
+    if has_episode_log(metrics_dir):
+        return metrics_dir
+    for stage in ["curriculum_full", "curriculum_medium", "curriculum_easy"]:
+        stage_dir = run_dir / stage / "metrics"
+        if has_episode_log(stage_dir):
+            return stage_dir
+    # --curriculum-levels stages are numbered, so the last one sorts last.
+    for stage_dir in sorted(run_dir.glob("curriculum_[0-9]*/metrics"), reverse=True):
+        if has_episode_log(stage_dir):
+            return stage_dir
+    return metrics_dir
+
+
+def has_episode_log(metrics_dir: Path):
+    from rl.episode_log import columnar_log_exists
+
+    return (metrics_dir / "episodes.csv").exists() or columnar_log_exists(str(metrics_dir / "episodes.cols"))
+
+
+def load_episodes(metrics_dir: Path, source: str = "auto"):
+    import pandas as pd
+
+    from rl.episode_log import ColumnarEpisodeReader, columnar_log_exists
+
+    columnar_dir = metrics_dir / "episodes.cols"
+    csv_file = metrics_dir / "episodes.csv"
+    if source == "columnar" or (source == "auto" and columnar_log_exists(str(columnar_dir))):
+        if not columnar_log_exists(str(columnar_dir)):
+            raise FileNotFoundError(f"Columnar metrics log not found: {columnar_dir}")
+        df = ColumnarEpisodeReader(str(columnar_dir)).to_dataframe()
+        metrics_file = columnar_dir
+    else:
+        if not csv_file.exists():
+            raise FileNotFoundError(f"Metrics file not found: {csv_file}")
+        df = pd.read_csv(csv_file)
+        metrics_file = csv_file
+    if df.empty:
+        raise ValueError(f"Metrics file is empty: {metrics_file}")
+    return df
+
+
 def plot_curve(df, value_col, out_path: Path, title: str, y_label: str, window: int):
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 5))
     x = range(1, len(df) + 1)
     plt.plot(x, df[value_col], alpha=0.35, label=value_col)
@@ -36,29 +123,166 @@ def plot_curve(df, value_col, out_path: Path, title: str, y_label: str, window:
     plt.close()
 
 
+def plot_decimated(raw, rolling, out_path: Path, title: str, y_label: str, window: int, label: str):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 5))
+    plt.fill_between(raw.x(), raw.mins, raw.maxs, alpha=0.2, step="mid", label=f"{label} (min/max)")
+    plt.plot(raw.x(), raw.means(), alpha=0.35, label=label)
+    plt.plot(rolling.x(), rolling.means(), label=f"rolling_mean_{window}")
+    plt.title(title)
+    plt.xlabel("Episode")
+    plt.ylabel(y_label)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(out_path)
+    plt.close()
+
+
+def write_summary(summary_path: Path, stats):
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as file_obj:
+        file_obj.write("# Training Metrics Summary\n\n")
+        file_obj.write(f"- Episodes: {stats['episodes']}\n")
+        file_obj.write(f"- Mean reward: {stats['mean_reward']:.2f}\n")
+        file_obj.write(f"- Mean episode length: {stats['mean_length']:.2f}\n")
+        file_obj.write(f"- Mean success rate: {stats['success_rate']:.2%}\n")
+        file_obj.write(f"- Mean max progress x: {stats['mean_progress']:.2f}\n")
+
+
+def export_incremental(args, metrics_dir: Path, plots_dir: Path):
+    """Fold new episode rows into saved state, then redraw bounded-size plots."""
+
+    import matplotlib.pyplot as plt
+
+    from rl.metrics_incremental import IncrementalMetricsExporter
+
+    exporter = IncrementalMetricsExporter(
+        str(metrics_dir),
+        window=args.window,
+        max_points=args.max_points,
+        chunk_rows=args.chunk_rows,
+        source=args.source,
+    )
+    if args.rebuild:
+        exporter.reset()
+    new_rows = exporter.update()
+    exporter.save_state()
+    if exporter.state["episodes"] == 0:
+        raise ValueError(f"Metrics log is empty in: {metrics_dir}")
+
+    for value_col, file_name, title, y_label in [
+        ("episode_reward", "reward_curve.png", "Episode Reward", "Reward"),
+        ("episode_length", "episode_length.png", "Episode Length", "Steps"),
+        ("max_progress_x", "progress_x.png", "Max Progress X", "X position"),
+    ]:
+        raw, rolling = exporter.series(value_col)
+        plot_decimated(raw, rolling, plots_dir / file_name, title, y_label, args.window, value_col)
+
+    _, success = exporter.series("is_win")
+    plt.figure(figsize=(10, 5))
+    plt.plot(success.x(), success.means())
+    plt.ylim(0.0, 1.0)
+    plt.title(f"Success Rate (rolling {args.window})")
+    plt.xlabel("Episode")
+    plt.ylabel("Success Rate")
+    plt.tight_layout()
+    plt.savefig(plots_dir / "success_rate.png")
+    plt.close()
+
+    summary = metrics_dir / "metrics_summary.md"
+    write_summary(summary, exporter.summary())
+    print(f"Processed {new_rows} new episodes ({exporter.state['episodes']} total).")
+    return summary
+
+
+def export_comparison(args):
+    """Overlay rolling curves of many runs on a shared timestep axis and write a summary table."""
+
+    import matplotlib.pyplot as plt
+
+    from rl.run_comparison import align_curves, discover_runs, load_runs, summary_rows
+
+    runs = discover_runs(args.compare)
+    if not runs:
+        raise FileNotFoundError(f"No run directories with episode logs match: {' '.join(args.compare)}")
+    results = load_runs(runs, window=args.window, max_points=args.max_points, workers=args.workers)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for column, file_name, title, y_label in [
+        ("is_win", "success_rate.png", f"Success Rate (rolling {args.window})", "Success Rate"),
+        ("episode_reward", "reward_curve.png", f"Episode Reward (rolling {args.window})", "Reward"),
+        ("max_progress_x", "progress_x.png", f"Max Progress X (rolling {args.window})", "X position"),
+    ]:
+        grid, aligned = align_curves(results, column, points=args.max_points)
+        plt.figure(figsize=(12, 6))
+        for name, values in aligned.items():
+            plt.plot(grid, values, label=name)
+        if column == "is_win":
+            plt.ylim(0.0, 1.0)
+        plt.title(title)
+        plt.xlabel("Timesteps")
+        plt.ylabel(y_label)
+        if len(aligned) <= 20:
+            plt.legend(fontsize="small")
+        plt.tight_layout()
+        plt.savefig(output_dir / file_name)
+        plt.close()
+
+    rows = sorted(summary_rows(results), key=lambda row: row["final_success_rate"], reverse=True)
+    with open(output_dir / "comparison.csv", "w", newline="", encoding="utf-8") as file_obj:
+        writer = csv.DictWriter(file_obj, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    def fmt(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    summary = output_dir / "comparison.md"
+    with open(summary, "w", encoding="utf-8") as file_obj:
+        file_obj.write("# Run Comparison\n\n")
+        file_obj.write(
+            f"| Run | Episodes | Timesteps | Success | Success (last {args.window}) | "
+            "First win (steps) | Steps/s | Best progress x |\n"
+        )
+        file_obj.write("|---|---:|---:|---:|---:|---:|---:|---:|\n")
+        for row in rows:
+            if row["error"]:
+                file_obj.write(f"| {row['name']} | error: {row['error']} | | | | | | |\n")
+                continue
+            file_obj.write(
+                f"| {row['name']} | {row['episodes']} | {row['final_timesteps']} | "
+                f"{row['success_rate']:.2%} | {row['final_success_rate']:.2%} | "
+                f"{fmt(row['first_win_timesteps'], 'd')} | {fmt(row['steps_per_second'], '.1f')} | "
+                f"{row['best_progress']:.1f} |\n"
+            )
+
+    print(f"Compared {len(results)} runs.")
+    print(f"Plots exported to: {output_dir}")
+    print(f"Summary written to: {summary}")
+
+
 def main():
     args = parse_args()
+    import matplotlib.pyplot as plt
+
+    if args.compare:
+        export_comparison(args)
+        return
+
     run_dir = resolve_run_dir(args.run_dir)
-    metrics_file = run_dir / "metrics" / "episodes.csv"
-    if not metrics_file.exists():
-        curriculum_full_metrics = run_dir / "curriculum_full" / "metrics" / "episodes.csv"
-        curriculum_medium_metrics = run_dir / "curriculum_medium" / "metrics" / "episodes.csv"
-        curriculum_easy_metrics = run_dir / "curriculum_easy" / "metrics" / "episodes.csv"
-        if curriculum_full_metrics.exists():
-            metrics_file = curriculum_full_metrics
-        elif curriculum_medium_metrics.exists():
-            metrics_file = curriculum_medium_metrics
-        elif curriculum_easy_metrics.exists():
-            metrics_file = curriculum_easy_metrics
+    metrics_dir = resolve_metrics_dir(run_dir)
     plots_dir = run_dir / "plots"
     plots_dir.mkdir(parents=True, exist_ok=True)
 
-    if not metrics_file.exists():
-        raise FileNotFoundError(f"Metrics file not found: {metrics_file}")
+    if args.incremental:
+        summary = export_incremental(args, metrics_dir, plots_dir)
+        print(f"Plots exported to: {plots_dir}")
+        print(f"Summary written to: {summary}")
+        return
 
-    df = pd.read_csv(metrics_file)
-    if df.empty:
-        raise ValueError(f"Metrics file is empty: {metrics_file}")
+    df = load_episodes(metrics_dir, args.source)
 
     plot_curve(
         df,
@@ -96,15 +320,17 @@ def main():
     plt.savefig(plots_dir / "success_rate.png")
     plt.close()
 
-    summary = metrics_file.parent / "metrics_summary.md"
-    summary.parent.mkdir(parents=True, exist_ok=True)
-    with open(summary, "w", encoding="utf-8") as file_obj:
-        file_obj.write("# Training Metrics Summary\n\n")
-        file_obj.write(f"- Episodes: {len(df)}\n")
-        file_obj.write(f"- Mean reward: {df['episode_reward'].mean():.2f}\n")
-        file_obj.write(f"- Mean episode length: {df['episode_length'].mean():.2f}\n")
-        file_obj.write(f"- Mean success rate: {df['is_win'].mean():.2%}\n")
-        file_obj.write(f"- Mean max progress x: {df['max_progress_x'].mean():.2f}\n")
+    summary = metrics_dir / "metrics_summary.md"
+    write_summary(
+        summary,
+        {
+            "episodes": len(df),
+            "mean_reward": df["episode_reward"].mean(),
+            "mean_length": df["episode_length"].mean(),
+            "success_rate": df["is_win"].mean(),
+            "mean_progress": df["max_progress_x"].mean(),
+        },
+    )
 
     print(f"Plots exported to: {plots_dir}")
     print(f"Summary written to: {summary}")
@@ -0,0 +1,49 @@
+"""Export the actor of a PPO checkpoint to a small NumPy `.npz` file."""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from rl.numpy_policy import NumpyPolicy, export_checkpoint
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export a PPO MlpPolicy checkpoint for torch-free inference.")
+    parser.add_argument("--model-path", required=True, help="Path to PPO .zip model file.")
+    parser.add_argument("--output", default=None, help="Output .npz path (default: next to the model).")
+    parser.add_argument(
+        "--verify-samples",
+        type=int,
+        default=1000,
+        help="Random observations used to check argmax agreement with the torch policy (0 = skip).",
+    )
+    return parser.parse_args()
+
+
+def verify_export(model_path: str, numpy_policy: NumpyPolicy, samples: int):
+    from stable_baselines3 import PPO
+
+    from rl.checkpoints import open_checkpoint
+
+    model = PPO.load(open_checkpoint(model_path), device="cpu")
+    space = model.observation_space
+    observations = np.random.default_rng(0).uniform(space.low, space.high, size=(samples,) + space.shape)
+    observations = observations.astype(np.float32)
+    expected, _ = model.predict(observations, deterministic=True)
+    actual, _ = numpy_policy.predict(observations, deterministic=True)
+    return float(np.mean(np.asarray(expected) == actual))
+
+
+def main():
+    args = parse_args()
+    output = Path(args.output) if args.output else Path(args.model_path).with_suffix(".npz")
+    numpy_policy = export_checkpoint(args.model_path, str(output))
+    print(f"Exported policy to: {output} ({output.stat().st_size} bytes)")
+    if args.verify_samples > 0:
+        agreement = verify_export(args.model_path, numpy_policy, args.verify_samples)
+        print(f"Deterministic action agreement on {args.verify_samples} samples: {agreement:.4f}")
+
+
+if __name__ == "__main__":
+    main()
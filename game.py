@@ -25,8 +25,8 @@ os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 import pygame
 from loguru import logger
 
-from world import *
-from player import *
+from world import World
+from player import Player
 
 
 class MyGame:
@@ -145,62 +145,77 @@ class MyGame:
         self.gameFinished = True
         
 
-pygame.init()   #initialize pygame
-logger.add("game.log")  #create log file
+def main():
+    """main:
+        * creates game, player and world objects and runs the main game loop
 
-player_spawn_x = 120    #player spawn x coordinate
-player_spawn_y = 50     #player spawn y coordinate
-block_size = 60     #block size in pixel
+    Args:
+        none
+
+    Returns:
+        none
+
+    """
+
+    pygame.init()   #initialize pygame
+    logger.add("game.log")  #create log file
+
+    player_spawn_x = 120    #player spawn x coordinate
+    player_spawn_y = 50     #player spawn y coordinate
+    block_size = 60     #block size in pixel
+
+    my_game = MyGame()  #create game object
+    my_game.create_window() #create window
+
+    clock = pygame.time.Clock() #create clock object
 
-my_game = MyGame()  #create game object
-my_game.create_window() #create window
+    player = Player(player_spawn_x, player_spawn_y, 40, 60) #instanciate player object from class Player
+    world = World(my_game, block_size, player)  #instanciate world object from class World
+    player.setWorld(world)  #set world for player object
 
-clock = pygame.time.Clock() #create clock object
 
-player = Player(player_spawn_x, player_spawn_y, 40, 60) #instanciate player object from class Player
-world = World(my_game, block_size, player)  #instanciate world object from class World
-player.setWorld(world)  #set world for player object
+    #----------Main Game Loop----------
 
+    while True: 
+        for event in pygame.event.get():    #check for events
+            if event.type == pygame.QUIT:   #condition for closing the window
+                pygame.quit()   #quit pygame
+                sys.exit()  #quit program
 
-#----------Main Game Loop----------
+        if my_game.gameFinished == True:    #if game is finished print winning text
+            my_game.screen.blit(my_game.winningText, my_game.textRect)  
 
-while True: 
-    for event in pygame.event.get():    #check for events
-        if event.type == pygame.QUIT:   #condition for closing the window
-            pygame.quit()   #quit pygame
-            sys.exit()  #quit program
+        if my_game.gameFinished == False:   #if game is not finished update screen and call main/update methods
+            world.main(my_game.screen)      
+            player.main()
 
-    if my_game.gameFinished == True:    #if game is finished print winning text
-        my_game.screen.blit(my_game.winningText, my_game.textRect)  
+            for bullet in (player.bulletGroup): #update every bullet
+                    bullet.update()
 
-    if my_game.gameFinished == False:   #if game is not finished update screen and call main/update methods
-        world.main(my_game.screen)      
-        player.main()
+            for chest in world.chestGroup:  #update every chest 
+                if player.getCurrentChunk() -1 <= chest.getChunk() <= player.getCurrentChunk() + 1:
+                    chest.update()
+            world.chunkEnemyGroup.empty()   #clears the chunkEnemyGroup
 
-        for bullet in (player.bulletGroup): #update every bullet
-                bullet.update()
+            for enemy in world.enemyGroup:  #iterate through every enemy
+                if player.getCurrentChunk() -1 <= enemy.getCurrentChunk() <= player.getCurrentChunk() + 1:  #if enemy is near player add it to chunkEnemyGroup
+                    enemy.update()
+                    world.chunkEnemyGroup.add(enemy)
 
-        for chest in world.chestGroup:  #update every chest 
-            if player.getCurrentChunk() -1 <= chest.getChunk() <= player.getCurrentChunk() + 1:
-                chest.update()
-        world.chunkEnemyGroup.empty()   #clears the chunkEnemyGroup
+            pygame.sprite.groupcollide(player.bulletGroup, world.chunkEnemyGroup, True, True)   #check for collision between bullet and enemy if true delete both            
+            pygame.sprite.Group.draw(world.chunkEnemyGroup, my_game.screen) #draw every enemy in chunkEnemyGroup
+            pygame.sprite.Group.draw(player.bulletGroup, my_game.screen)    #draw every bullet
+            pygame.sprite.Group.draw(world.chestGroup, my_game.screen) # draw every chest. Only one chest but pygame Group for easier future implementation (multiple chestsv for loot)
+            player.player_plain.draw(my_game.screen)    #draw player
+            clock.tick(30)  #set fps to 30
 
-        for enemy in world.enemyGroup:  #iterate through every enemy
-            if player.getCurrentChunk() -1 <= enemy.getCurrentChunk() <= player.getCurrentChunk() + 1:  #if enemy is near player add it to chunkEnemyGroup
-                enemy.update()
-                world.chunkEnemyGroup.add(enemy)
+        pygame.display.update() #update screen
 
-        pygame.sprite.groupcollide(player.bulletGroup, world.chunkEnemyGroup, True, True)   #check for collision between bullet and enemy if true delete both            
-        pygame.sprite.Group.draw(world.chunkEnemyGroup, my_game.screen) #draw every enemy in chunkEnemyGroup
-        pygame.sprite.Group.draw(player.bulletGroup, my_game.screen)    #draw every bullet
-        pygame.sprite.Group.draw(world.chestGroup, my_game.screen) # draw every chest. Only one chest but pygame Group for easier future implementation (multiple chestsv for loot)
-        player.player_plain.draw(my_game.screen)    #draw player
-        clock.tick(30)  #set fps to 30
+        #TODOs for future versions:
+        #   - add more levels
+        #   - save and display best times
+        #   - add Menu for start/end game, select level or pause game
 
-    pygame.display.update() #update screen
 
-    #TODOs for future versions:
-    #   - add more levels
-    #   - save and display best times
-    #   - add Menu for start/end game, select level or pause game
- 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
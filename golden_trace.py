@@ -0,0 +1,84 @@
+"""Record golden gameplay traces and check GameSession implementations against them."""
+
+import argparse
+import glob
+import json
+import sys
+
+from rl.golden_trace import compare_traces, load_session_factory, load_trace, record_trace, save_trace
+
+DEFAULT_SESSION = "rl.game_session:GameSession"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Per-frame equivalence check of GameSession implementations on identical action sequences.",
+        epilog="Without --record/--check, --baseline and --candidate are compared live.",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="TRACE", help="Record a golden trace with --baseline (.json or .json.gz).")
+    mode.add_argument("--check", metavar="TRACE", help="Replay a golden trace with --candidate and compare.")
+    parser.add_argument("--baseline", default=DEFAULT_SESSION, help="Reference session factory as module:attribute.")
+    parser.add_argument("--baseline-kwargs", default="{}", help="JSON keyword arguments for the baseline session.")
+    parser.add_argument("--candidate", default=DEFAULT_SESSION, help="Session factory under test as module:attribute.")
+    parser.add_argument("--candidate-kwargs", default="{}", help="JSON keyword arguments for the candidate session.")
+    parser.add_argument("--levels", nargs="+", default=None, help="Level files (default: level*.txt).")
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=600, help="Maximum steps per episode.")
+    parser.add_argument("--frame-skip", type=int, default=2)
+    parser.add_argument("--obs-profile", default="balanced", choices=["balanced", "legacy"])
+    parser.add_argument("--obs-atol", type=float, default=0.0, help="Absolute tolerance for observation values.")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    level_paths = args.levels or sorted(glob.glob("level*.txt"))
+    baseline_kwargs = json.loads(args.baseline_kwargs)
+    candidate_kwargs = json.loads(args.candidate_kwargs)
+
+    if args.check:
+        golden = load_trace(args.check)
+        settings = golden["settings"]
+        frame_skip, obs_profile = settings["frame_skip"], settings["obs_profile"]
+    else:
+        frame_skip, obs_profile = args.frame_skip, args.obs_profile
+        golden = record_trace(
+            load_session_factory(args.baseline),
+            level_paths,
+            args.episodes,
+            args.steps,
+            frame_skip,
+            args.seed,
+            obs_profile,
+            baseline_kwargs,
+        )
+        if args.record:
+            save_trace(golden, args.record)
+            frames = sum(len(episode["digests"]) for episode in golden["episodes"])
+            print(f"Recorded {len(golden['episodes'])} episodes ({frames} frames) to {args.record}")
+            return
+
+    candidate = record_trace(
+        load_session_factory(args.candidate),
+        level_paths,
+        len(golden["episodes"]),
+        args.steps,
+        frame_skip,
+        args.seed,
+        obs_profile,
+        candidate_kwargs,
+        action_plan=golden["episodes"],
+    )
+    divergence = compare_traces(golden, candidate, args.obs_atol)
+    frames = sum(len(episode["digests"]) for episode in golden["episodes"])
+    if divergence is None:
+        print(f"Equivalent: {len(golden['episodes'])} episodes, {frames} frames match.")
+        return
+    print(divergence.format())
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
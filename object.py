@@ -20,9 +20,10 @@
 
 
 import pygame
-from pygame import *
 from loguru import logger
 
+_image_cache = {}   # bullet images and chest sprite lists per size, loaded once per process on first use
+
 
 
 class Bullet(pygame.sprite.Sprite):
@@ -69,7 +70,9 @@ class Bullet(pygame.sprite.Sprite):
         self.__direction = direction
         self.__world = world
 
-        self.image = pygame.transform.scale(pygame.image.load("img/bullet_img/bullet.png"), (width, height))
+        if ("bullet", width, height) not in _image_cache:     #load bullet image only for the first shot
+            _image_cache[("bullet", width, height)] = pygame.transform.scale(pygame.image.load("img/bullet_img/bullet.png"), (width, height))
+        self.image = _image_cache[("bullet", width, height)]
         self.bulletPos = pygame.Rect(start_x, start_y, width, height)
         self.rect = self.image.get_rect()
         self.rect.x = start_x
@@ -263,9 +266,15 @@ class Chest(pygame.sprite.Sprite):
 
         """
 
+        cache_key = ("chest", self.width, self.height)
+        if cache_key in _image_cache:       #reuse sprites already loaded by an earlier chest
+            self.__chestSprites.extend(_image_cache[cache_key])
+            return
+
         start_time= pygame.time.get_ticks() #start time for performance measurement
         for i in range(10):                 #iterate through all chest sprites
             self.__chestSprites.append(pygame.transform.scale(pygame.image.load("img/chest_img/chest1_" + str(i) + ".png"), (self.width, self.height))) #load and scale chest sprites
+        _image_cache[cache_key] = list(self.__chestSprites)
         logger.info("Loaded chest sprites in " + str(pygame.time.get_ticks() - start_time) + "ms")  #log performance
         
 
@@ -19,12 +19,17 @@
 """
 
 
+import os
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+import sys
+
 import pygame
-from pygame import *
+from pygame.locals import KEYDOWN, K_RETURN, K_SPACE, K_a, K_d, K_w
 from loguru import logger
-import sys
 
-from object import *
+from object import Bullet
+
+_sprite_cache = {}  # sprite containers per (width, height), loaded once per process on first use
 
 
 class Player(pygame.sprite.Sprite):
@@ -82,6 +87,8 @@ class Player(pygame.sprite.Sprite):
         
         self.image = self.sprites['IDLE']['right'][self.__currentSprite]
         self.__currentAnimation = "IDLE_right"
+        # Millisecond clock for cooldowns; GameSession(sim_clock=True) swaps in a frame-based clock.
+        self.get_ticks = pygame.time.get_ticks
         self.__latest_shot = 0
         self.__latest_jump_kill = 0
         self.__latest_log = 0
@@ -158,6 +165,11 @@ class Player(pygame.sprite.Sprite):
 
         """
 
+        cached_sprites = _sprite_cache.get((self.width, self.height))
+        if cached_sprites is not None:                                  #Reuse sprites already loaded by an earlier player
+            self.sprites = cached_sprites
+            return
+
         start_time= pygame.time.get_ticks()                             #Start time of loading sprites
         animation_states = ["IDLE", "RUN", "JUMP", "ATTACK"]
         for state in animation_states:                                  #Load sprites for every animation state
@@ -167,6 +179,7 @@ class Player(pygame.sprite.Sprite):
                 self.sprites[state]["right"].append(pygame.transform.scale(player_img_cropped, (self.width, self.height)))  #Add player sprites to sprite container
                 self.sprites[state]["left"].append(pygame.transform.flip(pygame.transform.scale(player_img_cropped, (self.width, self.height)),True, False))    #Add flipped player sprites to sprite container
 
+        _sprite_cache[(self.width, self.height)] = self.sprites
         logger.info("Loaded player sprites in " + str(pygame.time.get_ticks() - start_time) + "ms")
 
 
@@ -349,7 +362,7 @@ class Player(pygame.sprite.Sprite):
 
         if idle_input:                 # check if no input is pressed
             self.__speed_x = 0   
-            if self.__latest_shot + self.__shootAnimationTime < pygame.time.get_ticks():    # check if shoot animation is over
+            if self.__latest_shot + self.__shootAnimationTime < self.get_ticks():    # check if shoot animation is over
                 if self.world.collided_get_y(self.base, self.height) >= 0:                  # check if player is on ground  
                     if self.__direction == -1:                          
                         self.__currentAnimation = "IDLE_left"                           # set animation to idle left
@@ -383,7 +396,7 @@ class Player(pygame.sprite.Sprite):
             self.jump(self.jump_speed)                          # call jump method with jump speed as argument
 
 
-        if shoot_pressed and self.__latest_shot + self.__shootAnimationTime < pygame.time.get_ticks():    # check if shoot input is pressed and if latest shot is 1 second ago
+        if shoot_pressed and self.__latest_shot + self.__shootAnimationTime < self.get_ticks():    # check if shoot input is pressed and if latest shot is 1 second ago
             self.shoot()                                                                                     # call shoot method
 
 
@@ -452,7 +465,7 @@ class Player(pygame.sprite.Sprite):
         else:
             self.__currentAnimation = "ATTACK_right"    # set animation to attack right
         self.bulletGroup.add(Bullet(self.playerPos.x + (0.8*self.width), self.playerPos.y + (self.height*0.45), 10, 5, self.__direction, self.world))   # create bullet object
-        self.__latest_shot = pygame.time.get_ticks()        # set latest shot to current time     
+        self.__latest_shot = self.get_ticks()        # set latest shot to current time     
         logger.info("Player shot")
 
 
@@ -473,11 +486,11 @@ class Player(pygame.sprite.Sprite):
         """
 
         __logging_timeBreak = 800
-        if self.__speed_x > 0 and self.__latest_log + __logging_timeBreak < pygame.time.get_ticks():    # check if player is moving right and if latest log is 1 second ago
-            self.__latest_log = pygame.time.get_ticks()         # set latest log to current time
+        if self.__speed_x > 0 and self.__latest_log + __logging_timeBreak < self.get_ticks():    # check if player is moving right and if latest log is 1 second ago
+            self.__latest_log = self.get_ticks()         # set latest log to current time
             logger.info("Player is moving right")
-        elif self.__speed_x < 0 and self.__latest_log + __logging_timeBreak < pygame.time.get_ticks():  # check if player is moving left and if latest log is 1 second ago
-            self.__latest_log = pygame.time.get_ticks()         # set latest log to current time
+        elif self.__speed_x < 0 and self.__latest_log + __logging_timeBreak < self.get_ticks():  # check if player is moving left and if latest log is 1 second ago
+            self.__latest_log = self.get_ticks()         # set latest log to current time
             logger.info("Player is moving left")
 
 
@@ -503,9 +516,9 @@ class Player(pygame.sprite.Sprite):
                     self.speed_y = -5   # set speed_y to -5 (little jump)
                     enemy.kill()        # kill enemy object
                     logger.info("Enemy killed with jump")
-                    self.__latest_jump_kill = pygame.time.get_ticks()
+                    self.__latest_jump_kill = self.get_ticks()
 
-                elif self.speed_y <= 0 and self.__latest_jump_kill + 100 < pygame.time.get_ticks():  # check if player is not in jump and if latest jump kill is 0.1 seconds ago
+                elif self.speed_y <= 0 and self.__latest_jump_kill + 100 < self.get_ticks():  # check if player is not in jump and if latest jump kill is 0.1 seconds ago
                     logger.info("Player killed by enemy")   # log player death
                     if hasattr(self.world, "on_player_death") and callable(self.world.on_player_death):
                         self.world.on_player_death()
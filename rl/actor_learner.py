@@ -0,0 +1,261 @@
+"""Learner side of the actor-learner training mode.
+
+`ActorLearner` accepts rollout actors (`rl.rollout_actor`) over TCP or Unix
+sockets, sends them env settings and policy weights, and turns one batch per
+actor into a PPO update: batches are stacked along the env axis of a
+`RolloutBuffer`, values are recomputed with the current critic, and the
+actor-side log-probs are kept as the behavior policy for the clipped ratio.
+After each update the new weights are broadcast with a bumped version.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+from loguru import logger
+from stable_baselines3.common.buffers import RolloutBuffer
+from stable_baselines3.common.utils import obs_as_tensor
+
+from rl.numpy_policy import export_policy_arrays
+from rl.transport import listen, recv_frame, send_frame
+
+
+def policy_message(model, version: int) -> Dict:
+    numpy_policy = export_policy_arrays(model.policy)
+    return {
+        "type": "policy",
+        "version": version,
+        "policy": {
+            "hidden_weights": numpy_policy.hidden_weights,
+            "hidden_biases": numpy_policy.hidden_biases,
+            "action_weight": numpy_policy.action_weight,
+            "action_bias": numpy_policy.action_bias,
+            "activation": numpy_policy.activation,
+        },
+    }
+
+
+class ActorLearner:
+    """Runs PPO updates on batches streamed by `n_actors` remote or local actors."""
+
+    def __init__(
+        self,
+        model,
+        address: str,
+        n_actors: int,
+        env_kwargs: Dict,
+        envs_per_actor: int,
+        seed: int = 0,
+        max_policy_lag: int = 1,
+        accept_timeout: float = 120.0,
+    ):
+        self.model = model
+        self.address = address
+        self.n_actors = max(1, int(n_actors))
+        self.env_kwargs = dict(env_kwargs)
+        self.envs_per_actor = max(1, int(envs_per_actor))
+        self.seed = int(seed)
+        self.max_policy_lag = max(0, int(max_policy_lag))
+        self.accept_timeout = float(accept_timeout)
+        self.version = 0
+        self.dropped_batches = 0
+        self._server = None
+        self._connections: Dict[str, object] = {}
+        self._inbox: "queue.Queue" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._episode_rewards = deque(maxlen=100)
+        self._episode_lengths = deque(maxlen=100)
+        self._episode_wins = deque(maxlen=100)
+
+    def listen(self):
+        """Bind the learner address; actors may connect from now on."""
+
+        self._server = listen(self.address)
+        self._server.settimeout(self.accept_timeout)
+        logger.info(f"Learner listening on {self.address} for {self.n_actors} actor(s)")
+
+    def accept_actors(self):
+        initial_policy = policy_message(self.model, self.version)
+        while len(self._connections) < self.n_actors:
+            sock, _ = self._server.accept()
+            sock.settimeout(None)
+            hello = recv_frame(sock)
+            if hello is None or hello.get("type") != "hello":
+                sock.close()
+                continue
+            actor_id = str(hello["actor_id"])
+            if actor_id in self._connections:
+                actor_id = f"{actor_id}-{len(self._connections)}"
+            send_frame(
+                sock,
+                {
+                    "type": "config",
+                    "env_kwargs": self.env_kwargs,
+                    "n_envs": self.envs_per_actor,
+                    "n_steps": self.model.n_steps,
+                    "seed": self.seed + 10_000 * (len(self._connections) + 1),
+                    "max_staleness": self.max_policy_lag,
+                },
+            )
+            send_frame(sock, initial_policy)
+            self._connections[actor_id] = sock
+            thread = threading.Thread(target=self._receive, args=(actor_id, sock), name=f"recv-{actor_id}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            logger.info(f"Actor '{actor_id}' connected ({len(self._connections)}/{self.n_actors})")
+
+    def _receive(self, actor_id: str, sock):
+        try:
+            while True:
+                message = recv_frame(sock)
+                self._inbox.put((actor_id, message))
+                if message is None:
+                    return
+        except OSError:
+            self._inbox.put((actor_id, None))
+
+    def _gather(self):
+        """Wait for one usable batch per actor, dropping batches older than `max_policy_lag`."""
+
+        pending = {actor_id: deque() for actor_id in self._connections}
+        while not all(pending.values()):
+            actor_id, message = self._inbox.get()
+            if message is None:
+                raise RuntimeError(f"Actor '{actor_id}' disconnected.")
+            if self.version - int(message["version"]) > self.max_policy_lag:
+                self.dropped_batches += 1
+                continue
+            pending[actor_id].append(message)
+        batches = [pending[actor_id].popleft() for actor_id in self._connections]
+        # Extra batches (actors running ahead) go back to the inbox for the next update.
+        for actor_id, extra in pending.items():
+            for message in extra:
+                self._inbox.put((actor_id, message))
+        return batches
+
+    def _predict_values(self, observations: np.ndarray):
+        with torch.no_grad():
+            values = self.model.policy.predict_values(obs_as_tensor(observations, self.model.device))
+        return values.flatten()
+
+    def _fill_buffer(self, buffer: RolloutBuffer, batches: List[Dict]):
+        n_steps = self.model.n_steps
+        obs = np.concatenate([batch["obs"] for batch in batches], axis=1)
+        n_envs = obs.shape[1]
+        rewards = np.concatenate([batch["rewards"] for batch in batches], axis=1).astype(np.float32)
+        offset = 0
+        for batch in batches:
+            if batch["truncations"]:
+                terminal_obs = np.stack([entry[2] for entry in batch["truncations"]])
+                terminal_values = self._predict_values(terminal_obs).cpu().numpy()
+                for (step, env_index, _), value in zip(batch["truncations"], terminal_values):
+                    rewards[step, offset + env_index] += self.model.gamma * value
+            offset += batch["obs"].shape[1]
+
+        buffer.reset()
+        buffer.observations[:] = obs.reshape(buffer.observations.shape)
+        buffer.actions[:] = np.concatenate([batch["actions"] for batch in batches], axis=1).reshape(buffer.actions.shape)
+        buffer.rewards[:] = rewards
+        buffer.episode_starts[:] = np.concatenate([batch["episode_starts"] for batch in batches], axis=1)
+        buffer.log_probs[:] = np.concatenate([batch["log_probs"] for batch in batches], axis=1)
+        buffer.values[:] = self._predict_values(obs.reshape((n_steps * n_envs,) + obs.shape[2:])).cpu().numpy().reshape(n_steps, n_envs)
+        buffer.pos = n_steps
+        buffer.full = True
+        last_obs = np.concatenate([batch["last_obs"] for batch in batches], axis=0)
+        last_dones = np.concatenate([batch["last_dones"] for batch in batches], axis=0)
+        buffer.compute_returns_and_advantage(last_values=self._predict_values(last_obs), dones=last_dones)
+
+    def broadcast(self):
+        message = policy_message(self.model, self.version)
+        for actor_id, sock in list(self._connections.items()):
+            try:
+                send_frame(sock, message)
+            except OSError:
+                logger.warning(f"Could not send policy v{self.version} to actor '{actor_id}'")
+
+    def learn(
+        self,
+        total_timesteps: int,
+        checkpoint_manager=None,
+        checkpoint_freq: int = 0,
+        checkpoints_dir: Optional[str] = None,
+        profile_window=None,
+    ):
+        """Run PPO updates until `total_timesteps` transitions were consumed."""
+
+        model = self.model
+        total_timesteps, _ = model._setup_learn(total_timesteps, None, True, "actor_learner", False)
+        n_envs = self.n_actors * self.envs_per_actor
+        buffer = RolloutBuffer(
+            model.n_steps,
+            model.observation_space,
+            model.action_space,
+            device=model.device,
+            gamma=model.gamma,
+            gae_lambda=model.gae_lambda,
+            n_envs=n_envs,
+        )
+        model.rollout_buffer = buffer
+        model.n_envs = n_envs
+        started = time.perf_counter()
+        next_checkpoint = checkpoint_freq
+        while model.num_timesteps < total_timesteps:
+            wait_started = time.perf_counter()
+            batches = self._gather()
+            wait_seconds = time.perf_counter() - wait_started
+            self._fill_buffer(buffer, batches)
+            for batch in batches:
+                for reward, length, is_win in batch["episodes"]:
+                    self._episode_rewards.append(reward)
+                    self._episode_lengths.append(length)
+                    self._episode_wins.append(float(is_win))
+            model.num_timesteps += model.n_steps * n_envs
+            model._update_current_progress_remaining(model.num_timesteps, total_timesteps)
+            if profile_window is not None:
+                profile_window.update(model.num_timesteps)
+
+            update_started = time.perf_counter()
+            model.train()
+            self.version += 1
+            self.broadcast()
+            lags = [self.version - 1 - int(batch["version"]) for batch in batches]
+
+            if self._episode_rewards:
+                model.logger.record("rollout/ep_rew_mean", float(np.mean(self._episode_rewards)))
+                model.logger.record("rollout/ep_len_mean", float(np.mean(self._episode_lengths)))
+                model.logger.record("rollout/success_rate", float(np.mean(self._episode_wins)))
+            model.logger.record("actor_learner/policy_version", self.version)
+            model.logger.record("actor_learner/policy_lag_mean", float(np.mean(lags)))
+            model.logger.record("actor_learner/policy_lag_max", int(max(lags)))
+            model.logger.record("actor_learner/dropped_batches", self.dropped_batches)
+            model.logger.record("actor_learner/wait_seconds", wait_seconds)
+            model.logger.record("actor_learner/update_seconds", time.perf_counter() - update_started)
+            model.logger.record("actor_learner/actor_collect_seconds", float(np.mean([batch["collect_seconds"] for batch in batches])))
+            model.logger.record("time/fps", int(model.num_timesteps / max(1e-9, time.perf_counter() - started)))
+            model.logger.record("time/total_timesteps", model.num_timesteps)
+            model.logger.dump(step=model.num_timesteps)
+
+            if checkpoint_manager is not None and checkpoint_freq > 0 and model.num_timesteps >= next_checkpoint:
+                path = Path(checkpoints_dir) / f"ppo_checkpoint_{model.num_timesteps}_steps"
+                checkpoint_manager.save(model, str(path), retained=True)
+                next_checkpoint += checkpoint_freq
+        return model
+
+    def close(self):
+        for sock in self._connections.values():
+            try:
+                send_frame(sock, {"type": "stop"})
+            except OSError:
+                pass
+            sock.close()
+        self._connections = {}
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if self.address.startswith("unix:"):
+                Path(self.address[len("unix:"):]).unlink(missing_ok=True)
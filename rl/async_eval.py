@@ -0,0 +1,207 @@
+"""Evaluation in a background process while training keeps collecting rollouts.
+
+`AsyncEvalCallback` snapshots the actor as a `NumpyPolicy` every `eval_freq`
+calls and hands it to one persistent spawn worker, which plays
+`n_eval_episodes` episodes over `n_envs` envs with batched predictions.
+Results are polled without blocking; the best snapshot is written to
+`best_model.zip` from the parameters that were actually evaluated.
+"""
+
+import multiprocessing
+import queue
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from loguru import logger
+from stable_baselines3.common.callbacks import BaseCallback
+
+from rl.eval_worker import eval_worker
+from rl.model_snapshot import save_model_with_policy, snapshot_policy
+from rl.numpy_policy import export_policy_arrays
+
+
+class AsyncEvalCallback(BaseCallback):
+    """Drop-in alternative to SB3's `EvalCallback` that never blocks training on evaluation.
+
+    At most one evaluation is in flight; an eval point that arrives while the
+    worker is still busy is skipped (and counted in `eval/skipped`). A worker
+    that dies is restarted (its evaluation is lost) up to `max_worker_restarts`
+    times, after which training stops with an error instead of silently
+    running without evaluation.
+    """
+
+    def __init__(
+        self,
+        env_kwargs: Dict,
+        eval_freq: int = 10_000,
+        n_eval_episodes: int = 10,
+        n_envs: int = 4,
+        best_model_save_path: Optional[str] = None,
+        log_path: Optional[str] = None,
+        deterministic: bool = True,
+        seed: int = 0,
+        final_wait_seconds: float = 120.0,
+        max_worker_restarts: int = 3,
+        verbose: int = 0,
+    ):
+        super().__init__(verbose)
+        self.env_kwargs = dict(env_kwargs)
+        self.eval_freq = int(eval_freq)
+        self.n_eval_episodes = int(n_eval_episodes)
+        self.n_envs = max(1, min(int(n_envs), self.n_eval_episodes))
+        self.best_model_save_path = best_model_save_path
+        self.log_path = None if log_path is None else str(Path(log_path) / "evaluations.npz")
+        self.deterministic = deterministic
+        self.seed = int(seed)
+        self.final_wait_seconds = float(final_wait_seconds)
+        self.max_worker_restarts = int(max_worker_restarts)
+        self.worker_restarts = 0
+        self.best_mean_reward = -np.inf
+        self.last_mean_reward = -np.inf
+        self.evaluations_timesteps = []
+        self.evaluations_results = []
+        self.evaluations_length = []
+        self.evaluations_successes = []
+        self.skipped = 0
+        self._process = None
+        self._requests = None
+        self._results = None
+        self._version = 0
+        self._in_flight: Optional[int] = None
+        self._snapshots = {}
+
+    def _init_callback(self) -> None:
+        for path in [self.best_model_save_path, None if self.log_path is None else str(Path(self.log_path).parent)]:
+            if path is not None:
+                Path(path).mkdir(parents=True, exist_ok=True)
+        self._start_worker()
+
+    def _start_worker(self):
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._results = context.Queue()
+        self._process = context.Process(
+            target=eval_worker,
+            args=(self._requests, self._results, self.env_kwargs, self.n_envs),
+            daemon=True,
+        )
+        self._process.start()
+
+    def _submit(self):
+        numpy_policy = export_policy_arrays(self.model.policy)
+        self._version += 1
+        self._snapshots[self._version] = snapshot_policy(self.model)
+        self._requests.put(
+            {
+                "version": self._version,
+                "timesteps": self.num_timesteps,
+                "seeds": [self.seed + index for index in range(self.n_eval_episodes)],
+                "deterministic": self.deterministic,
+                "policy": {
+                    "hidden_weights": numpy_policy.hidden_weights,
+                    "hidden_biases": numpy_policy.hidden_biases,
+                    "action_weight": numpy_policy.action_weight,
+                    "action_bias": numpy_policy.action_bias,
+                    "activation": numpy_policy.activation,
+                },
+            }
+        )
+        self._in_flight = self._version
+
+    def _poll(self, timeout: Optional[float] = None):
+        try:
+            result = self._results.get(timeout=timeout) if timeout else self._results.get_nowait()
+        except queue.Empty:
+            return False
+        self._handle_result(result)
+        return True
+
+    def _check_worker(self):
+        """Restart a dead worker and drop its in-flight evaluation; raise once restarts run out."""
+
+        if self._process.is_alive() or self._poll():
+            return
+        exitcode = self._process.exitcode
+        if self.worker_restarts >= self.max_worker_restarts:
+            raise RuntimeError(
+                f"Async eval worker died (exit code {exitcode}) after {self.worker_restarts} restarts; stopping."
+            )
+        self.worker_restarts += 1
+        logger.warning(
+            f"Async eval worker died (exit code {exitcode}); evaluation of snapshot {self._in_flight} lost, "
+            f"restarting worker ({self.worker_restarts}/{self.max_worker_restarts})."
+        )
+        self._snapshots.pop(self._in_flight, None)
+        self._in_flight = None
+        self.logger.record("eval/worker_restarts", self.worker_restarts)
+        self._start_worker()
+
+    def _handle_result(self, result):
+        policy_state = self._snapshots.pop(result["version"], None)
+        self._in_flight = None
+        rewards = [episode[0] for episode in result["episodes"]]
+        lengths = [episode[1] for episode in result["episodes"]]
+        successes = [episode[2] for episode in result["episodes"]]
+        mean_reward = float(np.mean(rewards))
+        self.last_mean_reward = mean_reward
+        self.evaluations_timesteps.append(result["timesteps"])
+        self.evaluations_results.append(rewards)
+        self.evaluations_length.append(lengths)
+        self.evaluations_successes.append(successes)
+        if self.log_path is not None:
+            np.savez(
+                self.log_path,
+                timesteps=self.evaluations_timesteps,
+                results=self.evaluations_results,
+                ep_lengths=self.evaluations_length,
+                successes=self.evaluations_successes,
+            )
+
+        self.logger.record("eval/mean_reward", mean_reward)
+        self.logger.record("eval/mean_ep_length", float(np.mean(lengths)))
+        self.logger.record("eval/success_rate", float(np.mean(successes)))
+        self.logger.record("eval/snapshot_timesteps", result["timesteps"])
+        self.logger.record("eval/lag_timesteps", self.num_timesteps - result["timesteps"])
+        self.logger.record("eval/skipped", self.skipped)
+        if self.verbose >= 1:
+            print(
+                f"Async eval @ {result['timesteps']} steps: "
+                f"episode_reward={mean_reward:.2f} +/- {np.std(rewards):.2f}, success={np.mean(successes):.2f}"
+            )
+        if mean_reward > self.best_mean_reward:
+            self.best_mean_reward = mean_reward
+            if self.best_model_save_path is not None and policy_state is not None:
+                save_model_with_policy(self.model, policy_state, str(Path(self.best_model_save_path) / "best_model"))
+
+    def _on_step(self) -> bool:
+        if self._in_flight is not None and not self._poll():
+            self._check_worker()
+        if self.eval_freq > 0 and self.n_calls % self.eval_freq == 0:
+            if self._in_flight is None:
+                self._submit()
+            else:
+                self.skipped += 1
+        return True
+
+    def _on_training_end(self) -> None:
+        if self._process is None:
+            return
+        if self._in_flight is not None and not self._wait_final():
+            logger.warning("Async evaluation did not finish before training ended; result dropped.")
+        self._requests.put(None)
+        self._process.join(timeout=10)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+
+    def _wait_final(self) -> bool:
+        # Poll in short slices so a dead worker does not cost the whole `final_wait_seconds`.
+        deadline = time.monotonic() + self.final_wait_seconds
+        while time.monotonic() < deadline:
+            if self._poll(timeout=1.0):
+                return True
+            if not self._process.is_alive():
+                return self._poll()
+        return False
@@ -0,0 +1,353 @@
+"""Background checkpoint writing with retention and content deduplication.
+
+`CheckpointManager.save` copies a model's state on the calling (training)
+thread and writes the SB3-compatible zip from a background thread, so slow
+disks never stall rollouts. With `keep_last > 0`, periodic checkpoints are
+pruned per directory by a retention policy (last N, best-k by eval score,
+logarithmic thinning of older ones); by default every checkpoint is kept. With `tensor_store=True` (opt-in), stage and final models keep
+their large weight tensors in a content-addressed store (`tensors/<sha256>.pt`
+next to the zip): a tensor that is unchanged between stage models is stored
+once, and the zip only records a reference (`tensor_refs.json`). Such zips
+are not valid SB3 zips on their own and cannot be moved without their store;
+`open_checkpoint` restores them for `PPO.load`. Saves whose content is byte-identical to an existing file are
+hard-linked instead of written again.
+"""
+
+import copy
+import hashlib
+import io
+import json
+import math
+import os
+import queue
+import shutil
+import threading
+import zipfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import torch
+from loguru import logger
+from stable_baselines3.common.callbacks import BaseCallback
+
+MANIFEST_FILE = "checkpoints.json"
+TENSOR_STORE_DIR = "tensors"
+TENSOR_REFS_FILE = "tensor_refs.json"
+# Biases and optimizer step counters stay inline; a store file per tiny tensor costs more than it saves.
+MIN_STORED_TENSOR_BYTES = 4096
+
+
+@dataclass
+class CheckpointRecord:
+    path: str
+    timesteps: int
+    score: Optional[float]
+    content_hash: str
+
+
+@dataclass
+class _CapturedModel:
+    serialized_data: str
+    params: Dict
+    pytorch_variables: Optional[Dict]
+
+
+def capture_model(model) -> _CapturedModel:
+    """Copy everything `model.save` would write, so it can be serialized off-thread."""
+
+    from stable_baselines3.common.save_util import data_to_json, recursive_getattr
+
+    data = model.__dict__.copy()
+    exclude = set(model._excluded_save_params())
+    state_dicts_names, torch_variable_names = model._get_torch_save_params()
+    for torch_var in state_dicts_names + torch_variable_names:
+        exclude.add(torch_var.split(".")[0])
+    for name in exclude:
+        data.pop(name, None)
+
+    pytorch_variables = None
+    if torch_variable_names:
+        pytorch_variables = {name: copy.deepcopy(recursive_getattr(model, name)) for name in torch_variable_names}
+    params = {
+        name: {key: value.detach().cpu().clone() if torch.is_tensor(value) else copy.deepcopy(value) for key, value in state.items()}
+        for name, state in model.get_parameters().items()
+    }
+    return _CapturedModel(data_to_json(data), params, pytorch_variables)
+
+
+def _content_hash(captured: _CapturedModel):
+    digest = hashlib.sha256(captured.serialized_data.encode("utf-8"))
+    for name in sorted(captured.params):
+        for key, value in sorted(captured.params[name].items(), key=lambda item: str(item[0])):
+            digest.update(f"{name}/{key}".encode("utf-8"))
+            if torch.is_tensor(value):
+                digest.update(value.contiguous().view(torch.uint8).numpy().tobytes())
+            else:
+                digest.update(repr(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _tensor_hash(tensor: torch.Tensor):
+    digest = hashlib.sha256(f"{tensor.dtype}{tuple(tensor.shape)}".encode("utf-8"))
+    digest.update(tensor.contiguous().view(torch.uint8).numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _large_tensors(value, key_path=()):
+    """Yield `(key path, tensor)` for every tensor worth storing in a (nested) state dict."""
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _large_tensors(item, key_path + (key,))
+    elif torch.is_tensor(value) and value.numel() * value.element_size() >= MIN_STORED_TENSOR_BYTES:
+        yield key_path, value
+
+
+def _replace_at(state: Dict, key_path, value):
+    """Copy of `state` with the entry at `key_path` set to `value`; only the dicts on the path are copied."""
+
+    state = dict(state)
+    key = key_path[0]
+    state[key] = value if len(key_path) == 1 else _replace_at(state[key], key_path[1:], value)
+    return state
+
+
+def _store_tensors(store_dir: Path, captured: _CapturedModel):
+    """Put the large tensors of `captured` into the store; returns their refs and the reused bytes.
+
+    Refs map each param file to `[key path, blob]` pairs; the key path reaches nested
+    optimizer state too (e.g. `["state", 0, "exp_avg"]`).
+    """
+
+    refs: Dict[str, List] = {}
+    reused = 0
+    for file_name, state in captured.params.items():
+        for key_path, tensor in _large_tensors(state):
+            blob_name = f"{_tensor_hash(tensor)}.pt"
+            blob_path = store_dir / blob_name
+            if blob_path.exists():
+                reused += tensor.numel() * tensor.element_size()
+            else:
+                store_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob_path.with_name(blob_name + ".tmp")
+                torch.save(tensor, tmp_path)
+                os.replace(tmp_path, blob_path)
+            refs.setdefault(file_name, []).append([list(key_path), f"{TENSOR_STORE_DIR}/{blob_name}"])
+    return refs, reused
+
+
+def open_checkpoint(path: str):
+    """`path` in a form `PPO.load` accepts: the zip itself, or an in-memory copy with store tensors restored."""
+
+    path = Path(str(path) if str(path).endswith(".zip") else f"{path}.zip")
+    with zipfile.ZipFile(path) as archive:
+        if TENSOR_REFS_FILE not in archive.namelist():
+            return str(path)
+        refs = json.loads(archive.read(TENSOR_REFS_FILE))
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, mode="w") as restored:
+            for info in archive.infolist():
+                if info.filename == TENSOR_REFS_FILE:
+                    continue
+                file_name = info.filename[: -len(".pth")] if info.filename.endswith(".pth") else None
+                if file_name not in refs:
+                    restored.writestr(info, archive.read(info.filename))
+                    continue
+                state = torch.load(io.BytesIO(archive.read(info.filename)), map_location="cpu")
+                for key_path, blob in refs[file_name]:
+                    state = _replace_at(state, key_path, torch.load(path.parent / blob, map_location="cpu"))
+                with restored.open(info.filename, mode="w", force_zip64=True) as file_obj:
+                    torch.save(state, file_obj)
+    buffer.seek(0)
+    return buffer
+
+
+def _write_zip(path: Path, captured: _CapturedModel, tensor_refs: Optional[Dict[str, List]] = None):
+    """Write the same archive layout as `stable_baselines3.common.save_util.save_to_zip_file`.
+
+    Tensors listed in `tensor_refs` are replaced by None in their `.pth` entry and recorded in `tensor_refs.json`.
+    """
+
+    import stable_baselines3 as sb3
+    from stable_baselines3.common.utils import get_system_info
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with zipfile.ZipFile(tmp_path, mode="w") as archive:
+        archive.writestr("data", captured.serialized_data)
+        if captured.pytorch_variables is not None:
+            with archive.open("pytorch_variables.pth", mode="w", force_zip64=True) as file_obj:
+                torch.save(captured.pytorch_variables, file_obj)
+        for file_name, state in captured.params.items():
+            for key_path, _ in (tensor_refs or {}).get(file_name, []):
+                state = _replace_at(state, key_path, None)
+            with archive.open(file_name + ".pth", mode="w", force_zip64=True) as file_obj:
+                torch.save(state, file_obj)
+        if tensor_refs:
+            archive.writestr(TENSOR_REFS_FILE, json.dumps(tensor_refs, indent=2))
+        archive.writestr("_stable_baselines3_version", sb3.__version__)
+        archive.writestr("system_info.txt", get_system_info(print_info=False)[1])
+    os.replace(tmp_path, path)
+
+
+def select_retained(records: List[CheckpointRecord], keep_last: int, keep_best: int, log_thinning: bool):
+    """Return the paths to keep among periodic checkpoints of one directory.
+
+    `keep_last <= 0` disables pruning altogether.
+    """
+
+    if keep_last <= 0:
+        return {record.path for record in records}
+    ordered = sorted(records, key=lambda record: record.timesteps)
+    keep = {record.path for record in ordered[-keep_last:]}
+    scored = [record for record in ordered if record.score is not None]
+    if keep_best > 0:
+        keep.update(record.path for record in sorted(scored, key=lambda record: record.score)[-keep_best:])
+    if log_thinning and len(ordered) > 1:
+        # One checkpoint per power-of-two age bucket, measured in save intervals.
+        newest = ordered[-1].timesteps
+        interval = max(1, min(b.timesteps - a.timesteps for a, b in zip(ordered, ordered[1:])) or 1)
+        buckets = {}
+        for record in ordered:
+            age = (newest - record.timesteps) // interval
+            bucket = int(math.log2(age)) if age > 0 else -1
+            buckets.setdefault(bucket, record.path)
+        keep.update(buckets.values())
+    return keep
+
+
+class CheckpointManager:
+    """Owns a writer thread shared by every checkpoint and model save of one run."""
+
+    def __init__(
+        self,
+        keep_last: int = 0,
+        keep_best: int = 3,
+        log_thinning: bool = True,
+        background: bool = True,
+        tensor_store: bool = False,
+    ):
+        self.keep_last = int(keep_last)
+        self.keep_best = int(keep_best)
+        self.log_thinning = bool(log_thinning)
+        self.background = bool(background)
+        self.tensor_store = bool(tensor_store)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._by_hash: Dict[str, str] = {}
+        self._errors: List[BaseException] = []
+        self._thread = None
+        if self.background:
+            self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+            self._thread.start()
+
+    def save(self, model, path: str, score: Optional[float] = None, retained: bool = False):
+        """Queue a save of `model` to `path` (".zip" is appended like `model.save`).
+
+        `retained=True` marks a periodic checkpoint that the retention policy may prune later and
+        that stays a standalone zip; other saves (stage/final models) are kept forever and, with
+        `tensor_store`, share their weight tensors through the tensor store.
+        """
+
+        path = Path(str(path) if str(path).endswith(".zip") else f"{path}.zip")
+        captured = capture_model(model)
+        if self._thread is None:
+            self._write(path, captured, int(model.num_timesteps), score, retained)
+        else:
+            self._queue.put((path, captured, int(model.num_timesteps), score, retained))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except BaseException as exc:  # surfaced from flush()/close() on the training thread
+                self._errors.append(exc)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path: Path, captured: _CapturedModel, timesteps: int, score: Optional[float], retained: bool):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content_hash = _content_hash(captured)
+        existing = self._by_hash.get(content_hash)
+        if existing is not None and Path(existing).exists() and existing != str(path):
+            if path.exists():
+                path.unlink()
+            try:
+                os.link(existing, path)
+            except OSError:
+                shutil.copyfile(existing, path)
+            logger.info(f"Checkpoint {path} is identical to {existing}; linked instead of rewritten")
+        elif self.tensor_store and not retained:
+            # Store blobs are never deleted, so only saves that are kept forever may reference them.
+            tensor_refs, reused = _store_tensors(path.parent / TENSOR_STORE_DIR, captured)
+            _write_zip(path, captured, tensor_refs)
+            if reused:
+                logger.info(f"Checkpoint {path} reuses {reused / 2**20:.2f} MiB of stored weight tensors")
+        else:
+            _write_zip(path, captured)
+        self._by_hash.setdefault(content_hash, str(path))
+        if retained:
+            self._apply_retention(path.parent, CheckpointRecord(str(path), timesteps, score, content_hash))
+
+    def _apply_retention(self, directory: Path, record: CheckpointRecord):
+        manifest_path = directory / MANIFEST_FILE
+        records = []
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as file_obj:
+                records = [CheckpointRecord(**entry) for entry in json.load(file_obj)]
+        records = [entry for entry in records if entry.path != record.path and Path(entry.path).exists()]
+        records.append(record)
+        keep = select_retained(records, self.keep_last, self.keep_best, self.log_thinning)
+        for entry in records:
+            if entry.path not in keep:
+                Path(entry.path).unlink(missing_ok=True)
+                logger.warning(f"Retention policy deleted checkpoint {entry.path}")
+                if self._by_hash.get(entry.content_hash) == entry.path:
+                    del self._by_hash[entry.content_hash]
+        records = [entry for entry in records if entry.path in keep]
+        with open(manifest_path, "w", encoding="utf-8") as file_obj:
+            json.dump([asdict(entry) for entry in records], file_obj, indent=2)
+
+    def flush(self):
+        """Block until every queued save is on disk; re-raise writer errors."""
+
+        self._queue.join()
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise RuntimeError(f"Checkpoint writer failed: {errors[0]!r}") from errors[0]
+
+    def close(self):
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+class ManagedCheckpointCallback(BaseCallback):
+    """`CheckpointCallback` replacement that hands saves to a `CheckpointManager`.
+
+    The score used for best-k retention is the latest mean reward of `eval_callback`.
+    """
+
+    def __init__(self, manager: CheckpointManager, save_freq: int, save_path: str, name_prefix: str = "ppo_checkpoint", eval_callback=None, verbose: int = 0):
+        super().__init__(verbose)
+        self.manager = manager
+        self.save_freq = int(save_freq)
+        self.save_path = Path(save_path)
+        self.name_prefix = name_prefix
+        self.eval_callback = eval_callback
+
+    def _on_step(self) -> bool:
+        if self.save_freq > 0 and self.n_calls % self.save_freq == 0:
+            score = None
+            if self.eval_callback is not None and math.isfinite(getattr(self.eval_callback, "last_mean_reward", -math.inf)):
+                score = float(self.eval_callback.last_mean_reward)
+            path = self.save_path / f"{self.name_prefix}_{self.num_timesteps}_steps"
+            self.manager.save(self.model, str(path), score=score, retained=True)
+        return True
+
+    def _on_training_end(self) -> None:
+        self.manager.flush()
@@ -0,0 +1,78 @@
+"""Win-rate driven curriculum stage control for SB3 training."""
+
+from typing import Optional
+
+import numpy as np
+from stable_baselines3.common.callbacks import BaseCallback, EvalCallback
+
+from rl.training_metrics import EpisodeMetricsCallback
+
+
+class WinRateStageCallback(BaseCallback):
+    """Stops `learn` once a stage is mastered or its step budget is spent.
+
+    The win rate comes from the rolling window of an `EpisodeMetricsCallback`
+    (`signal="rollout"`) or from the latest `EvalCallback` evaluation
+    (`signal="eval"`, uses the env's `is_success` info key). The threshold is
+    only checked after `min_steps` stage steps and, for the rollout signal,
+    once at least `min_episodes` episodes are in the window.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        min_steps: int,
+        max_steps: int,
+        metrics_callback: Optional[EpisodeMetricsCallback] = None,
+        eval_callback: Optional[EvalCallback] = None,
+        signal: str = "rollout",
+        min_episodes: int = 20,
+        verbose: int = 0,
+    ):
+        super().__init__(verbose)
+        if signal not in {"rollout", "eval"}:
+            raise ValueError(f"Unsupported curriculum signal: {signal}")
+        if signal == "rollout" and metrics_callback is None:
+            raise ValueError("Rollout signal needs an EpisodeMetricsCallback.")
+        if signal == "eval" and eval_callback is None:
+            raise ValueError("Eval signal needs an EvalCallback.")
+        self.threshold = float(threshold)
+        self.min_steps = int(min_steps)
+        self.max_steps = int(max_steps)
+        self.metrics_callback = metrics_callback
+        self.eval_callback = eval_callback
+        self.signal = signal
+        self.min_episodes = int(min_episodes)
+        self.stage_start = 0
+        self.stop_reason: Optional[str] = None
+
+    @property
+    def stage_steps(self):
+        return self.num_timesteps - self.stage_start
+
+    def current_win_rate(self):
+        """Return `(win_rate, episodes)` for the configured signal."""
+
+        if self.signal == "eval":
+            successes = getattr(self.eval_callback, "evaluations_successes", [])
+            if not successes:
+                return 0.0, 0
+            latest = successes[-1]
+            return float(np.mean(latest)) if len(latest) else 0.0, len(latest)
+        return self.metrics_callback.win_rate, self.metrics_callback.window_episodes
+
+    def _on_training_start(self) -> None:
+        self.stage_start = self.num_timesteps
+        self.stop_reason = None
+
+    def _on_step(self) -> bool:
+        win_rate, episodes = self.current_win_rate()
+        self.logger.record("curriculum/stage_win_rate", win_rate)
+        if self.stage_steps >= self.max_steps:
+            self.stop_reason = "max_steps"
+            return False
+        enough_episodes = episodes >= (self.min_episodes if self.signal == "rollout" else 1)
+        if self.stage_steps >= self.min_steps and enough_episodes and win_rate >= self.threshold:
+            self.stop_reason = "threshold"
+            return False
+        return True
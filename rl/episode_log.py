@@ -0,0 +1,142 @@
+"""Append-only columnar episode log with memory-mapped reads.
+
+Each column lives in its own raw little-endian file (`<name>.bin`) next to a
+`schema.json`. Writers only ever append whole buffered batches, and readers
+map the files with `np.memmap`, so analysis never parses text and only touches
+the rows it slices.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCHEMA_VERSION = 1
+SCHEMA_FILE = "schema.json"
+
+# Shared by the CSV header and the columnar log so both formats stay in sync.
+EPISODE_COLUMNS: List[Tuple[str, str]] = [
+    ("num_timesteps", "<i8"),
+    ("episode_reward", "<f8"),
+    ("episode_length", "<i4"),
+    ("is_win", "<i1"),
+    ("is_dead", "<i1"),
+    ("max_progress_x", "<f8"),
+    ("goal_distance", "<f8"),
+    ("checkpoint_index", "<i4"),
+    ("jump_rate", "<f4"),
+    ("noop_rate", "<f4"),
+    ("left_rate", "<f4"),
+    ("right_rate", "<f4"),
+    ("hazard_ignore_rate", "<f4"),
+    ("hazard_reaction_rate", "<f4"),
+]
+EPISODE_COLUMN_NAMES = [name for name, _ in EPISODE_COLUMNS]
+
+
+class ColumnarEpisodeWriter:
+    """Buffered appender for one columnar log directory."""
+
+    def __init__(self, directory: str, columns: Sequence[Tuple[str, str]] = EPISODE_COLUMNS):
+        self.directory = Path(directory)
+        self.columns = [(name, np.dtype(dtype)) for name, dtype in columns]
+        self._buffer: List[Sequence] = []
+        self._files = {}
+
+    def open(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        schema_path = self.directory / SCHEMA_FILE
+        schema = {"version": SCHEMA_VERSION, "columns": [[name, dtype.str] for name, dtype in self.columns]}
+        if schema_path.exists():
+            with open(schema_path, "r", encoding="utf-8") as file_obj:
+                existing = json.load(file_obj)
+            if existing.get("columns") != schema["columns"]:
+                raise ValueError(f"Columnar log schema mismatch in {self.directory}")
+        else:
+            with open(schema_path, "w", encoding="utf-8") as file_obj:
+                json.dump(schema, file_obj, indent=2)
+
+        # Align all columns to the shortest one in case a previous run died mid-flush.
+        row_count = _row_count(self.directory, self.columns)
+        for name, dtype in self.columns:
+            file_obj = open(self.directory / f"{name}.bin", "ab")
+            file_obj.truncate(row_count * dtype.itemsize)
+            file_obj.seek(0, 2)
+            self._files[name] = file_obj
+        return self
+
+    def append(self, row: Sequence):
+        self._buffer.append(row)
+
+    def extend(self, rows: Iterable[Sequence]):
+        self._buffer.extend(rows)
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        for index, (name, dtype) in enumerate(self.columns):
+            column = np.fromiter((row[index] for row in self._buffer), dtype=dtype, count=len(self._buffer))
+            self._files[name].write(column.tobytes())
+        for file_obj in self._files.values():
+            file_obj.flush()
+        self._buffer.clear()
+
+    def close(self):
+        if self._files:
+            self.flush()
+        for file_obj in self._files.values():
+            file_obj.close()
+        self._files = {}
+
+
+def _row_count(directory: Path, columns):
+    counts = []
+    for name, dtype in columns:
+        path = directory / f"{name}.bin"
+        counts.append(path.stat().st_size // dtype.itemsize if path.exists() else 0)
+    return min(counts) if counts else 0
+
+
+class ColumnarEpisodeReader:
+    """Memory-mapped, read-only view of a columnar log directory."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        with open(self.directory / SCHEMA_FILE, "r", encoding="utf-8") as file_obj:
+            schema = json.load(file_obj)
+        self.columns = [(name, np.dtype(dtype)) for name, dtype in schema["columns"]]
+        self.column_names = [name for name, _ in self.columns]
+        self._dtypes = dict(self.columns)
+
+    def __len__(self):
+        return _row_count(self.directory, self.columns)
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None):
+        """Return `rows[start:stop]` of one column as a read-only memmap slice."""
+
+        length = len(self)
+        stop = length if stop is None else min(int(stop), length)
+        start = max(0, min(int(start), stop))
+        if stop == start:
+            return np.empty(0, dtype=self._dtypes[name])
+        data = np.memmap(self.directory / f"{name}.bin", dtype=self._dtypes[name], mode="r", shape=(length,))
+        return data[start:stop]
+
+    def read(self, start: int = 0, stop: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        names = self.column_names if columns is None else list(columns)
+        length = len(self)
+        stop = length if stop is None else min(int(stop), length)
+        return {name: self.column(name, start, stop) for name in names}
+
+    def to_dataframe(self, start: int = 0, stop: Optional[int] = None, columns: Optional[Sequence[str]] = None):
+        import pandas as pd
+
+        return pd.DataFrame(self.read(start, stop, columns))
+
+
+def columnar_log_exists(directory: str):
+    return (Path(directory) / SCHEMA_FILE).exists()
@@ -0,0 +1,60 @@
+"""Torch-free evaluation loop run inside the `AsyncEvalCallback` worker process.
+
+Kept apart from `rl.async_eval` so the spawned worker imports only NumPy, the
+game and `NumpyPolicy`, not torch or stable-baselines3.
+"""
+
+from typing import Dict
+
+import numpy as np
+from loguru import logger
+
+from rl.numpy_policy import NumpyPolicy
+
+
+def play_episodes(policy, envs, seeds, deterministic: bool = True):
+    """Play one episode per seed over `envs` with one batched `predict` per step."""
+
+    pending = list(reversed(list(seeds)))
+    active = {}
+    results = []
+
+    def start(env_index):
+        obs, _ = envs[env_index].reset(seed=pending.pop())
+        active[env_index] = {"obs": obs, "reward": 0.0, "length": 0}
+
+    for env_index in range(min(len(envs), len(pending))):
+        start(env_index)
+    while active:
+        env_indices = sorted(active)
+        actions, _ = policy.predict(np.stack([active[index]["obs"] for index in env_indices]), deterministic=deterministic)
+        for env_index, action in zip(env_indices, np.asarray(actions).reshape(-1)):
+            state = active[env_index]
+            obs, reward, terminated, truncated, info = envs[env_index].step(int(action))
+            state["obs"] = obs
+            state["reward"] += float(reward)
+            state["length"] += 1
+            if terminated or truncated:
+                results.append((state["reward"], state["length"], bool(info.get("is_win", False))))
+                del active[env_index]
+                if pending:
+                    start(env_index)
+    return results
+
+
+def eval_worker(requests, results, env_kwargs: Dict, n_envs: int):
+    logger.remove()
+    from rl.pirate_game_env import PirateGameEnv
+
+    envs = [PirateGameEnv(**env_kwargs) for _ in range(max(1, int(n_envs)))]
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            policy = NumpyPolicy(**request["policy"])
+            episodes = play_episodes(policy, envs, request["seeds"], request["deterministic"])
+            results.put({"version": request["version"], "timesteps": request["timesteps"], "episodes": episodes})
+    finally:
+        for env in envs:
+            env.close()
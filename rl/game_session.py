@@ -5,8 +5,11 @@ It adapts the existing Pygame world/player code into a deterministic
 """
 
 import os
+import pickle
 import random
-from dataclasses import asdict
+import types
+from contextlib import contextmanager
+from dataclasses import asdict, replace
 from typing import Optional
 
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
@@ -14,6 +17,9 @@ import pygame
 import numpy as np
 
 from rl.game_types import EpisodeStatus, GameAction
+from rl.memory import process_memory_monitor
+from rl.profiling import ProfileWindow, process_window
+from object import Bullet
 from player import Player
 from world import World
 
@@ -23,22 +29,116 @@ WINDOW_HEIGHT = 800
 PLAYER_SPAWN_X = 120
 PLAYER_SPAWN_Y = 50
 BLOCK_SIZE = 60
+# Simulation clock value at spawn; large enough that shot/kill cooldowns start out ready, as with the wall clock.
+SIM_CLOCK_START_MS = 10_000
+SESSION_STATE_VERSION = 1
+
+
+# Parsed level files, shared by every session in this process:
+# path -> ((mtime_ns, size), lines, width, height). One entry per path; an edited file replaces it.
+_level_cache = {}
+# 1x1 draw target for clones: every background/block blit is clipped away, ~10x cheaper frames.
+_scratch_surface = None
+
+
+def load_level(level_path: str):
+    """Read and measure a level file, re-reading it only when it changed on disk."""
+
+    stat = os.stat(level_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _level_cache.get(level_path)
+    if cached is None or cached[0] != stamp:
+        with open(level_path, "r", encoding="utf-8") as level_file:
+            lines = tuple(level_file.readlines())
+        width = max((len(line.rstrip("\n")) for line in lines), default=1) * BLOCK_SIZE
+        height = max(len(lines), 1) * BLOCK_SIZE
+        cached = _level_cache[level_path] = (stamp, lines, width, height)
+    return cached[1:]
+
+
+def preload_levels(level_paths):
+    for level_path in level_paths:
+        load_level(level_path)
+
+
+# Immutable field types, returned as-is without any further checks.
+_SHARED_TYPES = frozenset((bool, int, float, str, type(None), pygame.Surface))
+
+
+def _get_scratch_surface():
+    global _scratch_surface
+    if _scratch_surface is None:
+        _scratch_surface = pygame.Surface((1, 1))
+    return _scratch_surface
+
+
+def _fork_value(value, memo):
+    if type(value) in _SHARED_TYPES:
+        return value
+    if id(value) in memo:
+        return memo[id(value)]
+    if isinstance(value, pygame.Rect):
+        return value.copy()
+    if isinstance(value, (pygame.sprite.Sprite, World, _GameContext)):
+        return _fork_object(value, memo)
+    if isinstance(value, pygame.sprite.AbstractGroup):
+        group = type(value)()
+        group.add(*[_fork_object(sprite, memo) for sprite in value.sprites()])
+        return group
+    if isinstance(value, types.MethodType) and id(value.__self__) in memo:
+        return types.MethodType(value.__func__, memo[id(value.__self__)])
+    return value
+
+
+def _fork_object(obj, memo):
+    """Copy one game object: fresh rects and sprite groups, references re-pointed through `memo`.
+
+    Everything else (surfaces, sprite lists, level lines and platform rects) is shared, since
+    the simulation only ever replaces those, never mutates them.
+    """
+
+    clone = memo.get(id(obj))
+    if clone is not None:
+        return clone
+    clone = object.__new__(type(obj))
+    memo[id(obj)] = clone
+    fields = vars(obj)
+    if "_Sprite__g" in fields:
+        # Group membership is rebuilt by the forked groups adding their forked members.
+        clone._Sprite__g = set()
+    clone.__dict__.update({key: _fork_value(value, memo) for key, value in fields.items() if key != "_Sprite__g"})
+    return clone
+
+
+def _plain_fields(obj):
+    """Primitive and rect fields of a game object, i.e. its mutable simulation state."""
+
+    fields = {}
+    for key, value in vars(obj).items():
+        if isinstance(value, pygame.Rect):
+            fields[key] = tuple(value)
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            fields[key] = value
+    return fields
+
+
+def _apply_fields(obj, fields):
+    for key, value in fields.items():
+        current = getattr(obj, key, None)
+        if isinstance(current, pygame.Rect):
+            current.update(value)
+        else:
+            setattr(obj, key, value)
 
 
 class _GameContext:
     """Small adapter that mirrors the fields expected by `World`."""
 
     def __init__(self, level_path: str):
-        self.level = self._read_level(level_path)
-        self.level_width = max((len(line.rstrip("\n")) for line in self.level), default=1) * BLOCK_SIZE
-        self.level_height = max(len(self.level), 1) * BLOCK_SIZE
+        lines, self.level_width, self.level_height = load_level(level_path)
+        self.level = list(lines)
         self.gameFinished = False
 
-    @staticmethod
-    def _read_level(level_path: str):
-        with open(level_path, "r", encoding="utf-8") as level_file:
-            return list(level_file.readlines())
-
     def end_game(self):
         self.gameFinished = True
 
@@ -59,6 +159,7 @@ class GameSession:
         fps: int = 30,
         max_episode_steps: int = 2500,
         obs_profile: str = "balanced",
+        sim_clock: bool = False,
     ):
         self.level_path = level_path
         self.headless = headless
@@ -68,6 +169,12 @@ class GameSession:
         self.obs_profile = obs_profile
         if self.obs_profile not in {"balanced", "legacy"}:
             raise ValueError(f"Unsupported obs_profile: {self.obs_profile}")
+        # With `sim_clock` the player's cooldowns advance 1000/fps ms per simulated frame instead of
+        # following wall time, so a seed plus an action sequence always replays the same game.
+        self.sim_clock = sim_clock
+        self.sim_ticks = SIM_CLOCK_START_MS
+        # Optional `callable(session)` run after every simulated frame (soak invariants, tracing).
+        self.on_frame = None
 
         if self.headless:
             os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
@@ -85,14 +192,25 @@ class GameSession:
         self.context = None
         self.player = None
         self.world = None
+        # Enemies and chests in spawn order, including killed ones; indexes them in saved states.
+        self.spawned_enemies = ()
+        self.spawned_chests = ()
+        # Set when `JUMPNRUN_PROFILE` asks this process to profile itself; shared by its sessions.
+        self._profile_window = process_window()
+        self._memory_monitor = process_memory_monitor()
         self.reset(level_path=level_path)
 
     def _build_world(self):
         self.context = _GameContext(self.level_path)
         self.player = Player(PLAYER_SPAWN_X, PLAYER_SPAWN_Y, 40, 60)
+        if self.sim_clock:
+            self.sim_ticks = SIM_CLOCK_START_MS
+            self.player.get_ticks = self._get_sim_ticks
         self.world = World(self.context, BLOCK_SIZE, self.player)
         self.player.setWorld(self.world)
         self.world.on_player_death = self._on_player_death
+        self.spawned_enemies = tuple(self.world.enemyGroup)
+        self.spawned_chests = tuple(self.world.chestGroup)
         self.world.main(self.surface)
 
         self.status = EpisodeStatus(
@@ -103,6 +221,105 @@ class GameSession:
             max_progress_x=float(self.player.playerPos.x),
         )
 
+    def _get_sim_ticks(self):
+        return self.sim_ticks
+
+    def clone(self):
+        """Independent headless copy of the current game for lookahead / what-if stepping.
+
+        Only mutable simulation state is copied; sprites, surfaces and level geometry are shared
+        with this session, so a clone costs microseconds and never reloads assets. Clones draw
+        into a 1x1 scratch surface (nothing they render is visible), do not count towards
+        profiling windows or memory monitoring and have no `on_frame` hook.
+        """
+
+        clone = object.__new__(GameSession)
+        clone.__dict__.update(self.__dict__)
+        memo = {id(self): clone}
+        clone.render_mode = "none"
+        clone.screen = None
+        clone.surface = _get_scratch_surface()
+        clone.on_frame = None
+        clone._profile_window = None
+        clone._memory_monitor = None
+        clone.status = replace(self.status)
+        clone.context = _fork_object(self.context, memo)
+        clone.player = _fork_object(self.player, memo)
+        clone.world = _fork_object(self.world, memo)
+        clone.spawned_enemies = tuple(_fork_object(enemy, memo) for enemy in self.spawned_enemies)
+        clone.spawned_chests = tuple(_fork_object(chest, memo) for chest in self.spawned_chests)
+        return clone
+
+    def save_state(self) -> bytes:
+        """Serialize the mutable game state (rects, speeds, timers, alive sets, status) to bytes.
+
+        Enemies and chests are stored by spawn index, so `load_state` can restore the state into
+        any session (or process) that has the same level files. Only load states you saved.
+        """
+
+        world = self.world
+        enemy_index = {id(enemy): index for index, enemy in enumerate(self.spawned_enemies)}
+        chunk_platform_ids = {id(block) for block in world._World__chunkPlatforms}
+        state = {
+            "version": SESSION_STATE_VERSION,
+            "level_path": self.level_path,
+            "sim_ticks": self.sim_ticks,
+            "status": asdict(self.status),
+            "game_finished": self.context.gameFinished,
+            "player": _plain_fields(self.player),
+            "world": _plain_fields(world),
+            "chunk_platforms": [
+                index for index, chunk in enumerate(world._World__platforms) if chunk and id(chunk[0]) in chunk_platform_ids
+            ],
+            "enemies": [_plain_fields(enemy) for enemy in self.spawned_enemies],
+            "enemy_group": [enemy_index[id(enemy)] for enemy in world.enemyGroup],
+            "chunk_enemy_group": [enemy_index[id(enemy)] for enemy in world.chunkEnemyGroup],
+            "chests": [_plain_fields(chest) for chest in self.spawned_chests],
+            "chest_alive": [chest.alive() for chest in self.spawned_chests],
+            "bullets": [_plain_fields(bullet) for bullet in self.player.bulletGroup],
+        }
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_state(self, data: bytes):
+        """Restore a `save_state` snapshot; rebuilds the world first only if the level differs."""
+
+        state = pickle.loads(data)
+        if state.get("version") != SESSION_STATE_VERSION:
+            raise ValueError(f"Unsupported session state version: {state.get('version')}")
+        if state["level_path"] != self.level_path or self.world is None:
+            self.level_path = state["level_path"]
+            self._build_world()
+
+        world = self.world
+        self.sim_ticks = state["sim_ticks"]
+        self.status = EpisodeStatus(**state["status"])
+        self.context.gameFinished = state["game_finished"]
+        _apply_fields(self.player, state["player"])
+        _apply_fields(world, state["world"])
+        platforms = world._World__platforms
+        world._World__chunkPlatforms = [block for index in state["chunk_platforms"] for block in platforms[index]]
+
+        for enemy, fields in zip(self.spawned_enemies, state["enemies"]):
+            _apply_fields(enemy, fields)
+        world.enemyGroup.empty()
+        world.enemyGroup.add(*[self.spawned_enemies[index] for index in state["enemy_group"]])
+        world.chunkEnemyGroup.empty()
+        world.chunkEnemyGroup.add(*[self.spawned_enemies[index] for index in state["chunk_enemy_group"]])
+
+        world.chestGroup.empty()
+        for chest, fields, alive in zip(self.spawned_chests, state["chests"], state["chest_alive"]):
+            _apply_fields(chest, fields)
+            if alive:
+                world.chestGroup.add(chest)
+
+        self.player.bulletGroup.empty()
+        for fields in state["bullets"]:
+            x, y, width, height = fields["bulletPos"]
+            bullet = Bullet(x, y, width, height, fields["_Bullet__direction"], world)
+            _apply_fields(bullet, fields)
+            self.player.bulletGroup.add(bullet)
+        return self.get_observation()
+
     def _on_player_death(self):
         self.status.is_dead = True
         self.status.is_done = True
@@ -113,6 +330,8 @@ class GameSession:
         if level_path is not None:
             self.level_path = level_path
         self._build_world()
+        if self._memory_monitor is not None:
+            self._memory_monitor.on_reset()
         return self.get_observation()
 
     def _simulate_frame(self, action: Optional[GameAction] = None):
@@ -159,9 +378,15 @@ class GameSession:
             pygame.display.update()
             self.clock.tick(self.fps)
 
+        if self.sim_clock:
+            self.sim_ticks += 1000 // self.fps
+        if self.on_frame is not None:
+            self.on_frame(self)
         return killed_enemies
 
-    def step(self, action: Optional[GameAction], frames: int = 4):
+    def step(self, action: Optional[GameAction], frames: int = 4, observe: bool = True):
+        """Advance up to `frames` frames; `observe=False` skips the observation (search rollouts)."""
+
         start_x = float(self.player.playerPos.x)
         start_y = float(self.player.playerPos.y)
         killed_enemies = 0
@@ -171,12 +396,14 @@ class GameSession:
                 break
 
         self.status.step_count += 1
+        if self._profile_window is not None:
+            self._profile_window.advance()
         current_x = float(self.player.playerPos.x)
         current_y = float(self.player.playerPos.y)
         self.status.max_progress_x = max(self.status.max_progress_x, current_x)
 
         return {
-            "observation": self.get_observation(),
+            "observation": self.get_observation() if observe else None,
             "killed_enemies": killed_enemies,
             "current_x": current_x,
             "current_y": current_y,
@@ -400,5 +627,26 @@ class GameSession:
         self.screen.blit(self.surface, (0, 0))
         pygame.display.update()
 
+    @contextmanager
+    def profile(
+        self,
+        mode: str = "cprofile",
+        output_dir: str = "profiles",
+        start_step: int = 0,
+        stop_step: Optional[int] = None,
+        name: str = "game_session",
+    ):
+        """Profile steps `start_step..stop_step` of this session (counted from entering the block)."""
+
+        window = ProfileWindow(mode, output_dir, start_step, stop_step, name=name)
+        previous, self._profile_window = self._profile_window, window
+        try:
+            with window:
+                yield window
+        finally:
+            self._profile_window = previous
+
     def close(self):
+        if self._profile_window is not None:
+            self._profile_window.close()
         pygame.quit()
@@ -0,0 +1,257 @@
+"""Golden-trace equivalence checks between `GameSession` implementations or configurations.
+
+A trace plays seeded action sequences (all 16 button combinations, random and
+adversarial segments from `rl.soak.ActionStream`) on the simulation clock and
+records the game state after every simulated frame (player rect/speeds/
+direction, bullets, enemy rects and directions by spawn index, alive sets,
+chest state, episode status) plus every step's observation. Recording once
+with the reference code and checking an optimized implementation against the
+file, or comparing two implementations live, reports the first divergent
+frame together with a field-by-field diff.
+"""
+
+import gzip
+import hashlib
+import importlib
+import json
+import random
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from rl.game_types import GameAction
+from rl.soak import ActionStream
+
+TRACE_VERSION = 1
+# Every button combination, so candidates also see inputs the action presets never send (left+right).
+ACTIONS = [
+    GameAction(left=bool(bits & 1), right=bool(bits & 2), jump=bool(bits & 4), shoot=bool(bits & 8))
+    for bits in range(16)
+]
+
+
+@dataclass
+class Divergence:
+    episode: int
+    level_path: str
+    seed: int
+    step: int
+    frame: int
+    kind: str
+    diff: List[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        lines = [
+            f"First divergence: episode {self.episode} ({self.level_path}, seed {self.seed}), "
+            f"step {self.step}, frame {self.frame}: {self.kind}"
+        ]
+        lines.extend(f"  {line}" for line in self.diff)
+        return "\n".join(lines)
+
+
+def load_session_factory(spec: str) -> Callable:
+    """Resolve `module:attribute` (e.g. `rl.game_session:GameSession`) to a session factory."""
+
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Session spec must look like 'module:attribute', got {spec!r}")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _rect(rect) -> List[int]:
+    return [int(rect.x), int(rect.y), int(rect.width), int(rect.height)]
+
+
+def session_state(session, enemies: Sequence, chests: Sequence) -> Dict:
+    """Gameplay state of one frame; `enemies`/`chests` are the objects spawned at reset, in order."""
+
+    player = session.player
+    return {
+        "player": {
+            "rect": _rect(player.playerPos),
+            "speed_x": player.get_speed_x(),
+            "speed_y": player.speed_y,
+            "direction": player.get_direction(),
+        },
+        "bullets": sorted(_rect(bullet.bulletPos) for bullet in player.bulletGroup),
+        "enemies_alive": [index for index, enemy in enumerate(enemies) if enemy.alive()],
+        "enemies": {
+            str(index): {
+                "rect": _rect(enemy.enemyPos),
+                "direction": getattr(enemy, "_Enemy__direction", None),
+                "chunk": getattr(enemy, "_Enemy__currentChunk", None),
+            }
+            for index, enemy in enumerate(enemies)
+            if enemy.alive()
+        },
+        "chests": [
+            {"alive": chest.alive(), "rect": _rect(chest.chestPos), "opened": getattr(chest, "_Chest__gotOpened", None)}
+            for chest in chests
+        ],
+        "status": asdict(session.get_status()),
+    }
+
+
+def state_digest(state: Dict) -> str:
+    return hashlib.sha1(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def diff_states(expected, actual, prefix: str = "", limit: int = 20) -> List[str]:
+    """Human-readable differences between two nested state values."""
+
+    lines: List[str] = []
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in sorted(set(expected) | set(actual)):
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if key not in actual:
+                lines.append(f"{path}: missing in candidate (expected {expected[key]!r})")
+            elif key not in expected:
+                lines.append(f"{path}: unexpected in candidate ({actual[key]!r})")
+            else:
+                lines.extend(diff_states(expected[key], actual[key], path, limit))
+    elif expected != actual:
+        lines.append(f"{prefix}: expected {expected!r}, got {actual!r}")
+    return lines[:limit]
+
+
+def generate_actions(steps: int, rng: random.Random) -> List[int]:
+    stream = ActionStream(len(ACTIONS), "mixed", rng)
+    stream.new_episode()
+    return [stream.next() for _ in range(steps)]
+
+
+def record_episode(session, level_path: str, seed: int, actions: Sequence[int], frame_skip: int) -> Dict:
+    """Play `actions` until the episode ends; returns actions used, per-frame states and per-step observations."""
+
+    observation = session.reset(level_path=level_path, seed=seed)
+    enemies = list(session.world.enemyGroup)
+    chests = list(session.world.chestGroup)
+    states = [session_state(session, enemies, chests)]
+    previous_hook = session.on_frame
+    session.on_frame = lambda current: states.append(session_state(current, enemies, chests))
+    observations = [np.asarray(observation, dtype=np.float32).tolist()]
+    step_frames = []
+    played = []
+    try:
+        for action in actions:
+            if session.status.is_done:
+                break
+            result = session.step(ACTIONS[int(action)], frames=frame_skip)
+            played.append(int(action))
+            step_frames.append(len(states) - 1)
+            observations.append(np.asarray(result["observation"], dtype=np.float32).tolist())
+    finally:
+        session.on_frame = previous_hook
+    return {
+        "level_path": level_path,
+        "seed": seed,
+        "actions": played,
+        "step_frames": step_frames,
+        "states": states,
+        "digests": [state_digest(state) for state in states],
+        "observations": observations,
+    }
+
+
+def make_session(factory: Callable, level_path: str, obs_profile: str, session_kwargs: Optional[Dict] = None):
+    """Build a session for tracing; `session_kwargs` override the defaults (e.g. `obs_profile`)."""
+
+    defaults = {"level_path": level_path, "headless": True, "obs_profile": obs_profile, "sim_clock": True}
+    return factory(**{**defaults, **(session_kwargs or {})})
+
+
+def record_trace(
+    factory: Callable,
+    level_paths: Sequence[str],
+    episodes: int,
+    steps: int,
+    frame_skip: int = 2,
+    seed: int = 0,
+    obs_profile: str = "balanced",
+    session_kwargs: Optional[Dict] = None,
+    action_plan: Optional[Sequence[Dict]] = None,
+) -> Dict:
+    """Record a trace; with `action_plan` (the episodes of another trace) its levels/seeds/actions are replayed."""
+
+    if action_plan is None:
+        rng = random.Random(seed)
+        action_plan = [
+            {
+                "level_path": level_paths[index % len(level_paths)],
+                "seed": rng.randrange(2**31),
+                "actions": generate_actions(steps, rng),
+            }
+            for index in range(episodes)
+        ]
+    session = make_session(factory, action_plan[0]["level_path"], obs_profile, session_kwargs)
+    try:
+        recorded = [
+            record_episode(session, plan["level_path"], plan["seed"], plan["actions"], frame_skip) for plan in action_plan
+        ]
+    finally:
+        session.close()
+    return {
+        "version": TRACE_VERSION,
+        "settings": {
+            "frame_skip": frame_skip,
+            "obs_profile": (session_kwargs or {}).get("obs_profile", obs_profile),
+            "seed": seed,
+            "steps": steps,
+        },
+        "episodes": recorded,
+    }
+
+
+def compare_traces(golden: Dict, candidate: Dict, obs_atol: float = 0.0) -> Optional[Divergence]:
+    """First frame (or observation) where `candidate` differs from `golden`, or None.
+
+    Steps count applied actions: step 0 is the reset, step k the state after the k-th action.
+    """
+
+    for index, (expected, actual) in enumerate(zip(golden["episodes"], candidate["episodes"])):
+        header = {"episode": index, "level_path": expected["level_path"], "seed": expected["seed"]}
+        previous_frame = -1
+        for step, end_frame in enumerate([0] + expected["step_frames"]):
+            for frame in range(previous_frame + 1, min(end_frame + 1, len(actual["digests"]))):
+                if expected["digests"][frame] != actual["digests"][frame]:
+                    diff = diff_states(expected["states"][frame], actual["states"][frame])
+                    return Divergence(step=step, frame=frame, kind="state", diff=diff, **header)
+            previous_frame = end_frame
+            if step >= len(actual["observations"]):
+                break
+            expected_obs = np.asarray(expected["observations"][step], dtype=np.float32)
+            actual_obs = np.asarray(actual["observations"][step], dtype=np.float32)
+            if expected_obs.shape != actual_obs.shape:
+                diff = [f"shape {expected_obs.shape} vs {actual_obs.shape}"]
+                return Divergence(step=step, frame=end_frame, kind="observation", diff=diff, **header)
+            mismatched = np.flatnonzero(np.abs(expected_obs - actual_obs) > obs_atol)
+            if mismatched.size:
+                diff = [f"obs[{position}]: expected {expected_obs[position]:.6f}, got {actual_obs[position]:.6f}" for position in mismatched]
+                return Divergence(step=step, frame=end_frame, kind="observation", diff=diff, **header)
+        if len(expected["digests"]) != len(actual["digests"]):
+            return Divergence(
+                step=min(len(expected["actions"]), len(actual["actions"])),
+                frame=min(len(expected["digests"]), len(actual["digests"])),
+                kind="length",
+                diff=[f"golden has {len(expected['digests'])} frames, candidate {len(actual['digests'])}"],
+                **header,
+            )
+    if len(golden["episodes"]) != len(candidate["episodes"]):
+        return Divergence(-1, "", 0, 0, 0, "episodes", [f"{len(golden['episodes'])} vs {len(candidate['episodes'])} episodes"])
+    return None
+
+
+def save_trace(trace: Dict, path: str):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as file_obj:
+        json.dump(trace, file_obj)
+
+
+def load_trace(path: str) -> Dict:
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as file_obj:
+        trace = json.load(file_obj)
+    if trace.get("version") != TRACE_VERSION:
+        raise ValueError(f"{path}: unsupported trace version {trace.get('version')}")
+    return trace
@@ -0,0 +1,547 @@
+"""Static solvability and reachability analysis for level files.
+
+The analyzer replays the player's frame physics (`Player.movement`/`Player.move_y`
+and `World` block collisions) on the tile grid only, without sprites or Pygame
+surfaces. Jump arcs are traced from every reachable standing tile and a 0-1 BFS
+(walks cost 0, jumps cost 1) searches from the spawn to the chest.
+
+Enemies are not simulated. Stomping one bounces the player up again
+(`speed_y = -5` in `Player.check_enemy_collision`), which can carry it across
+a gap the jump arcs alone cannot, so on levels with enemies an unsolvable
+verdict only means "unsolvable without enemy stomps" (`LevelReport.verdict`).
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ANALYZER_VERSION = 2
+# Spawn and chest geometry mirror `rl.game_session` / `World` without importing Pygame assets.
+PLAYER_SPAWN_X = 120
+PLAYER_SPAWN_Y = 50
+CHEST_WIDTH = 60
+CHEST_HEIGHT = 40
+MAX_ARC_FRAMES = 240
+# Horizontal takeoff offsets inside a standing tile (left edge, centered, right edge).
+TAKEOFF_OFFSETS = (-30, 10, 50)
+# Number of frames the direction key stays held during a jump (None = whole flight).
+JUMP_HOLD_FRAMES = (4, 8, 14, None)
+# Tiles around a takeoff tile that one macro can reach; used as the arc memo key.
+ARC_WINDOW_COLS = 6
+ARC_WINDOW_ROWS_ABOVE = 3
+GOAL = ("goal", "goal")
+
+
+@dataclass(frozen=True)
+class JumpPhysics:
+    """Physics constants the reachability search depends on."""
+
+    jump_speed: int = -11
+    gravity: int = 1
+    movement_speed: int = 8
+    block_size: int = 60
+    player_width: int = 40
+    player_height: int = 60
+    chunk_offset: int = 20
+
+    @classmethod
+    def from_game(cls):
+        """Read the live constants from `Player` and `World`."""
+
+        from player import Player
+        from world import World
+
+        return cls(
+            jump_speed=int(Player.jump_speed),
+            gravity=int(World.gravity),
+            movement_speed=int(getattr(Player, "_Player__movement_speed")),
+            chunk_offset=int(getattr(World, "_World__chunkOffset")),
+        )
+
+
+@dataclass
+class LevelReport:
+    """Analysis result for one level file."""
+
+    level_path: str
+    level_hash: str
+    solvable: bool
+    min_jumps: Optional[int]
+    path_tiles: List[Tuple[int, int]] = field(default_factory=list)
+    hardest_gap: Optional[dict] = None
+    max_reachable_x: float = 0.0
+    level_width: float = 0.0
+    reachable_tiles: int = 0
+    enemies: int = 0
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+    cached: bool = False
+
+    @property
+    def verdict(self) -> str:
+        if self.solvable:
+            return "solvable"
+        # Stomp bounces are not modelled, so enemies may still open a route.
+        return "unsolvable without enemy stomps" if self.enemies else "unsolvable"
+
+
+class _TileGrid:
+    """Solid block lookup with the same overlap semantics as `pygame.Rect.colliderect`.
+
+    Rects are passed as plain `(x, y, width, height)` ints; the search creates
+    millions of them and `pygame.Rect` allocation would dominate the runtime.
+    """
+
+    def __init__(self, lines: List[str], physics: JumpPhysics):
+        self.physics = physics
+        size = physics.block_size
+        self.solid = set()
+        self.chests = []
+        self.enemies = 0
+        self.rows = len(lines)
+        self.cols = max((len(line.rstrip("\n")) for line in lines), default=1)
+        for row, line in enumerate(lines):
+            for col, tile in enumerate(line.rstrip("\n")):
+                if tile == "B":
+                    self.solid.add((row, col))
+                elif tile == "E":
+                    self.enemies += 1
+                elif tile == "C":
+                    self.chests.append((col * size, row * size + (size - CHEST_HEIGHT), CHEST_WIDTH, CHEST_HEIGHT))
+        self.width = max(self.cols, 1) * size
+        self.height = max(self.rows, 1) * size
+
+    def chunk_of(self, col):
+        """Chunk index `World` files a block column under (the first chunk is one column shorter)."""
+
+        offset = self.physics.chunk_offset
+        return 0 if col < offset else 1 + (col - offset) // (offset + 1)
+
+    def last_colliding_row(self, x, y, width, height):
+        """Row of the last solid block overlapping the rect in `World`'s platform order, or -1.
+
+        Platforms are listed chunk by chunk and row by row inside a chunk, so this is the
+        lowest block of the rightmost overlapped chunk, not necessarily the lowest overall.
+        """
+
+        size = self.physics.block_size
+        solid = self.solid
+        last = None
+        for row in range(y // size, (y + height - 1) // size + 1):
+            for col in range(x // size, (x + width - 1) // size + 1):
+                if (row, col) in solid:
+                    key = (self.chunk_of(col), row, col)
+                    if last is None or key > last:
+                        last = key
+        return -1 if last is None else last[1]
+
+    def collided_get_y(self, x, y, width, height, object_height):
+        """Mirror of `World.collided_get_y` (the last colliding block in chunk order wins)."""
+
+        row = self.last_colliding_row(x, y, width, height)
+        if row < 0:
+            return -1
+        return row * self.physics.block_size - object_height
+
+    def intersects_side_solid(self, x, y, width, height):
+        """Mirror of `World.intersects_side_solid`."""
+
+        size = self.physics.block_size
+        solid = self.solid
+        # Blocks whose top is not above `bottom - 1` only count as ground.
+        last_row = min((y + height - 1) // size, (y + height - 2) // size)
+        for row in range(y // size, last_row + 1):
+            for col in range(x // size, (x + width - 1) // size + 1):
+                if (row, col) in solid:
+                    return True
+        return False
+
+    def bump_ceiling(self, x, y, width, height, speed_y):
+        """Mirror of `World.check_player_collision_bottomblock`; returns the new (y, speed_y)."""
+
+        if speed_y >= 0:
+            return y, speed_y
+        size = self.physics.block_size
+        solid = self.solid
+        for row in range(y // size, (y + height - 1) // size + 1):
+            block_y = row * size
+            if block_y + (size / 2) >= y:
+                continue
+            for col in range(x // size, (x + width - 1) // size + 1):
+                if (row, col) in solid:
+                    return block_y + size, 0
+        return y, speed_y
+
+    def touches_chest(self, x, y, width, height):
+        for chest_x, chest_y, chest_w, chest_h in self.chests:
+            if x < chest_x + chest_w and chest_x < x + width and y < chest_y + chest_h and chest_y < y + height:
+                return True
+        return False
+
+    def is_standable(self, row, col):
+        return (row + 1, col) in self.solid and (row, col) not in self.solid
+
+
+def _simulate(grid: _TileGrid, x: int, y: int, direction: int, jump: bool, hold: Optional[int]):
+    """Replay one input macro frame by frame.
+
+    Returns `(outcome, x, y, min_x, max_x)` where outcome is "goal", "dead" or
+    "landed" and `min_x`/`max_x` bound the horizontal extent of the trajectory.
+    """
+
+    physics = grid.physics
+    width = physics.player_width
+    height = physics.player_height
+    move = physics.movement_speed
+    death_y = grid.height + height
+    speed_y = 0
+    airborne = False
+    min_x = max_x = x
+    for frame in range(MAX_ARC_FRAMES):
+        holding = hold is None or frame < hold
+        y, speed_y = grid.bump_ceiling(x, y, width, height, speed_y)
+
+        speed_x = 0
+        if holding and direction > 0 and not grid.intersects_side_solid(x + move, y, width, height):
+            speed_x = move
+        if holding and direction < 0 and x > 0 and not grid.intersects_side_solid(x - move, y, width, height):
+            speed_x = -move
+        if jump and frame == 0 and speed_y == 0 and grid.collided_get_y(x, y + height, width, 2, height) > 0:
+            speed_y = physics.jump_speed
+        if speed_x and not grid.intersects_side_solid(x + speed_x, y, width, height):
+            x += speed_x
+            min_x = min(min_x, x)
+            max_x = max(max_x, x)
+
+        collided_y = grid.collided_get_y(x, y + height, width, 2, height)
+        if speed_y < 0 or collided_y < 0 or (y < 600 and grid.intersects_side_solid(x, y, width, height)):
+            y += speed_y
+            speed_y += physics.gravity
+        if speed_y >= 0 and collided_y > 0:
+            y = collided_y
+            speed_y = 0
+
+        if grid.touches_chest(x, y, width, height):
+            return "goal", x, y, min_x, max_x
+        if y > death_y:
+            return "dead", x, y, min_x, max_x
+        grounded = speed_y == 0 and y == collided_y
+        if not grounded:
+            airborne = True
+        elif (jump and airborne) or (hold is not None and frame + 1 >= hold) or (hold is None and frame > 0 and not airborne):
+            return "landed", x, y, min_x, max_x
+    return "dead", x, y, min_x, max_x
+
+
+def _flat_jump_span(physics: JumpPhysics):
+    """Horizontal distance of a full-speed running jump on flat ground (px)."""
+
+    grid = _TileGrid(["." * 40 + "\n"] * 3 + ["B" * 40 + "\n"], physics)
+    start_x = 10 * physics.block_size
+    _, x_end, _, _, _ = _simulate(grid, start_x, 2 * physics.block_size, 1, True, None)
+    return x_end - start_x
+
+
+def _standing_tile(grid: _TileGrid, x: int, y: int):
+    """Map a grounded pixel position to the supporting tile closest to the player center."""
+
+    size = grid.physics.block_size
+    row = (y + grid.physics.player_height) // size - 1
+    center_col = (x + grid.physics.player_width // 2) // size
+    support = [
+        col
+        for col in range(x // size, (x + grid.physics.player_width - 1) // size + 1)
+        if grid.is_standable(row, col)
+    ]
+    if not support:
+        return None
+    return row, min(support, key=lambda col: abs(col - center_col))
+
+
+class LevelAnalyzer:
+    """Reachability search over standing tiles for one set of physics constants."""
+
+    def __init__(self, physics: Optional[JumpPhysics] = None, cache_dir: Optional[str] = None):
+        self.physics = physics or JumpPhysics.from_game()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory_cache: Dict[str, dict] = {}
+        self._arc_memo: Dict[tuple, tuple] = {}
+        self._max_span = float(_flat_jump_span(self.physics))
+
+    def content_hash(self, text: str):
+        payload = json.dumps([ANALYZER_VERSION, asdict(self.physics), text], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def analyze_file(self, level_path: str, use_cache: bool = True):
+        with open(level_path, "r", encoding="utf-8") as level_file:
+            text = level_file.read()
+        return self.analyze_text(text, level_path=str(level_path), use_cache=use_cache)
+
+    def analyze_text(self, text: str, level_path: str = "<memory>", use_cache: bool = True):
+        level_hash = self.content_hash(text)
+        cached = self._load_cached(level_hash) if use_cache else None
+        if cached is not None:
+            cached.update(level_path=level_path, cached=True)
+            return LevelReport(**cached)
+
+        start = time.perf_counter()
+        report = self._analyze(text.splitlines(keepends=True), level_path, level_hash)
+        report.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if use_cache:
+            self._store_cached(level_hash, report)
+        return report
+
+    def _cache_file(self, level_hash: str):
+        return self.cache_dir / f"{level_hash}.json"
+
+    def _load_cached(self, level_hash: str):
+        if level_hash in self._memory_cache:
+            return dict(self._memory_cache[level_hash])
+        if self.cache_dir is None or not self._cache_file(level_hash).exists():
+            return None
+        with open(self._cache_file(level_hash), "r", encoding="utf-8") as file_obj:
+            data = json.load(file_obj)
+        data["path_tiles"] = [tuple(tile) for tile in data.get("path_tiles", [])]
+        self._memory_cache[level_hash] = data
+        return dict(data)
+
+    def _store_cached(self, level_hash: str, report: LevelReport):
+        data = asdict(report)
+        self._memory_cache[level_hash] = data
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._cache_file(level_hash).with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file_obj:
+            json.dump(data, file_obj)
+        os.replace(tmp_path, self._cache_file(level_hash))
+
+    def _neighborhood_key(self, grid: _TileGrid, tile):
+        """Signature of everything a macro started on `tile` can touch inside the arc window."""
+
+        row, col = tile
+        cells = []
+        for d_row in range(-ARC_WINDOW_ROWS_ABOVE, grid.rows - row):
+            for d_col in range(-ARC_WINDOW_COLS, ARC_WINDOW_COLS + 1):
+                if (row + d_row, col + d_col) in grid.solid:
+                    cells.append((d_row, d_col))
+        size = self.physics.block_size
+        chests = tuple(
+            (chest_x - col * size, chest_y - row * size)
+            for chest_x, chest_y, _, _ in grid.chests
+            if abs(chest_x - col * size) <= (ARC_WINDOW_COLS + 1) * size
+        )
+        # Ground contact depends on where chunks start (see `last_colliding_row`).
+        chunk_starts = tuple(
+            d_col
+            for d_col in range(-ARC_WINDOW_COLS, ARC_WINDOW_COLS + 1)
+            if grid.chunk_of(col + d_col) != grid.chunk_of(col + d_col - 1)
+        )
+        # The left level border changes `movement()` and must be part of the key.
+        return grid.rows - row, min(col, ARC_WINDOW_COLS + 1), tuple(cells), chests, chunk_starts
+
+    def _arc_outcomes(self, grid: _TileGrid, tile):
+        """Run every input macro from one standing tile.
+
+        Outcomes are stored relative to the tile origin so tiles with identical
+        surroundings (long runways, repeated gap patterns) share one computation.
+        """
+
+        key = self._neighborhood_key(grid, tile)
+        cached = self._arc_memo.get(key)
+        if cached is not None:
+            return cached
+
+        size = self.physics.block_size
+        width = self.physics.player_width
+        height = self.physics.player_height
+        row, col = tile
+        origin_x = col * size
+        y = row * size
+        window_min = origin_x - ARC_WINDOW_COLS * size
+        window_max = origin_x + (ARC_WINDOW_COLS + 1) * size - width
+        outcomes = []
+        inside_window = True
+
+        def run(start_x, direction, jump, hold):
+            nonlocal inside_window
+            outcome, x_end, y_end, min_x, max_x = _simulate(grid, start_x, y, direction, jump, hold)
+            if min_x < window_min or max_x > window_max:
+                inside_window = False
+            if outcome != "dead":
+                outcomes.append((outcome, x_end - origin_x, y_end - y, jump, abs(x_end - start_x)))
+
+        center_x = origin_x + TAKEOFF_OFFSETS[1]
+        for direction in (-1, 1):
+            run(center_x, direction, False, size // self.physics.movement_speed)
+
+        for offset in TAKEOFF_OFFSETS:
+            side = 0 if offset == TAKEOFF_OFFSETS[1] else (1 if offset > TAKEOFF_OFFSETS[1] else -1)
+            if side and grid.is_standable(row, col + side):
+                # Inside a runway the edge takeoff equals a centered takeoff from the neighbor tile.
+                continue
+            start_x = origin_x + offset
+            if start_x < 0 or grid.intersects_side_solid(start_x, y, width, height):
+                continue
+            if grid.collided_get_y(start_x, y + height, width, 2, height) < 0:
+                continue
+            run(start_x, 0, True, None)
+            for direction in (-1, 1):
+                for hold in JUMP_HOLD_FRAMES:
+                    run(start_x, direction, True, hold)
+
+        outcomes = tuple(outcomes)
+        if inside_window:
+            self._arc_memo[key] = outcomes
+        return outcomes
+
+    def _edges(self, grid: _TileGrid, tile):
+        """All tiles (or GOAL) reachable from one standing tile with a single input macro."""
+
+        size = self.physics.block_size
+        origin_x = tile[1] * size
+        origin_y = tile[0] * size
+        edges = {}
+        for outcome, dx, dy, jump, span in self._arc_outcomes(grid, tile):
+            target = GOAL if outcome == "goal" else _standing_tile(grid, origin_x + dx, origin_y + dy)
+            if target is None or target == tile:
+                continue
+            cost = 1 if jump else 0
+            if target not in edges or (cost, span) < edges[target]:
+                edges[target] = (cost, span)
+        return edges
+
+    def _gap_tiles(self, grid: _TileGrid, source, target):
+        """Number of unsupported columns under the takeoff row between two tiles."""
+
+        if target == GOAL:
+            return 0
+        row = source[0]
+        low, high = sorted((source[1], target[1]))
+        return sum(1 for col in range(low + 1, high) if (row + 1, col) not in grid.solid)
+
+    def _analyze(self, lines: List[str], level_path: str, level_hash: str):
+        grid = _TileGrid(lines, self.physics)
+        report = LevelReport(
+            level_path=level_path,
+            level_hash=level_hash,
+            solvable=False,
+            min_jumps=None,
+            level_width=float(grid.width),
+            enemies=grid.enemies,
+        )
+        if not grid.chests:
+            report.error = "Level has no chest ('C') tile."
+            return report
+
+        outcome, x, y, _, _ = _simulate(grid, PLAYER_SPAWN_X, PLAYER_SPAWN_Y, 0, False, 0)
+        if outcome == "goal":
+            report.solvable = True
+            report.min_jumps = 0
+            return report
+        start = _standing_tile(grid, x, y) if outcome == "landed" else None
+        if start is None:
+            report.error = "Player does not land on solid ground after spawning."
+            return report
+
+        # 0-1 BFS: walking/falling is free, every jump costs one.
+        dist = {start: 0}
+        parent = {start: None}
+        edge_info = {}
+        queue = deque([start])
+        settled = set()
+        while queue:
+            tile = queue.popleft()
+            if tile in settled:
+                continue
+            settled.add(tile)
+            if tile == GOAL:
+                break
+            for target, (cost, span) in self._edges(grid, tile).items():
+                new_dist = dist[tile] + cost
+                if new_dist < dist.get(target, float("inf")):
+                    dist[target] = new_dist
+                    parent[target] = tile
+                    edge_info[target] = (cost, span)
+                    if cost == 0:
+                        queue.appendleft(target)
+                    else:
+                        queue.append(target)
+
+        standing = [tile for tile in settled if tile != GOAL]
+        report.reachable_tiles = len(standing)
+        report.max_reachable_x = float(max(col for _, col in standing) * self.physics.block_size) if standing else 0.0
+        if GOAL not in dist:
+            return report
+
+        report.solvable = True
+        report.min_jumps = int(dist[GOAL])
+        path = []
+        node = GOAL
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        report.path_tiles = [tuple(tile) for tile in path if tile != GOAL]
+
+        hardest = None
+        for source, target in zip(path, path[1:]):
+            cost, span = edge_info[target]
+            if cost == 0:
+                continue
+            gap = {
+                "from_tile": list(source),
+                "to_tile": None if target == GOAL else list(target),
+                "gap_tiles": self._gap_tiles(grid, source, target),
+                "rise_tiles": 0 if target == GOAL else int(source[0] - target[0]),
+                "span_px": int(span),
+                "span_ratio": round(span / max(self._max_span, 1.0), 3),
+            }
+            key = (gap["gap_tiles"], gap["rise_tiles"], gap["span_ratio"])
+            if hardest is None or key > (hardest["gap_tiles"], hardest["rise_tiles"], hardest["span_ratio"]):
+                hardest = gap
+        report.hardest_gap = hardest
+        return report
+
+
+def _analyze_worker(job):
+    level_path, cache_dir, use_cache = job
+    analyzer = LevelAnalyzer(cache_dir=cache_dir)
+    try:
+        return analyzer.analyze_file(level_path, use_cache=use_cache)
+    except (OSError, UnicodeDecodeError) as error:
+        return LevelReport(level_path=str(level_path), level_hash="", solvable=False, min_jumps=None, error=str(error))
+
+
+def collect_level_paths(paths: Iterable[str], pattern: str = "level*.txt"):
+    """Expand files and directories into a sorted list of level files."""
+
+    level_paths = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            level_paths.extend(sorted(path.glob(pattern)))
+        else:
+            level_paths.append(path)
+    return [str(path) for path in level_paths]
+
+
+def validate_levels(
+    level_paths: Iterable[str],
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True,
+):
+    """Analyze many levels, optionally across a process pool, in input order."""
+
+    jobs = [(str(path), cache_dir, use_cache) for path in level_paths]
+    if workers <= 1 or len(jobs) <= 1:
+        return [_analyze_worker(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(int(workers), len(jobs))) as pool:
+        return list(pool.map(_analyze_worker, jobs))
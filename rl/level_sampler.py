@@ -0,0 +1,115 @@
+"""Per-episode level selection for multi-level training.
+
+`LevelSampler` keeps streaming statistics for every level in a pool and picks
+the next level with a rank-based prioritized scheme: levels are ranked by a
+score mixing recent failure rate and progress variance, the rank
+distribution is blended with a staleness term so no level is starved, and
+levels that were never played are tried first.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+SAMPLING_STRATEGIES = ("prioritized", "uniform", "sequential")
+
+
+@dataclass
+class LevelStats:
+    episodes: int = 0
+    failure_rate: float = 1.0
+    progress_mean: float = 0.0
+    progress_var: float = 0.0
+    last_sampled: int = -1
+
+
+class LevelSampler:
+    """Chooses levels from `level_paths` and learns which ones still need practice."""
+
+    def __init__(
+        self,
+        level_paths: Sequence[str],
+        strategy: str = "prioritized",
+        ema_alpha: float = 0.1,
+        temperature: float = 0.3,
+        staleness_coef: float = 0.2,
+        variance_weight: float = 0.5,
+    ):
+        if not level_paths:
+            raise ValueError("LevelSampler needs at least one level.")
+        if strategy not in SAMPLING_STRATEGIES:
+            raise ValueError(f"Unsupported level sampling strategy: {strategy}")
+        self.level_paths: List[str] = list(level_paths)
+        self.strategy = strategy
+        self.ema_alpha = float(ema_alpha)
+        self.temperature = max(1e-3, float(temperature))
+        self.staleness_coef = float(np.clip(staleness_coef, 0.0, 1.0))
+        self.variance_weight = float(variance_weight)
+        self.stats: List[LevelStats] = [LevelStats() for _ in self.level_paths]
+        self.samples = 0
+        self._index = {path: index for index, path in enumerate(self.level_paths)}
+        self._last_probabilities = np.full(len(self.level_paths), 1.0 / len(self.level_paths))
+
+    def scores(self):
+        failure = np.array([stats.failure_rate for stats in self.stats])
+        progress_std = np.sqrt(np.array([stats.progress_var for stats in self.stats]))
+        return failure + self.variance_weight * progress_std
+
+    def probabilities(self):
+        count = len(self.level_paths)
+        if self.strategy == "uniform":
+            return np.full(count, 1.0 / count)
+        if self.strategy == "sequential":
+            probabilities = np.zeros(count)
+            probabilities[self.samples % count] = 1.0
+            return probabilities
+
+        unseen = np.array([stats.episodes == 0 for stats in self.stats])
+        if unseen.any():
+            return unseen / unseen.sum()
+        # Rank-based priorities (rank 1 = highest score) are robust to the score scale;
+        # ties go to the level that waited longest.
+        last_sampled = np.array([stats.last_sampled for stats in self.stats])
+        ranks = np.empty(count)
+        ranks[np.lexsort((last_sampled, -self.scores()))] = np.arange(1, count + 1)
+        score_weights = (1.0 / ranks) ** (1.0 / self.temperature)
+        score_probabilities = score_weights / score_weights.sum()
+        staleness = np.array([self.samples - stats.last_sampled for stats in self.stats], dtype=np.float64)
+        stale_probabilities = staleness / staleness.sum() if staleness.sum() > 0 else np.full(count, 1.0 / count)
+        return (1.0 - self.staleness_coef) * score_probabilities + self.staleness_coef * stale_probabilities
+
+    def sample(self, rng: np.random.Generator) -> str:
+        probabilities = self.probabilities()
+        index = int(rng.choice(len(self.level_paths), p=probabilities))
+        self._last_probabilities = probabilities
+        self.stats[index].last_sampled = self.samples
+        self.samples += 1
+        return self.level_paths[index]
+
+    def update(self, level_path: str, is_win: bool, progress: float):
+        """Fold one finished episode (`progress` normalized to 0..1) into the level's stats."""
+
+        stats = self.stats[self._index[level_path]]
+        alpha = 1.0 if stats.episodes == 0 else self.ema_alpha
+        failure = 0.0 if is_win else 1.0
+        stats.failure_rate += alpha * (failure - stats.failure_rate)
+        delta = progress - stats.progress_mean
+        stats.progress_mean += alpha * delta
+        stats.progress_var = (1.0 - alpha) * (stats.progress_var + alpha * delta * delta)
+        stats.episodes += 1
+
+    def level_info(self, level_path: str) -> Dict[str, float]:
+        index = self._index[level_path]
+        stats = self.stats[index]
+        return {
+            "level_index": index,
+            "level_episodes": stats.episodes,
+            "level_failure_rate": float(stats.failure_rate),
+            "level_progress_mean": float(stats.progress_mean),
+            "level_progress_std": float(np.sqrt(stats.progress_var)),
+            "level_sample_prob": float(self._last_probabilities[index]),
+        }
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {path: asdict(stats) for path, stats in zip(self.level_paths, self.stats)}
@@ -0,0 +1,238 @@
+"""Opt-in memory accounting for long runs: growth per reset, live game objects, per-stage RSS.
+
+`MemoryMonitor` is fed by `GameSession.reset`. Every `every_resets` resets it
+takes a `tracemalloc` snapshot, diffs it against the previous one and logs
+traced/RSS growth per reset, live `Enemy`/`Bullet`/`Chest`/`Player`/`World`
+and `pygame.Surface` counts to `memory_<name>.csv`, the largest allocation
+diffs to `memory_<name>_top.txt`, and a warning when traced growth per reset
+exceeds the threshold. Traced sizes only count allocations made by the game
+and `rl` modules, so torch/SB3 setup in the same process is not reported as
+growth. Tracing itself still slows every allocation in the process (a PPO
+learner with in-process envs runs about 4x slower), so the trainer only
+monitors itself when its envs run in-process. Like profiling, child processes (subproc env workers)
+opt in through an environment variable (`JUMPNRUN_MEMORY`), one file per
+process. `record_stage_memory` appends the trainer's RSS after each stage.
+"""
+
+import csv
+import gc
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Optional
+
+from loguru import logger
+
+MEMORY_ENV_VAR = "JUMPNRUN_MEMORY"
+TRACKED_CLASSES = ("Enemy", "Bullet", "Chest", "Player", "World")
+MEMORY_COLUMNS = [
+    "wall_time",
+    "resets",
+    "rss_mb",
+    "traced_mb",
+    "traced_kb_per_reset",
+    "rss_kb_per_reset",
+    *(name.lower() for name in TRACKED_CLASSES),
+    "surface",
+    "leak_warning",
+]
+# Game modules live in the repository root, training code in `rl/`.
+SOURCE_ROOT = str(Path(__file__).resolve().parents[1])
+STAGE_MEMORY_COLUMNS = ["wall_time", "stage", "timesteps", "rss_mb", "children_rss_mb", *(name.lower() for name in TRACKED_CLASSES), "surface"]
+
+_process_monitor = None
+
+
+def current_rss_mb() -> float:
+    """RSS of this process without the psutil/SB3 imports of `rl.telemetry` (cheap in env workers)."""
+
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as file_obj:
+            return int(file_obj.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def live_object_counts() -> Dict[str, int]:
+    """Count live game objects by class name, plus surfaces referenced from Python objects.
+
+    `pygame.Surface` is not tracked by the garbage collector, so surfaces are
+    found through the referents of tracked containers (sprites, dicts, lists).
+    """
+
+    import pygame
+
+    counts = {name.lower(): 0 for name in TRACKED_CLASSES}
+    surfaces = set()
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in TRACKED_CLASSES:
+            counts[name.lower()] += 1
+        for referent in gc.get_referents(obj):
+            if type(referent) is pygame.Surface:
+                surfaces.add(id(referent))
+    counts["surface"] = len(surfaces)
+    return counts
+
+
+class MemoryMonitor:
+    """Samples memory every `every_resets` resets and warns on steady growth."""
+
+    def __init__(
+        self,
+        output_dir: str,
+        name: str = "memory",
+        every_resets: int = 50,
+        growth_threshold_kb: float = 64.0,
+        top: int = 15,
+        frames: int = 1,
+    ):
+        self.output_dir = Path(output_dir)
+        self.name = name
+        self.every_resets = max(1, int(every_resets))
+        self.growth_threshold_kb = float(growth_threshold_kb)
+        self.top = int(top)
+        self.resets = 0
+        self.warnings = 0
+        self._previous = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(int(frames))
+
+    @property
+    def csv_path(self) -> Path:
+        return self.output_dir / f"memory_{self.name}.csv"
+
+    def on_reset(self):
+        self.resets += 1
+        # The baseline is the first regular sample: by then caches (sprites, level files), the model
+        # and the training callbacks' log files exist, so one-time setup is not reported as growth.
+        if self.resets % self.every_resets == 0:
+            self.sample()
+
+    def sample(self):
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(True, os.path.join(SOURCE_ROOT, "*")),
+                tracemalloc.Filter(False, os.path.join(SOURCE_ROOT, "*", "site-packages", "*")),
+            ]
+        )
+        current = {
+            "resets": self.resets,
+            "snapshot": snapshot,
+            "traced": sum(stat.size for stat in snapshot.statistics("filename")),
+            "rss_mb": current_rss_mb(),
+        }
+        previous, self._previous = self._previous, current
+        if previous is None:
+            return None
+        resets = max(1, current["resets"] - previous["resets"])
+        traced_kb = (current["traced"] - previous["traced"]) / 1024 / resets
+        rss_kb = (current["rss_mb"] - previous["rss_mb"]) * 1024 / resets
+        counts = live_object_counts()
+        leak = traced_kb > self.growth_threshold_kb
+        row = {
+            "wall_time": round(time.time(), 3),
+            "resets": self.resets,
+            "rss_mb": round(current["rss_mb"], 1),
+            "traced_mb": round(current["traced"] / 2**20, 2),
+            "traced_kb_per_reset": round(traced_kb, 2),
+            "rss_kb_per_reset": round(rss_kb, 2),
+            **counts,
+            "leak_warning": int(leak),
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        write_header = not self.csv_path.exists()
+        with open(self.csv_path, "a", newline="", encoding="utf-8") as file_obj:
+            writer = csv.DictWriter(file_obj, fieldnames=MEMORY_COLUMNS)
+            if write_header:
+                writer.writeheader()
+            writer.writerow(row)
+        with open(self.output_dir / f"memory_{self.name}_top.txt", "a", encoding="utf-8") as file_obj:
+            file_obj.write(f"# resets {previous['resets']} -> {self.resets}\n")
+            for stat in snapshot.compare_to(previous["snapshot"], "lineno")[: self.top]:
+                file_obj.write(f"{stat}\n")
+        if leak:
+            self.warnings += 1
+            logger.warning(
+                f"Memory '{self.name}' grew {traced_kb:.1f} KiB/reset over resets {previous['resets']}-{self.resets} "
+                f"(threshold {self.growth_threshold_kb:.0f} KiB, RSS {current['rss_mb']:.0f} MB, live {counts}); "
+                f"see {self.output_dir / f'memory_{self.name}_top.txt'}"
+            )
+        return row
+
+
+def enable_process_memory_monitor(
+    output_dir: str,
+    every_resets: int = 50,
+    growth_threshold_kb: float = 64.0,
+    name: str = "worker",
+    include_parent: bool = True,
+):
+    """Ask every process that creates a `GameSession` to monitor its memory.
+
+    With `include_parent=False` only child processes (env workers, actors) are
+    monitored and this process runs without tracing overhead.
+    """
+
+    os.environ[MEMORY_ENV_VAR] = json.dumps(
+        {
+            "output_dir": str(Path(output_dir).resolve()),
+            "every_resets": int(every_resets),
+            "growth_threshold_kb": float(growth_threshold_kb),
+            "name": name,
+            "parent_pid": os.getpid(),
+            "include_parent": bool(include_parent),
+        }
+    )
+
+
+def process_memory_monitor() -> Optional[MemoryMonitor]:
+    """The memory monitor of this process requested via `JUMPNRUN_MEMORY`, if any."""
+
+    global _process_monitor
+    pid = os.getpid()
+    if _process_monitor is not None and _process_monitor[0] == pid:
+        return _process_monitor[1]
+    monitor = None
+    spec = os.environ.get(MEMORY_ENV_VAR)
+    if spec:
+        spec = json.loads(spec)
+        is_parent = spec.get("parent_pid") == pid
+        if not is_parent or spec.get("include_parent", True):
+            name = "main" if is_parent else f"{spec.get('name', 'worker')}_{pid}"
+            monitor = MemoryMonitor(spec["output_dir"], name, spec["every_resets"], spec["growth_threshold_kb"])
+    _process_monitor = (pid, monitor)
+    return monitor
+
+
+def record_stage_memory(metrics_dir: str, stage: str, timesteps: int):
+    """Append the trainer's (and its children's) RSS plus live object counts after a stage."""
+
+    from rl.telemetry import process_rss_mb
+
+    rss_mb, children_rss_mb = process_rss_mb()
+    row = {
+        "wall_time": round(time.time(), 3),
+        "stage": stage,
+        "timesteps": int(timesteps),
+        "rss_mb": round(rss_mb, 1),
+        "children_rss_mb": round(children_rss_mb, 1),
+        **live_object_counts(),
+    }
+    path = Path(metrics_dir) / "stage_memory.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_header = not path.exists()
+    with open(path, "a", newline="", encoding="utf-8") as file_obj:
+        writer = csv.DictWriter(file_obj, fieldnames=STAGE_MEMORY_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        writer.writerow(row)
+    counts = {name: row[name] for name in STAGE_MEMORY_COLUMNS[5:]}
+    logger.info(f"Stage '{stage}' memory: RSS {rss_mb:.0f} MB (+{children_rss_mb:.0f} MB in workers), live {counts}")
+    return row
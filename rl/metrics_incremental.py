@@ -0,0 +1,269 @@
+"""Incremental episode-metrics export with bounded plot cost.
+
+`IncrementalMetricsExporter` remembers how far it has read an episode log
+(CSV byte offset or columnar row count) and keeps running summaries, rolling
+window tails and min/max-decimated plot series in a small JSON state file.
+Each export only reads the rows appended since the last one, and every plot
+draws at most `max_points` buckets no matter how many episodes the run has.
+"""
+
+import io
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from rl.episode_log import EPISODE_COLUMN_NAMES, ColumnarEpisodeReader, columnar_log_exists
+
+STATE_VERSION = 1
+SERIES_COLUMNS = ["episode_reward", "episode_length", "max_progress_x", "is_win"]
+SUMMARY_COLUMNS = ["episode_reward", "episode_length", "is_win", "max_progress_x"]
+
+
+class DecimatedSeries:
+    """Min/max/mean buckets over consecutive episodes, at most `max_buckets` of them.
+
+    Buckets always cover `bucket_width` episodes aligned to multiples of the width,
+    and only the last bucket can be partial. When the series would exceed
+    `max_buckets`, adjacent pairs are merged and the width doubles.
+    """
+
+    def __init__(self, max_buckets: int = 2000):
+        self.max_buckets = max(2, int(max_buckets))
+        self.bucket_width = 1
+        self.count = 0
+        self.mins = np.empty(0, dtype=np.float64)
+        self.maxs = np.empty(0, dtype=np.float64)
+        self.sums = np.empty(0, dtype=np.float64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def extend(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        while -(-(self.count + values.size) // self.bucket_width) > self.max_buckets:
+            self._merge_pairs()
+
+        partial = self.count % self.bucket_width
+        if partial:
+            head = values[: self.bucket_width - partial]
+            self.mins[-1] = min(self.mins[-1], head.min())
+            self.maxs[-1] = max(self.maxs[-1], head.max())
+            self.sums[-1] += head.sum()
+            self.counts[-1] += head.size
+            self.count += head.size
+            values = values[head.size :]
+        if values.size:
+            starts = np.arange(0, values.size, self.bucket_width)
+            self.mins = np.concatenate([self.mins, np.minimum.reduceat(values, starts)])
+            self.maxs = np.concatenate([self.maxs, np.maximum.reduceat(values, starts)])
+            self.sums = np.concatenate([self.sums, np.add.reduceat(values, starts)])
+            self.counts = np.concatenate([self.counts, np.diff(np.append(starts, values.size))])
+            self.count += values.size
+
+    def _merge_pairs(self):
+        size = self.mins.size
+        if size > 1:
+            starts = np.arange(0, size, 2)
+            self.mins = np.minimum.reduceat(self.mins, starts)
+            self.maxs = np.maximum.reduceat(self.maxs, starts)
+            self.sums = np.add.reduceat(self.sums, starts)
+            self.counts = np.add.reduceat(self.counts, starts)
+        self.bucket_width *= 2
+
+    def x(self):
+        """1-based episode number at the center of each bucket."""
+
+        return np.arange(self.mins.size) * self.bucket_width + (self.counts + 1) / 2.0
+
+    def means(self):
+        return self.sums / np.maximum(self.counts, 1)
+
+    def to_state(self):
+        return {
+            "max_buckets": self.max_buckets,
+            "bucket_width": self.bucket_width,
+            "count": self.count,
+            "mins": self.mins.tolist(),
+            "maxs": self.maxs.tolist(),
+            "sums": self.sums.tolist(),
+            "counts": self.counts.tolist(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict):
+        series = cls(state["max_buckets"])
+        series.bucket_width = int(state["bucket_width"])
+        series.count = int(state["count"])
+        series.mins = np.asarray(state["mins"], dtype=np.float64)
+        series.maxs = np.asarray(state["maxs"], dtype=np.float64)
+        series.sums = np.asarray(state["sums"], dtype=np.float64)
+        series.counts = np.asarray(state["counts"], dtype=np.int64)
+        return series
+
+
+def rolling_mean_continued(tail: np.ndarray, values: np.ndarray, window: int):
+    """Rolling mean (min_periods=1) of `values`, continuing after the previous `tail` values."""
+
+    combined = np.concatenate([tail, values]).astype(np.float64)
+    cumulative = np.concatenate([[0.0], np.cumsum(combined)])
+    ends = np.arange(tail.size + 1, combined.size + 1)
+    starts = np.maximum(0, ends - window)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+class IncrementalMetricsExporter:
+    """Reads new episode rows in chunks and folds them into persisted export state."""
+
+    def __init__(
+        self,
+        metrics_dir: str,
+        window: int = 50,
+        max_points: int = 2000,
+        chunk_rows: int = 1_000_000,
+        source: str = "auto",
+        state_path: Optional[str] = None,
+    ):
+        self.metrics_dir = Path(metrics_dir)
+        self.window = max(1, int(window))
+        self.max_points = int(max_points)
+        self.chunk_rows = max(1, int(chunk_rows))
+        self.csv_file = self.metrics_dir / "episodes.csv"
+        self.columnar_dir = self.metrics_dir / "episodes.cols"
+        self.source = self._resolve_source(source)
+        self.state_path = Path(state_path) if state_path else self.metrics_dir / "export_state.json"
+        self.state = self._load_state()
+
+    def _resolve_source(self, source: str):
+        if source == "auto":
+            return "columnar" if columnar_log_exists(str(self.columnar_dir)) else "csv"
+        if source == "columnar" and not columnar_log_exists(str(self.columnar_dir)):
+            raise FileNotFoundError(f"Columnar metrics log not found: {self.columnar_dir}")
+        if source == "csv" and not self.csv_file.exists():
+            raise FileNotFoundError(f"Metrics file not found: {self.csv_file}")
+        return source
+
+    def _fresh_state(self):
+        return {
+            "version": STATE_VERSION,
+            "source": self.source,
+            "window": self.window,
+            "max_points": self.max_points,
+            "position": 0,
+            "episodes": 0,
+            "sums": {name: 0.0 for name in SUMMARY_COLUMNS},
+            "tails": {name: [] for name in SERIES_COLUMNS},
+            "raw": {name: DecimatedSeries(self.max_points).to_state() for name in SERIES_COLUMNS},
+            "rolling": {name: DecimatedSeries(self.max_points).to_state() for name in SERIES_COLUMNS},
+        }
+
+    def _load_state(self):
+        if self.state_path.exists():
+            with open(self.state_path, "r", encoding="utf-8") as file_obj:
+                state = json.load(file_obj)
+            settings = (state.get("version"), state.get("source"), state.get("window"), state.get("max_points"))
+            if settings == (STATE_VERSION, self.source, self.window, self.max_points):
+                return state
+        return self._fresh_state()
+
+    def reset(self):
+        self.state = self._fresh_state()
+
+    def save_state(self):
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file_obj:
+            json.dump(self.state, file_obj)
+        tmp_path.replace(self.state_path)
+
+    def update(self):
+        """Fold all rows appended since the last call into the state; returns the new row count."""
+
+        if self._log_length() < int(self.state["position"]):
+            # The log was truncated or replaced; start over before the series are loaded.
+            self.reset()
+        chunks = self._columnar_chunks() if self.source == "columnar" else self._csv_chunks()
+        raw = {name: DecimatedSeries.from_state(self.state["raw"][name]) for name in SERIES_COLUMNS}
+        rolling = {name: DecimatedSeries.from_state(self.state["rolling"][name]) for name in SERIES_COLUMNS}
+        new_rows = 0
+        for columns, position in chunks:
+            rows = len(columns[SERIES_COLUMNS[0]])
+            for name in SUMMARY_COLUMNS:
+                self.state["sums"][name] += float(np.sum(columns[name], dtype=np.float64))
+            for name in SERIES_COLUMNS:
+                values = np.asarray(columns[name], dtype=np.float64)
+                tail = np.asarray(self.state["tails"][name], dtype=np.float64)
+                raw[name].extend(values)
+                rolling[name].extend(rolling_mean_continued(tail, values, self.window))
+                history = np.concatenate([tail, values])
+                keep = self.window - 1
+                self.state["tails"][name] = history[history.size - keep :].tolist() if keep else []
+            self.state["episodes"] += rows
+            self.state["position"] = position
+            new_rows += rows
+        for name in SERIES_COLUMNS:
+            self.state["raw"][name] = raw[name].to_state()
+            self.state["rolling"][name] = rolling[name].to_state()
+        return new_rows
+
+    def _log_length(self):
+        """Current log size in the unit of `state["position"]` (CSV bytes or columnar rows)."""
+
+        if self.source == "columnar":
+            return len(ColumnarEpisodeReader(str(self.columnar_dir)))
+        return self.csv_file.stat().st_size
+
+    def _csv_chunks(self):
+        position = int(self.state["position"])
+        with open(self.csv_file, "rb") as file_obj:
+            if position == 0:
+                header = file_obj.readline()
+                position = len(header)
+            file_obj.seek(position)
+            # Roughly `chunk_rows` rows per block; a CSV row is well under 256 bytes.
+            block_bytes = self.chunk_rows * 256
+            carry = b""
+            while True:
+                block = file_obj.read(block_bytes)
+                if not block:
+                    break
+                block = carry + block
+                cut = block.rfind(b"\n") + 1
+                carry = block[cut:]
+                if cut == 0:
+                    continue
+                position += cut
+                yield self._parse_csv_block(block[:cut]), position
+
+    @staticmethod
+    def _parse_csv_block(block: bytes):
+        import pandas as pd
+
+        frame = pd.read_csv(io.BytesIO(block), header=None, names=EPISODE_COLUMN_NAMES, usecols=SERIES_COLUMNS)
+        return {name: frame[name].to_numpy() for name in SERIES_COLUMNS}
+
+    def _columnar_chunks(self):
+        reader = ColumnarEpisodeReader(str(self.columnar_dir))
+        total = len(reader)
+        position = int(self.state["position"])
+        while position < total:
+            stop = min(total, position + self.chunk_rows)
+            yield reader.read(position, stop, SERIES_COLUMNS), stop
+            position = stop
+
+    def summary(self):
+        episodes = max(1, self.state["episodes"])
+        sums = self.state["sums"]
+        return {
+            "episodes": self.state["episodes"],
+            "mean_reward": sums["episode_reward"] / episodes,
+            "mean_length": sums["episode_length"] / episodes,
+            "success_rate": sums["is_win"] / episodes,
+            "mean_progress": sums["max_progress_x"] / episodes,
+        }
+
+    def series(self, name: str):
+        return (
+            DecimatedSeries.from_state(self.state["raw"][name]),
+            DecimatedSeries.from_state(self.state["rolling"][name]),
+        )
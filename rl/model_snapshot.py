@@ -0,0 +1,26 @@
+"""Point-in-time copies of SB3 policy parameters."""
+
+from typing import Dict
+
+import torch
+
+
+def snapshot_policy(model) -> Dict[str, torch.Tensor]:
+    """Return a detached CPU copy of `model.policy`'s parameters."""
+
+    return {name: tensor.detach().to("cpu", copy=True) for name, tensor in model.policy.state_dict().items()}
+
+
+def save_model_with_policy(model, policy_state: Dict[str, torch.Tensor], path: str):
+    """Save `model` as a normal SB3 zip, but with the given (older) policy parameters.
+
+    The live parameters are swapped out only for the duration of `model.save`,
+    so call this from the training thread (e.g. inside a callback).
+    """
+
+    current = snapshot_policy(model)
+    model.policy.load_state_dict(policy_state)
+    try:
+        model.save(path)
+    finally:
+        model.policy.load_state_dict(current)
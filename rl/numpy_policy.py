@@ -0,0 +1,190 @@
+"""Torch-free inference for exported SB3 `MlpPolicy` checkpoints.
+
+`export_policy_arrays` pulls the actor MLP out of a loaded PPO policy and
+`NumpyPolicy` replays it with plain NumPy matrix products. The exported `.npz`
+is a few kilobytes and loading it needs neither torch nor stable-baselines3.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+EXPORT_FORMAT_VERSION = 1
+
+_ACTIVATIONS = {
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "elu": lambda x: np.where(x > 0.0, x, np.expm1(np.minimum(x, 0.0))),
+    "leakyrelu": lambda x: np.where(x > 0.0, x, 0.01 * x),
+    "identity": lambda x: x,
+}
+
+
+class NumpyPolicy:
+    """Categorical MLP policy with the same argmax/sampling semantics as `PPO.predict`."""
+
+    def __init__(
+        self,
+        hidden_weights: List[np.ndarray],
+        hidden_biases: List[np.ndarray],
+        action_weight: np.ndarray,
+        action_bias: np.ndarray,
+        activation: str = "tanh",
+        seed: Optional[int] = None,
+    ):
+        if activation not in _ACTIVATIONS:
+            raise ValueError(f"Unsupported activation: {activation}")
+        self.hidden_weights = [np.asarray(weight, dtype=np.float32) for weight in hidden_weights]
+        self.hidden_biases = [np.asarray(bias, dtype=np.float32) for bias in hidden_biases]
+        self.action_weight = np.asarray(action_weight, dtype=np.float32)
+        self.action_bias = np.asarray(action_bias, dtype=np.float32)
+        self.activation = activation
+        self._activation_fn = _ACTIVATIONS[activation]
+        self.observation_dim = int(self.hidden_weights[0].shape[0] if self.hidden_weights else self.action_weight.shape[0])
+        self.action_count = int(self.action_weight.shape[1])
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def load(cls, path: str, seed: Optional[int] = None):
+        with np.load(path, allow_pickle=False) as data:
+            layer_count = int(data["hidden_layer_count"])
+            return cls(
+                hidden_weights=[data[f"hidden_weight_{index}"] for index in range(layer_count)],
+                hidden_biases=[data[f"hidden_bias_{index}"] for index in range(layer_count)],
+                action_weight=data["action_weight"],
+                action_bias=data["action_bias"],
+                activation=str(data["activation"]),
+                seed=seed,
+            )
+
+    def save(self, path: str):
+        arrays = {
+            "format_version": np.array(EXPORT_FORMAT_VERSION),
+            "hidden_layer_count": np.array(len(self.hidden_weights)),
+            "action_weight": self.action_weight,
+            "action_bias": self.action_bias,
+            "activation": np.array(self.activation),
+        }
+        for index, (weight, bias) in enumerate(zip(self.hidden_weights, self.hidden_biases)):
+            arrays[f"hidden_weight_{index}"] = weight
+            arrays[f"hidden_bias_{index}"] = bias
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, **arrays)
+
+    def action_logits(self, observations: np.ndarray):
+        """Return unnormalized action logits for a `(batch, obs_dim)` array."""
+
+        hidden = np.asarray(observations, dtype=np.float32).reshape(-1, self.observation_dim)
+        for weight, bias in zip(self.hidden_weights, self.hidden_biases):
+            hidden = self._activation_fn(hidden @ weight + bias)
+        return hidden @ self.action_weight + self.action_bias
+
+    def action_probabilities(self, observations: np.ndarray):
+        logits = self.action_logits(observations)
+        logits = logits - logits.max(axis=1, keepdims=True)
+        weights = np.exp(logits)
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def action_log_probabilities(self, observations: np.ndarray):
+        logits = self.action_logits(observations)
+        logits = logits - logits.max(axis=1, keepdims=True)
+        return logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+
+    def sample_actions(self, observations: np.ndarray):
+        """Sample one action per row and return `(actions, log_probs)` under this policy."""
+
+        log_probs = self.action_log_probabilities(observations)
+        gumbel = -np.log(-np.log(self.rng.uniform(1e-12, 1.0, size=log_probs.shape)))
+        actions = (log_probs + gumbel).argmax(axis=1).astype(np.int64)
+        return actions, log_probs[np.arange(len(actions)), actions]
+
+    def predict(self, observation, state=None, episode_start=None, deterministic: bool = True):
+        """Drop-in replacement for `PPO.predict` (returns `(actions, None)`).
+
+        A single observation returns a 0-d action array, a batch returns one action per row.
+        """
+
+        observation = np.asarray(observation, dtype=np.float32)
+        is_batch = observation.ndim > 1
+        logits = self.action_logits(observation)
+        if deterministic:
+            actions = logits.argmax(axis=1)
+        else:
+            # Gumbel-max draws exactly from softmax(logits), vectorized over the batch.
+            gumbel = -np.log(-np.log(self.rng.uniform(1e-12, 1.0, size=logits.shape)))
+            actions = (logits + gumbel).argmax(axis=1)
+        actions = actions.astype(np.int64)
+        if not is_batch:
+            actions = actions[0]
+        return actions, state
+
+
+def export_policy_arrays(policy):
+    """Build a `NumpyPolicy` from an SB3 `ActorCriticPolicy` with a flat MLP actor."""
+
+    import torch.nn as nn
+
+    extractor_name = type(getattr(policy, "pi_features_extractor", policy.features_extractor)).__name__
+    if extractor_name != "FlattenExtractor":
+        raise ValueError(f"Only MlpPolicy checkpoints are supported (got features extractor {extractor_name}).")
+    if type(policy.action_net) is not nn.Linear:
+        raise ValueError("Only discrete action heads (single Linear action_net) are supported.")
+
+    hidden_weights = []
+    hidden_biases = []
+    activation = "identity"
+    for module in policy.mlp_extractor.policy_net:
+        if isinstance(module, nn.Linear):
+            hidden_weights.append(module.weight.detach().cpu().numpy().T.copy())
+            hidden_biases.append(module.bias.detach().cpu().numpy().copy())
+        else:
+            activation = type(module).__name__.lower()
+
+    return NumpyPolicy(
+        hidden_weights=hidden_weights,
+        hidden_biases=hidden_biases,
+        action_weight=policy.action_net.weight.detach().cpu().numpy().T.copy(),
+        action_bias=policy.action_net.bias.detach().cpu().numpy().copy(),
+        activation=activation,
+    )
+
+
+def export_checkpoint(model_path: str, output_path: str):
+    """Extract the actor of a PPO checkpoint zip into a `.npz` file."""
+
+    from stable_baselines3 import PPO
+
+    from rl.checkpoints import open_checkpoint
+
+    model = PPO.load(open_checkpoint(model_path), device="cpu")
+    numpy_policy = export_policy_arrays(model.policy)
+    numpy_policy.save(output_path)
+    return numpy_policy
+
+
+def resolve_policy_backend(model_path: str, backend: str = "auto"):
+    if backend != "auto":
+        return backend
+    return "numpy" if str(model_path).endswith(".npz") else "sb3"
+
+
+def load_policy(model_path: str, backend: str = "auto", seed: Optional[int] = None):
+    """Load either an SB3 PPO zip or an exported `.npz`; both expose `predict`."""
+
+    backend = resolve_policy_backend(model_path, backend)
+    if backend == "numpy":
+        if not str(model_path).endswith(".npz"):
+            raise ValueError(
+                f"NumPy backend needs an exported .npz policy (got {model_path}). "
+                "Run export_numpy_policy.py on the checkpoint first."
+            )
+        return NumpyPolicy.load(model_path, seed=seed)
+    if backend != "sb3":
+        raise ValueError(f"Unsupported policy backend: {backend}")
+
+    from stable_baselines3 import PPO
+
+    from rl.checkpoints import open_checkpoint
+
+    return PPO.load(open_checkpoint(model_path), device="cpu")
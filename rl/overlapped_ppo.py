@@ -0,0 +1,138 @@
+"""PPO with rollout collection and gradient updates running at the same time.
+
+`OverlappedPPO.learn` double-buffers rollouts: while a background thread runs
+the PPO epochs on one buffer (on a private learner copy of the policy), the
+main thread collects the next buffer with the published policy, which is one
+update behind. After both finish, the learner weights and optimizer state are
+published and the roles swap. Before an update, values and advantages of a
+stale buffer are recomputed with the learner's critic; the behavior log-probs
+are kept, so the clipped ratio still measures the distance to the policy that
+acted. `self.policy` is only replaced between updates, so callbacks (eval,
+checkpoints) always see a consistent set of weights. The train thread logs
+into a private buffer that is merged into `self.logger` after it joins, so its
+`train/` keys never land in a dump made by the rollout thread.
+"""
+
+import copy
+import threading
+import time
+
+import numpy as np
+import torch
+from stable_baselines3 import PPO
+from stable_baselines3.common.logger import Logger
+from stable_baselines3.common.utils import obs_as_tensor
+
+
+class OverlappedPPO(PPO):
+    """Drop-in `PPO` whose `learn` overlaps env stepping with optimization."""
+
+    # Cumulative seconds spent in `train` on the background thread; read by throughput telemetry.
+    train_seconds_total = 0.0
+
+    def _excluded_save_params(self):
+        return super()._excluded_save_params() + ["train_seconds_total"]
+
+    def _new_rollout_buffer(self):
+        return self.rollout_buffer_class(
+            self.n_steps,
+            self.observation_space,
+            self.action_space,
+            device=self.device,
+            gamma=self.gamma,
+            gae_lambda=self.gae_lambda,
+            n_envs=self.n_envs,
+            **self.rollout_buffer_kwargs,
+        )
+
+    def _refresh_advantages(self, rollout_buffer, policy, last_obs, last_dones):
+        obs_shape = rollout_buffer.observations.shape[2:]
+        with torch.no_grad():
+            observations = rollout_buffer.observations.reshape((-1,) + obs_shape)
+            values = policy.predict_values(obs_as_tensor(observations, self.device))
+            rollout_buffer.values[:] = values.cpu().numpy().reshape(rollout_buffer.values.shape)
+            last_values = policy.predict_values(obs_as_tensor(last_obs, self.device))
+        rollout_buffer.compute_returns_and_advantage(last_values=last_values, dones=last_dones)
+
+    def _publish(self, learner_policy):
+        self.policy.load_state_dict(learner_policy.state_dict())
+        # Deep copy: load_state_dict may alias the learner's moment tensors, which keep changing.
+        self.policy.optimizer.load_state_dict(copy.deepcopy(learner_policy.optimizer.state_dict()))
+
+    def learn(
+        self,
+        total_timesteps: int,
+        callback=None,
+        log_interval: int = 1,
+        tb_log_name: str = "PPO",
+        reset_num_timesteps: bool = True,
+        progress_bar: bool = False,
+    ):
+        iteration = 0
+        total_timesteps, callback = self._setup_learn(
+            total_timesteps, callback, reset_num_timesteps, tb_log_name, progress_bar
+        )
+        callback.on_training_start(locals(), globals())
+
+        buffers = [self.rollout_buffer, self._new_rollout_buffer()]
+        learner_policy = copy.deepcopy(self.policy)
+        version = 0
+        collect_started = time.perf_counter()
+        pending = 0 if self.collect_rollouts(self.env, callback, buffers[0], n_rollout_steps=self.n_steps) else None
+        collect_seconds = time.perf_counter() - collect_started
+        pending_state = (version, np.copy(self._last_obs), np.copy(self._last_episode_starts))
+
+        while pending is not None:
+            iteration += 1
+            self._update_current_progress_remaining(self.num_timesteps, total_timesteps)
+            data_version, last_obs, last_dones = pending_state
+            lag = version - data_version
+            self.logger.record("overlap/policy_version", version)
+            self.logger.record("overlap/policy_lag", lag)
+            self.logger.record("overlap/collect_seconds", collect_seconds)
+            if log_interval is not None and iteration % log_interval == 0:
+                self.dump_logs(iteration)
+
+            rollout_buffer = buffers[pending]
+            if lag > 0:
+                self._refresh_advantages(rollout_buffer, learner_policy, last_obs, last_dones)
+            learner = copy.copy(self)
+            learner.policy = learner_policy
+            learner.rollout_buffer = rollout_buffer
+            # The train thread records into its own logger; the rollout thread keeps dumping the shared one.
+            learner._logger = Logger(folder=None, output_formats=[])
+            errors = []
+            train_seconds = []
+
+            def _train():
+                started = time.perf_counter()
+                try:
+                    learner.train()
+                except BaseException as exc:  # re-raised on the main thread after join
+                    errors.append(exc)
+                train_seconds.append(time.perf_counter() - started)
+
+            trainer = threading.Thread(target=_train, name="ppo-train", daemon=True)
+            trainer.start()
+
+            next_pending = None
+            if self.num_timesteps < total_timesteps:
+                collect_started = time.perf_counter()
+                if self.collect_rollouts(self.env, callback, buffers[1 - pending], n_rollout_steps=self.n_steps):
+                    next_pending = 1 - pending
+                collect_seconds = time.perf_counter() - collect_started
+                pending_state = (version, np.copy(self._last_obs), np.copy(self._last_episode_starts))
+            trainer.join()
+            if errors:
+                raise errors[0]
+            for key, value in learner.logger.name_to_value.items():
+                self.logger.record(key, value, learner.logger.name_to_excluded.get(key))
+            self.logger.record("overlap/train_seconds", train_seconds[0])
+            self.train_seconds_total += train_seconds[0]
+            self._n_updates = learner._n_updates
+            self._publish(learner_policy)
+            version += 1
+            pending = next_pending
+
+        callback.on_training_end()
+        return self
@@ -1,15 +1,52 @@
 """Gymnasium environment wrapper around the custom 2D Jump'n'Run game."""
 
+from typing import Dict, Optional, Sequence
+
 import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
 
-from rl.game_session import GameSession
+from rl.game_session import GameSession, preload_levels
 from rl.game_types import GameAction
+from rl.level_sampler import LevelSampler
+from rl.start_archive import StartStateArchive
+
+# Reward-shaping constants that `reward_overrides` may replace (e.g. from a sweep).
+REWARD_PARAMETERS = (
+    "checkpoint_spacing",
+    "checkpoint_bonus",
+    "hazard_zone_width",
+    "hazard_forward_progress_threshold",
+    "hazard_response_bonus",
+    "hazard_ignore_step_penalty",
+    "hazard_ignore_death_penalty",
+    "hazard_backtrack_penalty",
+    "hazard_camp_penalty",
+    "hazard_camp_step_threshold",
+    "jump_in_place_dx_threshold",
+    "jump_in_place_penalty",
+    "jump_without_hazard_penalty",
+    "no_progress_soft_steps",
+    "no_progress_hard_steps",
+    "no_progress_soft_penalty",
+    "no_progress_hard_penalty",
+    "no_progress_terminate_steps",
+    "no_progress_terminate_penalty",
+)
 
 
 class PirateGameEnv(gym.Env):
-    """Stable-Baselines3 compatible environment using handcrafted feature observations."""
+    """Stable-Baselines3 compatible environment using handcrafted feature observations.
+
+    With `level_pool`, every reset draws the next level from a `LevelSampler`
+    (all pool levels are parsed once per process) and finished episodes report
+    the level's running statistics in `info`. A `level_path` passed through
+    reset options pins that level and turns pool sampling off.
+    `reward_overrides` replaces any of the `REWARD_PARAMETERS` defaults.
+    `sim_clock` makes gameplay timers frame-based (see `GameSession`).
+    `start_archive` (`StartStateArchive` settings) lets resets start from states
+    saved in earlier episodes; archive starts are not counted in level stats.
+    """
 
     metadata = {"render_modes": ["none", "human"], "render_fps": 30}
 
@@ -22,8 +59,19 @@ class PirateGameEnv(gym.Env):
         frame_skip: int = 2,
         action_preset: str = "simple",
         obs_profile: str = "balanced",
+        level_pool: Optional[Sequence[str]] = None,
+        level_sampling: str = "prioritized",
+        reward_overrides: Optional[Dict[str, float]] = None,
+        sim_clock: bool = False,
+        start_archive: Optional[Dict[str, float]] = None,
     ):
         super().__init__()
+        self.level_sampler = None
+        self.start_archive = StartStateArchive(**start_archive) if start_archive is not None else None
+        if level_pool:
+            preload_levels(level_pool)
+            self.level_sampler = LevelSampler(level_pool, strategy=level_sampling)
+            level_path = level_pool[0]
         self.level_path = level_path
         self.headless = headless
         self.render_mode = render_mode
@@ -39,6 +87,7 @@ class PirateGameEnv(gym.Env):
             fps=self.metadata["render_fps"],
             max_episode_steps=self.max_episode_steps,
             obs_profile=self.obs_profile,
+            sim_clock=sim_clock,
         )
 
         if self.action_preset == "forward":
@@ -132,6 +181,11 @@ class PirateGameEnv(gym.Env):
         self.no_progress_hard_penalty = -0.45
         self.no_progress_terminate_steps = 120
         self.no_progress_terminate_penalty = -120.0
+        for name, value in (reward_overrides or {}).items():
+            if name not in REWARD_PARAMETERS:
+                raise ValueError(f"Unknown reward parameter: {name}")
+            # Keep each default's type so step counts stay integers.
+            setattr(self, name, type(getattr(self, name))(value))
 
     def _forward_action(self, action_id: int) -> GameAction:
         if action_id == 0:
@@ -178,8 +232,22 @@ class PirateGameEnv(gym.Env):
 
     def reset(self, *, seed=None, options=None):
         super().reset(seed=seed)
-        level_path = self.level_path if options is None else options.get("level_path", self.level_path)
-        obs = self.session.reset(level_path=level_path, seed=seed)
+        if options is not None and "level_path" in options:
+            # Sticky: later resets without options (autoreset, evaluation) stay on this level.
+            self.level_path = options["level_path"]
+            self.level_sampler = None
+        elif self.level_sampler is not None:
+            self.level_path = self.level_sampler.sample(self.np_random)
+        obs = self.session.reset(level_path=self.level_path, seed=seed)
+        if self.start_archive is not None:
+            start = self.start_archive.sample(self.level_path, self.np_random)
+            if start is not None:
+                self.session.load_state(start[1])
+                # The restored state starts a fresh episode: own step budget and progress baseline.
+                self.session.status.step_count = 0
+                self.session.status.max_progress_x = float(self.session.player.playerPos.x)
+                obs = self.session.get_observation()
+            self.start_archive.begin_episode(self.level_path, float(self.session.player.playerPos.x))
         self._episode_steps = 0
         self._no_progress_steps = 0
         self._prev_x = float(self.session.player.playerPos.x)
@@ -354,6 +422,8 @@ class PirateGameEnv(gym.Env):
         info = {
             "killed_enemies": result["killed_enemies"],
             "is_win": status["is_win"],
+            # Read by SB3's EvalCallback to report eval/success_rate.
+            "is_success": bool(status["is_win"]),
             "is_dead": is_dead,
             "step_count": status["step_count"],
             "max_progress_x": status["max_progress_x"],
@@ -393,6 +463,19 @@ class PirateGameEnv(gym.Env):
             "is_runaway": bool(is_runaway),
             "is_stagnation_truncated": bool(stagnation_truncated),
         }
+        archive_start = self.start_archive is not None and self.start_archive.started_from_archive
+        if self.start_archive is not None:
+            if terminated or truncated:
+                self.start_archive.end_episode(self.level_path, current_x, is_dead)
+                info.update(self.start_archive.episode_info(self.level_path))
+            else:
+                self.start_archive.observe(self.level_path, self.session, current_x, obs[4] >= 0.5, self.np_random)
+        if self.level_sampler is not None and (terminated or truncated):
+            if not archive_start:
+                progress = float(status["max_progress_x"]) / max(1.0, level_width)
+                self.level_sampler.update(self.level_path, bool(status["is_win"]), min(1.0, progress))
+            info["level_path"] = self.level_path
+            info.update(self.level_sampler.level_info(self.level_path))
         return obs, reward, terminated, truncated, info
 
     def render(self):
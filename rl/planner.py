@@ -0,0 +1,203 @@
+"""Search-based planning agent that plays `PirateGameEnv` from cloned game states.
+
+`SearchPlanner` searches the env's action preset with beam search or MCTS
+(UCT) over macro actions: one action held for `macro_steps` env steps of
+`frame_skip` frames each. Every search node is a `GameSession.clone()`, and a
+per-decision budget caps the simulated env steps. Leaves are scored by
+progress toward the chest (`GameSession.get_goal_distance`), and wins and
+deaths dominate that score. The env should use `sim_clock=True` so that
+cooldowns inside the search match the real game.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+PLANNER_ALGORITHMS = ("beam", "mcts")
+# Player run speed in px per frame; scales goal progress so a full-speed horizon is worth ~1.
+MAX_RUN_SPEED = 8.0
+WIN_VALUE = 2.0
+LOSS_VALUE = -2.0
+
+
+@dataclass
+class PlannerConfig:
+    algorithm: str = "beam"
+    budget: int = 300
+    horizon: int = 8
+    macro_steps: int = 3
+    beam_width: int = 4
+    exploration: float = 1.0
+    seed: int = 0
+
+
+class _Node:
+    __slots__ = ("session", "parent", "action", "children", "visits", "value_sum", "value", "terminal", "depth")
+
+    def __init__(self, session, parent=None, action=None, value=0.0, terminal=False, depth=0):
+        self.session = session
+        self.parent = parent
+        self.action = action
+        self.children: Dict[int, "_Node"] = {}
+        self.visits = 0
+        self.value_sum = 0.0
+        self.value = value
+        self.terminal = terminal
+        self.depth = depth
+
+
+class SearchPlanner:
+    """Plans one macro action at a time for `env` and replays it step by step.
+
+    `predict` mirrors the policy interface (`model.predict(obs, deterministic)`),
+    so the planner can stand in for a PPO model in the play and evaluation scripts.
+    """
+
+    def __init__(self, env, config: Optional[PlannerConfig] = None):
+        self.env = env
+        self.config = config or PlannerConfig()
+        if self.config.algorithm not in PLANNER_ALGORITHMS:
+            raise ValueError(f"Unsupported planner algorithm: {self.config.algorithm}")
+        self.actions = [env._to_action(action_id) for action_id in range(int(env.action_space.n))]
+        self.rng = random.Random(self.config.seed)
+        self._queue: List[int] = []
+        self._player = None
+        self.decisions = 0
+        self.simulated_steps = 0
+
+    def reset(self):
+        self._queue = []
+        self._player = None
+
+    def predict(self, observation=None, deterministic: bool = True):
+        """Policy-style wrapper around `act`; the observation is ignored, the env state is planned from."""
+
+        return self.act(), None
+
+    def act(self) -> int:
+        """Next env action id for the env's current state."""
+
+        session = self.env.session
+        if session.player is not self._player:
+            # A reset built a new world; any queued macro belongs to the previous episode.
+            self.reset()
+            self._player = session.player
+        if not self._queue:
+            action_id = self.plan(session)
+            self._queue = [action_id] * max(1, self.config.macro_steps)
+        return self._queue.pop()
+
+    def plan(self, session) -> int:
+        """Search from `session` (left untouched) and return the best first action id."""
+
+        self.decisions += 1
+        root = _Node(session.clone())
+        self._origin = session.get_goal_distance()
+        self._reach = max(1.0, self.config.horizon * self.config.macro_steps * self.env.frame_skip * MAX_RUN_SPEED)
+        self._spent = 0
+        if self.config.algorithm == "mcts":
+            return self._mcts(root)
+        return self._beam(root)
+
+    def _expand(self, node: _Node, action_id: int) -> _Node:
+        child_session = node.session.clone()
+        action = self.actions[action_id]
+        for _ in range(max(1, self.config.macro_steps)):
+            child_session.step(action, frames=self.env.frame_skip, observe=False)
+            self._spent += 1
+            if child_session.status.is_done or self._is_lost(child_session):
+                break
+        value, terminal = self._evaluate(child_session, node.depth + 1)
+        return _Node(child_session, node, action_id, value, terminal, node.depth + 1)
+
+    def _is_lost(self, session) -> bool:
+        # PirateGameEnv's out-of-bounds rule, plus feet below the last tile row: no block can
+        # catch the player there, so a pit fall counts as death long before the env notices.
+        x, y = session.get_player_position()
+        level_width, level_height = session.get_level_size()
+        fallen = y + session.player.height > level_height
+        return fallen or x < -120.0 or x > level_width + 120.0 or y < -240.0
+
+    def _evaluate(self, session, depth: int):
+        status = session.status
+        if status.is_win:
+            # Earlier wins score higher so the planner does not dawdle next to the chest.
+            return WIN_VALUE - 0.01 * depth, True
+        if status.is_dead or self._is_lost(session):
+            return LOSS_VALUE, True
+        progress = (self._origin - session.get_goal_distance()) / self._reach
+        return float(np.clip(progress, -1.0, 1.0)), depth >= self.config.horizon
+
+    def _state_key(self, session):
+        player = session.player
+        return (
+            tuple(player.playerPos),
+            player.speed_y,
+            player.get_speed_x(),
+            len(session.world.enemyGroup),
+            len(player.bulletGroup),
+        )
+
+    def _beam(self, root: _Node) -> int:
+        beam = [(root, None)]
+        best_value, best_action = -math.inf, 0
+        while beam and self._spent < self.config.budget:
+            candidates = []
+            seen = set()
+            for node, first_action in beam:
+                for action_id in range(len(self.actions)):
+                    if self._spent >= self.config.budget:
+                        break
+                    child = self._expand(node, action_id)
+                    first = action_id if first_action is None else first_action
+                    if child.value > best_value:
+                        best_value, best_action = child.value, first
+                    key = self._state_key(child.session)
+                    if child.terminal or key in seen:
+                        continue
+                    seen.add(key)
+                    candidates.append((child, first))
+            candidates.sort(key=lambda item: item[0].value, reverse=True)
+            # The best line of every first action survives, so a jump that only pays off past a gap
+            # is not pruned early by plain running; the rest of the beam goes to the top values.
+            leaders = {}
+            for candidate in candidates:
+                leaders.setdefault(candidate[1], candidate)
+            beam = list(leaders.values())
+            beam += [candidate for candidate in candidates if candidate not in beam][: max(0, self.config.beam_width - len(beam))]
+        self.simulated_steps += self._spent
+        return best_action
+
+    def _mcts(self, root: _Node) -> int:
+        action_count = len(self.actions)
+        while self._spent < self.config.budget:
+            node = root
+            # Selection: descend through fully expanded nodes by UCT.
+            while not node.terminal and len(node.children) == action_count:
+                log_visits = math.log(max(1, node.visits))
+                node = max(
+                    node.children.values(),
+                    key=lambda child: child.value_sum / max(1, child.visits)
+                    + self.config.exploration * math.sqrt(log_visits / max(1, child.visits)),
+                )
+            # Expansion: one untried action, evaluated by the heuristic instead of a random rollout.
+            if node.terminal:
+                # Revisiting a settled leaf still costs budget, so a fully explored tree terminates.
+                self._spent += 1
+            else:
+                untried = [action_id for action_id in range(action_count) if action_id not in node.children]
+                action_id = self.rng.choice(untried)
+                node.children[action_id] = self._expand(node, action_id)
+                node = node.children[action_id]
+            value = node.value
+            while node is not None:
+                node.visits += 1
+                node.value_sum += value
+                node = node.parent
+        self.simulated_steps += self._spent
+        if not root.children:
+            return 0
+        return max(root.children.values(), key=lambda child: (child.visits, child.value_sum / max(1, child.visits))).action
@@ -0,0 +1,282 @@
+"""Bounded-window profiling for training, evaluation and live play.
+
+`ProfileWindow` profiles the steps in `[start_step, stop_step)` of whatever
+drives it and writes `<name>.prof` (cProfile mode) and `<name>.collapsed`
+(one `frame;frame;... count` line per stack, input for flamegraph.pl,
+speedscope or inferno) into its output directory. The `sampling` mode samples
+the stacks of all threads every few milliseconds from a helper thread, so
+its overhead does not grow with the number of calls.
+
+Processes started by a run (subprocess env workers, eval workers, local
+actors) are profiled through the `JUMPNRUN_PROFILE` environment variable:
+`enable_process_profiling` sets it, and every `GameSession` created in a
+child process feeds the process-wide window returned by `process_window`,
+one output file per process. During training, `ProfileCallback` moves the
+learner's window along with `num_timesteps`.
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+PROFILE_MODES = ("off", "cprofile", "sampling")
+PROFILE_ENV_VAR = "JUMPNRUN_PROFILE"
+# Caller chains deeper than this are cut when cProfile stats are turned into stacks.
+_MAX_STACK_DEPTH = 64
+
+_process_window = None
+_profile_callback_class = None
+
+
+def _frame_label(filename: str, line: int, name: str) -> str:
+    label = name if filename == "~" else f"{name} ({Path(filename).name}:{line})"
+    return label.replace(";", ",")
+
+
+class _StackSampler:
+    """Counts the stacks of every other thread at a fixed interval."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}").replace(";", ","))
+                self.counts[";".join(reversed(stack))] += 1
+
+
+def collapsed_from_stats(stats: pstats.Stats) -> Counter:
+    """Approximate stacks (in microseconds of own time) from cProfile's caller graph.
+
+    cProfile only records caller/callee edges, so each function's own time is
+    split over its callers in proportion to the time spent via each edge.
+    """
+
+    entries = stats.stats
+    stacks: Counter = Counter()
+
+    def attribute(funcs, weight):
+        callers = entries.get(funcs[-1], (0, 0, 0.0, 0.0, {}))[4]
+        total = sum(edge[3] for edge in callers.values())
+        recursed = False
+        if total > 0 and len(funcs) < _MAX_STACK_DEPTH:
+            for caller, edge in callers.items():
+                share = weight * edge[3] / total
+                if share >= 1.0 and caller not in funcs:
+                    attribute(funcs + (caller,), share)
+                    recursed = True
+        if not recursed:
+            stacks[";".join(_frame_label(*func) for func in reversed(funcs))] += weight
+
+    for func, (_, _, own_seconds, _, _) in entries.items():
+        if own_seconds * 1e6 >= 1.0:
+            attribute((func,), own_seconds * 1e6)
+    return Counter({stack: int(round(count)) for stack, count in stacks.items() if count >= 1.0})
+
+
+def write_collapsed(counts: Counter, path: Path):
+    with open(path, "w", encoding="utf-8") as file_obj:
+        for stack, count in counts.most_common():
+            file_obj.write(f"{stack} {count}\n")
+
+
+class ProfileWindow:
+    """Profiles steps `start_step <= step < stop_step` (`stop_step=None`: until `close`)."""
+
+    def __init__(
+        self,
+        mode: str,
+        output_dir: str,
+        start_step: int = 0,
+        stop_step: Optional[int] = None,
+        name: str = "profile",
+        sample_interval: float = 0.005,
+    ):
+        if mode not in PROFILE_MODES[1:]:
+            raise ValueError(f"Unsupported profile mode: {mode}")
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.start_step = max(0, int(start_step))
+        self.stop_step = None if stop_step is None else int(stop_step)
+        self.name = name
+        self.sample_interval = float(sample_interval)
+        self.steps = 0
+        self.finished = False
+        self.outputs = []
+        self._profiler = None
+        self._started_at = 0.0
+        self._started_step = 0
+
+    @property
+    def active(self) -> bool:
+        return self._profiler is not None
+
+    def advance(self, steps: int = 1):
+        self.update(self.steps + steps)
+
+    def update(self, step: int):
+        """Move to absolute step `step`, opening or closing the window as it is crossed."""
+
+        self.steps = int(step)
+        if self.finished:
+            return
+        if self._profiler is None:
+            if self.steps >= self.start_step and (self.stop_step is None or self.steps < self.stop_step):
+                self._start()
+        elif self.stop_step is not None and self.steps >= self.stop_step:
+            self.close()
+
+    def _start(self):
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = _StackSampler(self.sample_interval)
+            self._profiler.start()
+        self._started_at = time.perf_counter()
+        self._started_step = self.steps
+
+    def close(self):
+        """Stop profiling (if the window is open) and write its files; safe to call twice."""
+
+        profiler, self._profiler = self._profiler, None
+        self.finished = True
+        if profiler is None:
+            return self.outputs
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        collapsed_path = self.output_dir / f"{self.name}.collapsed"
+        if self.mode == "cprofile":
+            profiler.disable()
+            prof_path = self.output_dir / f"{self.name}.prof"
+            profiler.dump_stats(str(prof_path))
+            write_collapsed(collapsed_from_stats(pstats.Stats(profiler)), collapsed_path)
+            self.outputs = [prof_path, collapsed_path]
+        else:
+            profiler.stop()
+            write_collapsed(profiler.counts, collapsed_path)
+            self.outputs = [collapsed_path]
+        logger.info(
+            f"Profile '{self.name}' ({self.mode}) covered steps {self._started_step}-{self.steps} "
+            f"in {time.perf_counter() - self._started_at:.1f}s: {', '.join(str(path) for path in self.outputs)}"
+        )
+        return self.outputs
+
+    def __enter__(self):
+        self.update(self.steps)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def enable_process_profiling(
+    mode: str,
+    output_dir: str,
+    start_step: int = 0,
+    stop_step: Optional[int] = None,
+    name: str = "worker",
+    include_current: bool = False,
+):
+    """Ask every `GameSession` process started from now on to profile itself.
+
+    Steps are counted per process (env steps of all sessions in it). The
+    calling process is skipped unless `include_current` is set.
+    """
+
+    if mode == "off":
+        os.environ.pop(PROFILE_ENV_VAR, None)
+        return
+    os.environ[PROFILE_ENV_VAR] = json.dumps(
+        {
+            "mode": mode,
+            "output_dir": str(Path(output_dir).resolve()),
+            "start_step": int(start_step),
+            "stop_step": stop_step,
+            "name": name,
+            "skip_pid": None if include_current else os.getpid(),
+        }
+    )
+
+
+def process_window() -> Optional[ProfileWindow]:
+    """The profile window of this process requested via `JUMPNRUN_PROFILE`, if any."""
+
+    global _process_window
+    pid = os.getpid()
+    if _process_window is not None and _process_window[0] == pid:
+        return _process_window[1]
+    window = None
+    spec = os.environ.get(PROFILE_ENV_VAR)
+    if spec:
+        spec = json.loads(spec)
+        if spec.get("skip_pid") != pid:
+            window = ProfileWindow(
+                spec["mode"],
+                spec["output_dir"],
+                spec.get("start_step", 0),
+                spec.get("stop_step"),
+                name=f"{spec.get('name', 'worker')}_{pid}",
+            )
+            # Normal interpreter exit; worker processes that end via os._exit close it with their env.
+            atexit.register(window.close)
+    _process_window = (pid, window)
+    return window
+
+
+def _build_profile_callback_class():
+    # stable-baselines3 (and torch) load lazily: env workers import this module through GameSession.
+    from stable_baselines3.common.callbacks import BaseCallback
+
+    class ProfileCallback(BaseCallback):
+        """Opens and closes a `ProfileWindow` as training crosses its timestep range."""
+
+        def __init__(self, window: ProfileWindow, verbose: int = 0):
+            super().__init__(verbose)
+            self.window = window
+
+        def _on_step(self) -> bool:
+            self.window.update(self.num_timesteps)
+            return True
+
+    ProfileCallback.__module__ = __name__
+    ProfileCallback.__qualname__ = "ProfileCallback"
+    return ProfileCallback
+
+
+def __getattr__(name: str):
+    global _profile_callback_class
+    if name == "ProfileCallback":
+        if _profile_callback_class is None:
+            _profile_callback_class = _build_profile_callback_class()
+        return _profile_callback_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,148 @@
+"""CPU/thread planning for training runs.
+
+`plan_resources` splits the cores this process may use between concurrent
+runs, then inside one run between the learner (torch intra-op threads) and
+subprocess env workers, so neither oversubscribes the other. `apply_plan`
+sets torch threads and the learner's affinity; env workers pin themselves
+through `pin_current_process` when their factory runs. `autotune` times a few
+candidate plans and returns the fastest.
+"""
+
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import Callable, List, Optional, Sequence
+
+from loguru import logger
+
+
+@dataclass
+class ResourcePlan:
+    vec_env: str
+    cores: List[int]
+    learner_cores: List[int]
+    env_cores: List[List[int]] = field(default_factory=list)
+    torch_threads: int = 1
+    concurrent_runs: int = 1
+    run_slot: int = 0
+    steps_per_second: Optional[float] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def available_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_resources(
+    num_envs: int,
+    vec_env: str = "dummy",
+    concurrent_runs: int = 1,
+    run_slot: int = 0,
+    torch_threads: Optional[int] = None,
+    cores: Optional[Sequence[int]] = None,
+) -> ResourcePlan:
+    """Assign this run's share of the cores to the learner and its env workers.
+
+    With `dummy` envs step inside the learner process, so every core of the
+    share goes to torch. With `subproc` each env worker gets its own core
+    (round-robin when there are fewer spare cores than envs) and the learner
+    keeps the rest, at least one.
+    """
+
+    cores = list(cores) if cores is not None else available_cores()
+    concurrent_runs = max(1, int(concurrent_runs))
+    run_slot = int(run_slot) % concurrent_runs
+    per_run = max(1, len(cores) // concurrent_runs)
+    share = cores[run_slot * per_run:(run_slot + 1) * per_run] or [cores[run_slot % len(cores)]]
+
+    num_envs = max(1, int(num_envs))
+    env_cores: List[List[int]] = []
+    learner_cores = share
+    if vec_env == "subproc":
+        learner_count = max(1, len(share) - num_envs)
+        learner_cores = share[:learner_count]
+        worker_pool = share[learner_count:] or share
+        env_cores = [[worker_pool[index % len(worker_pool)]] for index in range(num_envs)]
+    threads = int(torch_threads) if torch_threads else len(learner_cores)
+    return ResourcePlan(
+        vec_env=vec_env,
+        cores=share,
+        learner_cores=learner_cores,
+        env_cores=env_cores,
+        torch_threads=max(1, threads),
+        concurrent_runs=concurrent_runs,
+        run_slot=run_slot,
+    )
+
+
+def pin_current_process(cores: Optional[Sequence[int]], torch_threads: Optional[int] = None):
+    """Restrict the calling process to `cores` (no-op where affinity is unsupported)."""
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, set(cores))
+    if torch_threads is not None and "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(int(torch_threads))
+
+
+def apply_plan(plan: ResourcePlan):
+    import torch
+
+    pin_current_process(plan.learner_cores)
+    torch.set_num_threads(plan.torch_threads)
+    # Child processes (subproc env workers) inherit these before they import torch/BLAS.
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[name] = "1"
+    logger.info(
+        f"Resource plan: vec_env={plan.vec_env}, learner cores={plan.learner_cores}, "
+        f"torch threads={plan.torch_threads}, env cores={plan.env_cores or 'in-process'}"
+    )
+
+
+def candidate_plans(
+    num_envs: int,
+    concurrent_runs: int = 1,
+    run_slot: int = 0,
+    cores: Optional[Sequence[int]] = None,
+) -> List[ResourcePlan]:
+    """Layouts worth timing: both vec-env backends crossed with a few torch thread counts."""
+
+    base = plan_resources(num_envs, "dummy", concurrent_runs, run_slot, cores=cores)
+    backends = ["dummy", "subproc"] if num_envs > 1 else ["dummy"]
+    plans = []
+    for backend in backends:
+        plan = plan_resources(num_envs, backend, concurrent_runs, run_slot, cores=base.cores)
+        for threads in sorted({1, max(1, len(plan.learner_cores) // 2), len(plan.learner_cores)}):
+            plans.append(replace(plan, torch_threads=threads))
+    return plans
+
+
+def autotune(plans: Sequence[ResourcePlan], measure: Callable[[ResourcePlan], float]) -> ResourcePlan:
+    """Return the plan with the highest `measure(plan)` (steps/sec); failures are skipped."""
+
+    original = available_cores()
+    best = None
+    try:
+        for plan in plans:
+            started = time.perf_counter()
+            try:
+                steps_per_second = float(measure(plan))
+            except Exception as exc:  # a layout that cannot run is just not a candidate
+                logger.warning(f"Autotune candidate {plan.vec_env}/{plan.torch_threads} threads failed: {exc}")
+                continue
+            plan.steps_per_second = steps_per_second
+            logger.info(
+                f"Autotune {plan.vec_env}, {plan.torch_threads} torch threads: "
+                f"{steps_per_second:.0f} steps/s ({time.perf_counter() - started:.1f}s)"
+            )
+            if best is None or steps_per_second > best.steps_per_second:
+                best = plan
+    finally:
+        pin_current_process(original)
+    if best is None:
+        raise RuntimeError("No autotune candidate could be measured.")
+    return best
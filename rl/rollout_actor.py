@@ -0,0 +1,144 @@
+"""Torch-free rollout actor for the actor-learner training mode.
+
+An actor connects to a learner, receives the env settings and policy weights,
+then loops: collect `n_steps` transitions on each of its envs with a local
+`NumpyPolicy`, send the batch, pick up any newer weights. It may run ahead of
+the learner by at most `max_staleness` policy versions; every batch records
+the version that produced it.
+"""
+
+import select
+import time
+from typing import Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+from rl.numpy_policy import NumpyPolicy
+from rl.transport import connect, recv_frame, send_frame
+
+
+class RolloutActor:
+    """Steps `n_envs` `PirateGameEnv`s in lockstep with one batched policy call per step."""
+
+    def __init__(self, env_kwargs: Dict, n_envs: int, n_steps: int, seed: int):
+        from rl.pirate_game_env import PirateGameEnv
+
+        self.envs = [PirateGameEnv(**env_kwargs) for _ in range(max(1, int(n_envs)))]
+        self.n_steps = int(n_steps)
+        self.obs = np.stack([env.reset(seed=seed + index)[0] for index, env in enumerate(self.envs)])
+        self.episode_starts = np.ones(len(self.envs), dtype=np.float32)
+        self._episode_rewards = np.zeros(len(self.envs))
+        self._episode_lengths = np.zeros(len(self.envs), dtype=np.int64)
+
+    def collect(self, policy: NumpyPolicy):
+        n_envs = len(self.envs)
+        obs_buffer = np.zeros((self.n_steps, n_envs) + self.obs.shape[1:], dtype=np.float32)
+        actions = np.zeros((self.n_steps, n_envs), dtype=np.int64)
+        rewards = np.zeros((self.n_steps, n_envs), dtype=np.float32)
+        episode_starts = np.zeros((self.n_steps, n_envs), dtype=np.float32)
+        log_probs = np.zeros((self.n_steps, n_envs), dtype=np.float32)
+        truncations = []
+        episodes = []
+        dones = np.zeros(n_envs, dtype=np.float32)
+        for step in range(self.n_steps):
+            obs_buffer[step] = self.obs
+            episode_starts[step] = self.episode_starts
+            step_actions, step_log_probs = policy.sample_actions(self.obs)
+            actions[step] = step_actions
+            log_probs[step] = step_log_probs
+            for env_index, env in enumerate(self.envs):
+                obs, reward, terminated, truncated, info = env.step(int(step_actions[env_index]))
+                rewards[step, env_index] = reward
+                self._episode_rewards[env_index] += reward
+                self._episode_lengths[env_index] += 1
+                dones[env_index] = float(terminated or truncated)
+                if terminated or truncated:
+                    if truncated and not terminated:
+                        # The learner bootstraps truncated episodes from V(terminal_obs), like SB3.
+                        truncations.append((step, env_index, obs))
+                    episodes.append(
+                        (
+                            float(self._episode_rewards[env_index]),
+                            int(self._episode_lengths[env_index]),
+                            bool(info.get("is_win", False)),
+                        )
+                    )
+                    self._episode_rewards[env_index] = 0.0
+                    self._episode_lengths[env_index] = 0
+                    obs, _ = env.reset()
+                self.obs[env_index] = obs
+            self.episode_starts = dones.copy()
+        return {
+            "obs": obs_buffer,
+            "actions": actions,
+            "rewards": rewards,
+            "episode_starts": episode_starts,
+            "log_probs": log_probs,
+            "last_obs": self.obs.copy(),
+            "last_dones": dones.copy(),
+            "truncations": truncations,
+            "episodes": episodes,
+        }
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+
+def _policy_from_message(message, seed: Optional[int]):
+    return NumpyPolicy(seed=seed, **message["policy"])
+
+
+def run_actor(address: str, actor_id: str, connect_timeout: float = 60.0):
+    """Serve one learner until it sends `stop` or closes the connection."""
+
+    logger.remove()
+    sock = connect(address, timeout=connect_timeout)
+    actor = None
+    try:
+        send_frame(sock, {"type": "hello", "actor_id": actor_id})
+        config = recv_frame(sock)
+        if config is None or config.get("type") != "config":
+            return
+        seed = int(config["seed"])
+        max_staleness = int(config["max_staleness"])
+        actor = RolloutActor(config["env_kwargs"], config["n_envs"], config["n_steps"], seed)
+        message = recv_frame(sock)
+        if message is None or message.get("type") != "policy":
+            return
+        version = int(message["version"])
+        policy = _policy_from_message(message, seed)
+        batches_at_version = 0
+        while True:
+            # Take the newest weights available; block only when too far ahead of the learner.
+            while True:
+                must_wait = batches_at_version > max_staleness
+                readable, _, _ = select.select([sock], [], [], None if must_wait else 0)
+                if not readable:
+                    break
+                message = recv_frame(sock)
+                if message is None or message.get("type") == "stop":
+                    return
+                if message["type"] == "policy" and int(message["version"]) > version:
+                    version = int(message["version"])
+                    policy = _policy_from_message(message, seed + version)
+                    batches_at_version = 0
+            started = time.perf_counter()
+            batch = actor.collect(policy)
+            batch.update(
+                {
+                    "type": "batch",
+                    "actor_id": actor_id,
+                    "version": version,
+                    "collect_seconds": time.perf_counter() - started,
+                }
+            )
+            send_frame(sock, batch)
+            batches_at_version += 1
+    except (BrokenPipeError, ConnectionResetError):
+        return
+    finally:
+        if actor is not None:
+            actor.close()
+        sock.close()
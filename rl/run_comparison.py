@@ -0,0 +1,184 @@
+"""Load many training runs in parallel and align them by timesteps for comparison.
+
+A "run" is any directory with an episode log under `metrics/` (CSV or columnar);
+curriculum runs contribute one entry per `curriculum_*` stage. Each worker
+reduces its run to a summary row plus a few hundred `(timesteps, value)` points,
+so the parent process only has to interpolate small arrays onto a shared grid.
+"""
+
+import csv
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from rl.episode_log import ColumnarEpisodeReader, columnar_log_exists
+
+COMPARE_COLUMNS = ["num_timesteps", "episode_reward", "is_win", "max_progress_x"]
+CURVE_COLUMNS = ["is_win", "episode_reward", "max_progress_x"]
+
+
+@dataclass
+class RunMetrics:
+    name: str
+    metrics_dir: str
+    episodes: int = 0
+    final_timesteps: int = 0
+    success_rate: float = 0.0
+    final_success_rate: float = 0.0
+    mean_reward: float = 0.0
+    best_progress: float = 0.0
+    first_win_timesteps: Optional[int] = None
+    first_win_episode: Optional[int] = None
+    steps_per_second: Optional[float] = None
+    error: Optional[str] = None
+    curves: Dict[str, List[List[float]]] = field(default_factory=dict)
+
+
+def discover_runs(patterns: Sequence[str]):
+    """Expand globs into `(name, metrics_dir, run_dir)` triples, including curriculum stages."""
+
+    found = {}
+    for pattern in patterns:
+        for match in sorted(glob.glob(pattern)):
+            path = Path(match)
+            if not path.is_dir():
+                continue
+            if path.name == "metrics":
+                path = path.parent
+            run_dir = path.parent if path.name.startswith("curriculum_") else path
+            candidates = [path] + sorted(path.glob("curriculum_*"))
+            for candidate in candidates:
+                metrics_dir = candidate / "metrics"
+                if not _has_episode_log(metrics_dir):
+                    continue
+                name = str(candidate) if candidate == path else f"{path}/{candidate.name}"
+                found[str(metrics_dir)] = (name, str(metrics_dir), str(run_dir))
+    return list(found.values())
+
+
+def _has_episode_log(metrics_dir: Path):
+    return (metrics_dir / "episodes.csv").exists() or columnar_log_exists(str(metrics_dir / "episodes.cols"))
+
+
+def _read_columns(metrics_dir: Path):
+    columnar_dir = metrics_dir / "episodes.cols"
+    if columnar_log_exists(str(columnar_dir)):
+        columns = ColumnarEpisodeReader(str(columnar_dir)).read(columns=COMPARE_COLUMNS)
+        return {name: np.asarray(values) for name, values in columns.items()}, columnar_dir / "num_timesteps.bin"
+
+    import pandas as pd
+
+    csv_file = metrics_dir / "episodes.csv"
+    frame = pd.read_csv(csv_file, usecols=COMPARE_COLUMNS)
+    return {name: frame[name].to_numpy() for name in COMPARE_COLUMNS}, csv_file
+
+
+def _rolling_mean(values: np.ndarray, window: int):
+    cumulative = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    ends = np.arange(1, values.size + 1)
+    starts = np.maximum(0, ends - window)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def _run_started_at(run_dir: Path):
+    config_path = run_dir / "config.json"
+    if not config_path.exists():
+        return None
+    with open(config_path, "r", encoding="utf-8") as file_obj:
+        created_at = json.load(file_obj).get("created_at")
+    return datetime.fromisoformat(created_at).timestamp() if created_at else None
+
+
+def load_run_metrics(name: str, metrics_dir: str, run_dir: str, window: int = 100, max_points: int = 500):
+    """Summarize one run and decimate its rolling curves (safe to call in a worker process)."""
+
+    result = RunMetrics(name=name, metrics_dir=metrics_dir)
+    try:
+        columns, log_file = _read_columns(Path(metrics_dir))
+    except (OSError, ValueError, KeyError) as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+        return result
+
+    timesteps = columns["num_timesteps"].astype(np.int64)
+    wins = columns["is_win"].astype(np.float64)
+    result.episodes = int(timesteps.size)
+    if timesteps.size == 0:
+        result.error = "empty episode log"
+        return result
+
+    result.final_timesteps = int(timesteps[-1])
+    result.success_rate = float(wins.mean())
+    result.final_success_rate = float(wins[-window:].mean())
+    result.mean_reward = float(np.mean(columns["episode_reward"]))
+    result.best_progress = float(np.max(columns["max_progress_x"]))
+    win_indices = np.flatnonzero(wins > 0)
+    if win_indices.size:
+        result.first_win_episode = int(win_indices[0]) + 1
+        result.first_win_timesteps = int(timesteps[win_indices[0]])
+
+    # Measured throughput when the run logged telemetry, else the average since it was created
+    # (curriculum stages share the run's start time).
+    started_at = _run_started_at(Path(run_dir))
+    throughput_file = Path(metrics_dir) / "throughput.csv"
+    if throughput_file.exists():
+        with open(throughput_file, "r", encoding="utf-8") as file_obj:
+            rates = [float(row["steps_per_second"]) for row in csv.DictReader(file_obj) if row.get("steps_per_second")]
+        if rates:
+            result.steps_per_second = float(np.median(rates))
+    elif started_at is not None:
+        elapsed = os.path.getmtime(log_file) - started_at
+        if elapsed > 0:
+            result.steps_per_second = result.final_timesteps / elapsed
+
+    picks = np.unique(np.linspace(0, timesteps.size - 1, num=min(max_points, timesteps.size)).astype(np.int64))
+    result.curves["timesteps"] = timesteps[picks].astype(np.float64).tolist()
+    for column in CURVE_COLUMNS:
+        rolling = _rolling_mean(np.asarray(columns[column], dtype=np.float64), window)
+        result.curves[column] = rolling[picks].tolist()
+    return result
+
+
+def load_runs(runs, window: int = 100, max_points: int = 500, workers: int = 1):
+    """Load `discover_runs` output, in a process pool when `workers > 1`."""
+
+    runs = list(runs)
+    if workers <= 1 or len(runs) <= 1:
+        return [load_run_metrics(name, metrics_dir, run_dir, window, max_points) for name, metrics_dir, run_dir in runs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(runs))) as pool:
+        futures = [
+            pool.submit(load_run_metrics, name, metrics_dir, run_dir, window, max_points)
+            for name, metrics_dir, run_dir in runs
+        ]
+        return [future.result() for future in futures]
+
+
+def align_curves(results: Sequence[RunMetrics], column: str, points: int = 500):
+    """Interpolate every run's rolling curve onto one shared timestep grid (NaN past a run's end)."""
+
+    loaded = [result for result in results if result.error is None]
+    max_timesteps = max((result.final_timesteps for result in loaded), default=0)
+    grid = np.linspace(0, max_timesteps, num=points)
+    aligned = {}
+    for result in loaded:
+        x = np.asarray(result.curves["timesteps"])
+        y = np.asarray(result.curves[column])
+        values = np.interp(grid, x, y)
+        values[(grid < x[0]) | (grid > x[-1])] = np.nan
+        aligned[result.name] = values
+    return grid, aligned
+
+
+def summary_rows(results: Sequence[RunMetrics]):
+    rows = []
+    for result in results:
+        row = asdict(result)
+        row.pop("curves")
+        rows.append(row)
+    return rows
@@ -0,0 +1,219 @@
+"""Synthetic scaling measurements for `GameSession` cost versus level size and entity density.
+
+`synthesize_level` builds levels from the regular tile alphabet (`.` air,
+`B` block, `E` enemy, `C` chest) with a floor, walls, floating platforms and
+ground enemies. `measure_level` times reset, step and observation for one
+level (step time excludes the observation) and the memory a fresh world retains, and `fit_power_law` fits
+`cost = a * size ** b` on a log-log scale so each sweep reports its growth
+exponent (b ~ 1 means linear in that parameter).
+"""
+
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+LEVEL_HEIGHT = 13
+METRICS = ("reset_ms", "step_ms", "observation_ms", "world_kb")
+
+
+@dataclass
+class ScalingResult:
+    sweep: str
+    width_tiles: int
+    enemy_density: float
+    block_density: float
+    enemies: int
+    blocks: int
+    platform_blocks: int
+    reset_ms: float
+    step_ms: float
+    observation_ms: float
+    world_kb: float
+    steps: int
+    level_path: str
+
+
+def synthesize_level(
+    width_tiles: int,
+    enemy_density: float = 0.03,
+    block_density: float = 0.15,
+    height: int = LEVEL_HEIGHT,
+    seed: int = 0,
+) -> List[str]:
+    """Return level rows: floor + side walls, `block_density` of the columns with a platform
+    block in the jump band and `enemy_density` of them with a ground enemy."""
+
+    rng = random.Random(seed)
+    width_tiles = max(12, int(width_tiles))
+    grid = [["."] * width_tiles for _ in range(height)]
+    grid[height - 1] = ["B"] * width_tiles
+    for row in range(height - 4, height - 1):
+        grid[row][0] = "B"
+        grid[row][width_tiles - 1] = "B"
+    # Keep the spawn area and the chest approach free so every level starts the same way.
+    for column in range(6, width_tiles - 6):
+        if rng.random() < block_density:
+            grid[rng.choice((height - 4, height - 5, height - 6))][column] = "B"
+        if rng.random() < enemy_density:
+            grid[height - 2][column] = "E"
+    grid[height - 2][width_tiles - 4] = "C"
+    return ["".join(row) for row in grid]
+
+
+def count_platform_blocks(rows: Sequence[str]) -> int:
+    """Blocks above the floor row and inside the side walls, i.e. the part `block_density` varies."""
+
+    return sum(row[1:-1].count("B") for row in rows[:-1])
+
+
+def write_level(rows: Sequence[str], path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file_obj:
+        file_obj.write("\n".join(rows) + "\n")
+
+
+def _scripted_action(step: int):
+    from rl.game_types import GameAction
+
+    # Mostly run right and hop, so the player crosses chunks like a trained agent would.
+    return GameAction(right=True, jump=step % 8 == 0, shoot=step % 16 == 0)
+
+
+def measure_level(level_path: str, steps: int = 300, resets: int = 5, frames: int = 2, obs_profile: str = "balanced"):
+    """Median reset/step/observation time (ms) and traced KiB retained by one fresh world."""
+
+    from rl.game_session import GameSession
+
+    session = GameSession(level_path=level_path, headless=True, obs_profile=obs_profile)
+    try:
+        reset_times = []
+        for seed in range(resets):
+            started = time.perf_counter()
+            session.reset(seed=seed)
+            reset_times.append(time.perf_counter() - started)
+
+        step_times = []
+        observation_times = []
+        for step in range(steps):
+            if session.status.is_done:
+                session.reset(seed=step)
+            action = _scripted_action(step)
+            started = time.perf_counter()
+            # No observation here: it is timed on its own below and would be counted twice.
+            session.step(action, frames=frames, observe=False)
+            step_times.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            session.get_observation()
+            observation_times.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        probe = GameSession(level_path=level_path, headless=True, obs_profile=obs_profile)
+        world_bytes = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del probe
+    finally:
+        session.close()
+    return {
+        "reset_ms": 1000.0 * statistics.median(reset_times),
+        "step_ms": 1000.0 * statistics.median(step_times),
+        "observation_ms": 1000.0 * statistics.median(observation_times),
+        "world_kb": world_bytes / 1024,
+        "steps": steps,
+    }
+
+
+def fit_power_law(sizes: Sequence[float], costs: Sequence[float]) -> Optional[Dict[str, float]]:
+    """Least-squares fit of `log(cost) = log(a) + b * log(size)`; None with fewer than 2 usable points."""
+
+    points = [(float(size), float(cost)) for size, cost in zip(sizes, costs) if size > 0 and cost > 0]
+    if len(points) < 2:
+        return None
+    log_sizes = np.log([size for size, _ in points])
+    log_costs = np.log([cost for _, cost in points])
+    exponent, intercept = np.polyfit(log_sizes, log_costs, 1)
+    predicted = intercept + exponent * log_sizes
+    total = float(np.sum((log_costs - log_costs.mean()) ** 2))
+    r_squared = 1.0 - float(np.sum((log_costs - predicted) ** 2)) / total if total > 0 else 1.0
+    return {"exponent": float(exponent), "coefficient": float(np.exp(intercept)), "r_squared": r_squared}
+
+
+def run_sweep(
+    name: str,
+    configs: Sequence[Dict],
+    level_dir: Path,
+    steps: int,
+    resets: int,
+    frames: int,
+    seed: int = 0,
+) -> List[ScalingResult]:
+    results = []
+    for index, config in enumerate(configs):
+        rows = synthesize_level(config["width_tiles"], config["enemy_density"], config["block_density"], seed=seed + index)
+        level_path = level_dir / f"{name}_{index:02d}_w{config['width_tiles']}.txt"
+        write_level(rows, level_path)
+        measured = measure_level(str(level_path), steps=steps, resets=resets, frames=frames)
+        results.append(
+            ScalingResult(
+                sweep=name,
+                width_tiles=int(config["width_tiles"]),
+                enemy_density=float(config["enemy_density"]),
+                block_density=float(config["block_density"]),
+                enemies=sum(row.count("E") for row in rows),
+                blocks=sum(row.count("B") for row in rows),
+                platform_blocks=count_platform_blocks(rows),
+                level_path=str(level_path),
+                **measured,
+            )
+        )
+    return results
+
+
+# Which level property each sweep varies, i.e. the x axis of its fits. The blocks sweep leaves out
+# the constant floor and walls, which would otherwise flatten its exponent.
+SWEEP_SIZE_FIELDS = {"width": "width_tiles", "enemies": "enemies", "blocks": "platform_blocks"}
+
+
+def fit_sweeps(results: Sequence[ScalingResult]) -> Dict[str, Dict[str, Optional[Dict[str, float]]]]:
+    fits = {}
+    for sweep, size_field in SWEEP_SIZE_FIELDS.items():
+        rows = [result for result in results if result.sweep == sweep]
+        if not rows:
+            continue
+        sizes = [getattr(result, size_field) for result in rows]
+        fits[sweep] = {metric: fit_power_law(sizes, [getattr(result, metric) for result in rows]) for metric in METRICS}
+    return fits
+
+
+def format_report(results: Sequence[ScalingResult], fits: Dict) -> str:
+    lines = []
+    for sweep, size_field in SWEEP_SIZE_FIELDS.items():
+        rows = [result for result in results if result.sweep == sweep]
+        if not rows:
+            continue
+        lines.append(f"== {sweep} sweep (x = {size_field}) ==")
+        lines.append(
+            f"{'width':>6} {'enemies':>8} {'blocks':>7} {'platform':>9} {'reset ms':>9} {'step ms':>8} {'obs ms':>7} {'world KiB':>10}"
+        )
+        for result in rows:
+            lines.append(
+                f"{result.width_tiles:>6} {result.enemies:>8} {result.blocks:>7} {result.platform_blocks:>9} {result.reset_ms:>9.2f} "
+                f"{result.step_ms:>8.3f} {result.observation_ms:>7.3f} {result.world_kb:>10.1f}"
+            )
+        for metric, fit in fits.get(sweep, {}).items():
+            if fit is None:
+                lines.append(f"  {metric}: not enough points to fit")
+            else:
+                lines.append(f"  {metric} ~ {fit['coefficient']:.3g} * x^{fit['exponent']:.2f} (R^2={fit['r_squared']:.2f})")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def results_as_dicts(results: Sequence[ScalingResult]):
+    return [asdict(result) for result in results]
@@ -0,0 +1,379 @@
+"""Randomized soak testing of `PirateGameEnv`/`GameSession` with invariant checks.
+
+Each worker process steps one env (headless, simulation clock, no frame
+limit) with random or adversarial action streams and checks after every
+frame / step that:
+- the player does not end a frame inside a side-solid block (`World.intersects_side_solid`)
+- observations are finite and inside `observation_space`, rewards are finite
+- bullets stay below a cap and enemies/chests never exceed the level's count
+- RSS does not keep growing past a budget
+
+Because the simulation clock makes an episode a pure function of level, seed
+and actions, a violating episode is replayed and shrunk (delta debugging)
+to a minimal action trace, written as JSON that `replay_trace` reproduces.
+"""
+
+import csv
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from rl.memory import current_rss_mb
+
+ACTION_MODES = ("random", "adversarial", "mixed")
+TIMELINE_COLUMNS = ["worker", "elapsed_seconds", "steps", "episodes", "steps_per_second", "rss_mb", "violations"]
+
+
+@dataclass
+class SoakSettings:
+    level_paths: List[str]
+    frame_skip: int = 2
+    max_episode_steps: int = 1800
+    action_preset: str = "full"
+    obs_profile: str = "balanced"
+    action_mode: str = "mixed"
+    max_bullets: int = 64
+    obs_tolerance: float = 1e-4
+    # Landing from a fall overshoots into the floor for one frame before `move_y` snaps the
+    # player on top; overlaps lasting longer than this many frames are violations (0 = strict).
+    solid_grace_frames: int = 1
+
+
+@dataclass
+class Violation:
+    invariant: str
+    message: str
+    level_path: str
+    seed: int
+    step: int
+    actions: List[int] = field(default_factory=list)
+    original_length: int = 0
+    settings: Dict = field(default_factory=dict)
+
+
+class ActionStream:
+    """Discrete actions: uniform random, or adversarial segments (holds, toggles, spam, idling)."""
+
+    PATTERNS = ("hold", "alternate", "jitter", "idle")
+
+    def __init__(self, n_actions: int, mode: str, rng: random.Random):
+        if mode not in ACTION_MODES:
+            raise ValueError(f"Unsupported action mode: {mode}")
+        self.n_actions = int(n_actions)
+        self.mode = mode
+        self.rng = rng
+        self._segment: List[int] = []
+        self._adversarial = mode == "adversarial"
+
+    def new_episode(self):
+        self._segment = []
+        self._adversarial = self.mode == "adversarial" or (self.mode == "mixed" and self.rng.random() < 0.5)
+
+    def _next_segment(self) -> List[int]:
+        rng = self.rng
+        pattern = rng.choice(self.PATTERNS)
+        length = rng.randint(5, 120)
+        if pattern == "hold":
+            # Pushing into walls, running off ledges, holding jump against ceilings.
+            return [rng.randrange(self.n_actions)] * length
+        if pattern == "alternate":
+            first, second = rng.randrange(self.n_actions), rng.randrange(self.n_actions)
+            return [first if index % 2 == 0 else second for index in range(length)]
+        if pattern == "jitter":
+            return [rng.randrange(self.n_actions) for _ in range(length)]
+        return [0] * length
+
+    def next(self) -> int:
+        if not self._adversarial:
+            return self.rng.randrange(self.n_actions)
+        if not self._segment:
+            self._segment = self._next_segment()
+        return self._segment.pop()
+
+
+class InvariantChecker:
+    """Checks one env; `check_frame` is installed as the session's `on_frame` hook."""
+
+    def __init__(self, env, settings: SoakSettings):
+        self.env = env
+        self.settings = settings
+        self.low = env.observation_space.low
+        self.high = env.observation_space.high
+        self.failure: Optional[tuple] = None
+        self.enemy_limit = 0
+        self.chest_limit = 0
+        self._solid_frames = 0
+        env.session.on_frame = self.check_frame
+
+    def on_reset(self):
+        world = self.env.session.world
+        self.enemy_limit = len(world.enemyGroup)
+        self.chest_limit = len(world.chestGroup)
+        self.failure = None
+        self._solid_frames = 0
+
+    def _fail(self, invariant: str, message: str):
+        if self.failure is None:
+            self.failure = (invariant, message)
+
+    def check_frame(self, session):
+        player = session.player
+        if not session.world.intersects_side_solid(player.playerPos):
+            self._solid_frames = 0
+            return
+        self._solid_frames += 1
+        if self._solid_frames > self.settings.solid_grace_frames:
+            self._fail(
+                "inside_solid",
+                f"player rect {tuple(player.playerPos)} overlaps a side-solid block for {self._solid_frames} frames",
+            )
+
+    def check_step(self, obs, reward):
+        if not np.all(np.isfinite(obs)) or not math.isfinite(float(reward)):
+            self._fail("non_finite", f"obs={np.asarray(obs).tolist()} reward={reward}")
+        tolerance = self.settings.obs_tolerance
+        outside = np.flatnonzero((obs < self.low - tolerance) | (obs > self.high + tolerance))
+        if outside.size:
+            details = ", ".join(f"[{index}]={obs[index]:.4f} not in [{self.low[index]}, {self.high[index]}]" for index in outside)
+            self._fail("obs_bounds", details)
+        session = self.env.session
+        bullets = len(session.player.bulletGroup)
+        enemies = len(session.world.enemyGroup)
+        chests = len(session.world.chestGroup)
+        if bullets > self.settings.max_bullets or enemies > self.enemy_limit or chests > self.chest_limit:
+            self._fail(
+                "entity_bounds",
+                f"bullets={bullets}/{self.settings.max_bullets} enemies={enemies}/{self.enemy_limit} "
+                f"chests={chests}/{self.chest_limit}",
+            )
+        return self.failure
+
+
+def make_soak_env(settings: SoakSettings):
+    from rl.pirate_game_env import PirateGameEnv
+
+    return PirateGameEnv(
+        level_path=settings.level_paths[0],
+        headless=True,
+        render_mode="none",
+        max_episode_steps=settings.max_episode_steps,
+        frame_skip=settings.frame_skip,
+        action_preset=settings.action_preset,
+        obs_profile=settings.obs_profile,
+        sim_clock=True,
+    )
+
+
+def replay(env, checker: InvariantChecker, level_path: str, seed: int, actions: Sequence[int]) -> Optional[tuple]:
+    """Play `actions` from a seeded reset; returns `(invariant, message, step)` of the first violation."""
+
+    env.reset(seed=seed, options={"level_path": level_path})
+    checker.on_reset()
+    for step, action in enumerate(actions):
+        obs, reward, terminated, truncated, _ = env.step(int(action))
+        failure = checker.check_step(obs, reward)
+        if failure is not None:
+            return failure + (step,)
+        if terminated or truncated:
+            return None
+    return None
+
+
+def _ddmin(actions: List[int], fails: Callable[[List[int]], bool], edit: Callable, budget: int):
+    granularity = 2
+    replays = 0
+    while len(actions) >= 2 and replays < budget:
+        chunk = math.ceil(len(actions) / granularity)
+        reduced = False
+        for start in range(0, len(actions), chunk):
+            candidate = edit(actions, start, start + chunk)
+            if candidate is None:
+                continue
+            replays += 1
+            if fails(candidate):
+                actions = candidate
+                granularity = max(granularity - 1, 2)
+                reduced = True
+                break
+            if replays >= budget:
+                break
+        if not reduced:
+            if granularity >= len(actions):
+                break
+            granularity = min(len(actions), granularity * 2)
+    return actions, replays
+
+
+def _drop(actions, start, stop):
+    candidate = actions[:start] + actions[stop:]
+    return candidate or None
+
+
+def _noop(actions, start, stop):
+    if not any(actions[start:stop]):
+        return None
+    return actions[:start] + [0] * (stop - start) + actions[stop:]
+
+
+def minimize_actions(actions: Sequence[int], fails: Callable[[List[int]], bool], max_replays: int = 400) -> List[int]:
+    """Delta debugging (ddmin): drop chunks of the trace while `fails` still holds, then turn
+    the remaining actions into no-ops (action 0) wherever that keeps the failure."""
+
+    actions, used = _ddmin(list(actions), fails, _drop, max_replays)
+    actions, _ = _ddmin(actions, fails, _noop, max_replays - used)
+    return actions
+
+
+def shrink_violation(env, checker: InvariantChecker, violation: Violation, max_replays: int = 400) -> Violation:
+    def fails(candidate):
+        result = replay(env, checker, violation.level_path, violation.seed, candidate)
+        return result is not None and result[0] == violation.invariant
+
+    reproduced = replay(env, checker, violation.level_path, violation.seed, violation.actions)
+    if reproduced is None or reproduced[0] != violation.invariant:
+        violation.message += " (not reproducible from the trace)"
+        return violation
+    actions = minimize_actions(violation.actions[: reproduced[2] + 1], fails, max_replays)
+    final = replay(env, checker, violation.level_path, violation.seed, actions)
+    violation.actions = actions
+    violation.step = final[2] if final is not None else len(actions) - 1
+    violation.message = final[1] if final is not None else violation.message
+    return violation
+
+
+def replay_trace(trace_path: str) -> Optional[tuple]:
+    """Re-run a dumped violation trace; returns the violation it produces (None if it no longer does)."""
+
+    with open(trace_path, "r", encoding="utf-8") as file_obj:
+        trace = json.load(file_obj)
+    settings = SoakSettings(**trace["settings"])
+    env = make_soak_env(settings)
+    try:
+        checker = InvariantChecker(env, settings)
+        return replay(env, checker, trace["level_path"], trace["seed"], trace["actions"])
+    finally:
+        env.close()
+
+
+def soak_worker(
+    worker_id: int,
+    settings: SoakSettings,
+    steps: int,
+    seed: int,
+    output_dir: str,
+    report_seconds: float = 30.0,
+    max_violations: int = 5,
+    max_rss_growth_mb: float = 256.0,
+    max_replays: int = 400,
+) -> Dict:
+    """Soak one env for `steps` steps; returns a summary, writes timeline rows and violation traces."""
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    output_dir = Path(output_dir)
+    (output_dir / "violations").mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed * 1_000_003 + worker_id)
+    env = make_soak_env(settings)
+    checker = InvariantChecker(env, settings)
+    stream = ActionStream(env.action_space.n, settings.action_mode, rng)
+    violations: List[Dict] = []
+    timeline_path = output_dir / f"timeline_worker_{worker_id}.csv"
+    timeline_file = open(timeline_path, "w", newline="", encoding="utf-8")
+    timeline = csv.writer(timeline_file)
+    timeline.writerow(TIMELINE_COLUMNS)
+
+    started = time.perf_counter()
+    mark_time, mark_steps = started, 0
+    baseline_rss = None
+    memory_flagged = False
+    episodes = 0
+    total_steps = 0
+    try:
+        while total_steps < steps and len(violations) < max_violations:
+            level_path = settings.level_paths[episodes % len(settings.level_paths)]
+            episode_seed = rng.randrange(2**31)
+            env.reset(seed=episode_seed, options={"level_path": level_path})
+            checker.on_reset()
+            stream.new_episode()
+            episodes += 1
+            actions: List[int] = []
+            while total_steps < steps:
+                action = stream.next()
+                actions.append(action)
+                obs, reward, terminated, truncated, _ = env.step(action)
+                total_steps += 1
+                failure = checker.check_step(obs, reward)
+                if failure is not None:
+                    violation = Violation(
+                        invariant=failure[0],
+                        message=failure[1],
+                        level_path=level_path,
+                        seed=episode_seed,
+                        step=len(actions) - 1,
+                        actions=list(actions),
+                        original_length=len(actions),
+                        settings=asdict(settings),
+                    )
+                    violation = shrink_violation(env, checker, violation, max_replays)
+                    trace_path = output_dir / "violations" / f"worker{worker_id}_{len(violations):02d}_{violation.invariant}.json"
+                    with open(trace_path, "w", encoding="utf-8") as file_obj:
+                        json.dump(asdict(violation), file_obj, indent=2)
+                    logger.warning(
+                        f"Worker {worker_id}: {violation.invariant} at step {violation.step} on {level_path} "
+                        f"(trace {violation.original_length} -> {len(violation.actions)} actions): {trace_path}"
+                    )
+                    violations.append({"invariant": violation.invariant, "message": violation.message, "trace": str(trace_path)})
+                    break
+                if terminated or truncated:
+                    break
+
+                now = time.perf_counter()
+                if now - mark_time >= report_seconds:
+                    rss_mb = current_rss_mb()
+                    timeline.writerow(
+                        [
+                            worker_id,
+                            round(now - started, 1),
+                            total_steps,
+                            episodes,
+                            round((total_steps - mark_steps) / (now - mark_time), 1),
+                            round(rss_mb, 1),
+                            len(violations),
+                        ]
+                    )
+                    timeline_file.flush()
+                    mark_time, mark_steps = now, total_steps
+                    # The first report is the baseline: sprites, level caches and allocator pools are warm by then.
+                    if baseline_rss is None:
+                        baseline_rss = rss_mb
+                    elif not memory_flagged and rss_mb - baseline_rss > max_rss_growth_mb:
+                        memory_flagged = True
+                        violations.append(
+                            {
+                                "invariant": "memory",
+                                "message": f"RSS grew {rss_mb - baseline_rss:.0f} MB (from {baseline_rss:.0f} MB) after {total_steps} steps",
+                                "trace": None,
+                            }
+                        )
+                        logger.warning(f"Worker {worker_id}: {violations[-1]['message']}")
+    finally:
+        timeline_file.close()
+        env.close()
+    elapsed = time.perf_counter() - started
+    return {
+        "worker": worker_id,
+        "steps": total_steps,
+        "episodes": episodes,
+        "seconds": round(elapsed, 1),
+        "steps_per_second": round(total_steps / max(1e-9, elapsed), 1),
+        "rss_mb": round(current_rss_mb(), 1),
+        "violations": violations,
+    }
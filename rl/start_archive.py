@@ -0,0 +1,143 @@
+"""Go-Explore style start-state archive for resets inside long levels.
+
+`StartStateArchive` keeps `GameSession.save_state()` snapshots from training
+episodes, bucketed by level and progress cell (`cell_width` px of player x).
+Every cell counts the episodes that entered it and the ones that died there.
+With probability `start_prob` a reset starts from an archived state instead
+of the spawn; its cell is drawn from a blend of uniform and death-rate
+weights (`death_weight`), so practice concentrates on the sections that still
+kill the agent instead of the first screen.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class CellStats:
+    entries: int = 0
+    deaths: int = 0
+    starts: int = 0
+    seen_states: int = 0
+
+    @property
+    def death_rate(self) -> float:
+        # Laplace-smoothed, so rarely reached cells are neither ignored nor dominant.
+        return (self.deaths + 1.0) / (self.entries + 2.0)
+
+
+class StartStateArchive:
+    """Saved start states and death statistics per (level, progress cell)."""
+
+    def __init__(
+        self,
+        cell_width: float = 240.0,
+        states_per_cell: int = 8,
+        start_prob: float = 0.5,
+        death_weight: float = 0.7,
+        min_cell: int = 1,
+    ):
+        self.cell_width = max(1.0, float(cell_width))
+        self.states_per_cell = max(1, int(states_per_cell))
+        self.start_prob = float(np.clip(start_prob, 0.0, 1.0))
+        self.death_weight = float(np.clip(death_weight, 0.0, 1.0))
+        # Cells before `min_cell` are the spawn area, where a normal reset already starts.
+        self.min_cell = int(min_cell)
+        self.states: Dict[Tuple[str, int], List[bytes]] = {}
+        self.stats: Dict[Tuple[str, int], CellStats] = {}
+        self._entered = set()
+        self._stored = set()
+        self._start_cell: Optional[int] = None
+        self._start_probability = 0.0
+
+    def cell_of(self, x: float) -> int:
+        return int(max(0.0, float(x)) // self.cell_width)
+
+    def _cell_stats(self, level_path: str, cell: int) -> CellStats:
+        key = (level_path, cell)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = CellStats()
+        return stats
+
+    def probabilities(self, level_path: str):
+        """Archived cells of `level_path` and their start probabilities."""
+
+        cells = sorted(cell for path, cell in self.states if path == level_path)
+        if not cells:
+            return cells, np.zeros(0)
+        death_rates = np.array([self.stats[(level_path, cell)].death_rate for cell in cells])
+        uniform = np.full(len(cells), 1.0 / len(cells))
+        return cells, (1.0 - self.death_weight) * uniform + self.death_weight * death_rates / death_rates.sum()
+
+    def sample(self, level_path: str, rng: np.random.Generator) -> Optional[Tuple[int, bytes]]:
+        """Pick `(cell, state)` for the next reset, or None to start at the spawn."""
+
+        self._start_cell = None
+        self._start_probability = 0.0
+        if self.start_prob <= 0.0 or rng.random() >= self.start_prob:
+            return None
+        cells, probabilities = self.probabilities(level_path)
+        if not cells:
+            return None
+        index = int(rng.choice(len(cells), p=probabilities))
+        cell = cells[index]
+        states = self.states[(level_path, cell)]
+        self._cell_stats(level_path, cell).starts += 1
+        self._start_cell = cell
+        self._start_probability = float(probabilities[index])
+        return cell, states[int(rng.integers(len(states)))]
+
+    def begin_episode(self, level_path: str, x: float):
+        self._entered = set()
+        self._stored = set()
+        self._enter(level_path, self.cell_of(x))
+
+    def _enter(self, level_path: str, cell: int):
+        if cell not in self._entered:
+            self._entered.add(cell)
+            self._cell_stats(level_path, cell).entries += 1
+
+    def observe(self, level_path: str, session, x: float, on_ground: bool, rng: np.random.Generator):
+        """Count cell entries and archive the first grounded state per new cell (reservoir sampled)."""
+
+        cell = self.cell_of(x)
+        self._enter(level_path, cell)
+        if not on_ground or cell < self.min_cell or cell in self._stored:
+            return
+        self._stored.add(cell)
+        stats = self._cell_stats(level_path, cell)
+        stats.seen_states += 1
+        states = self.states.setdefault((level_path, cell), [])
+        if len(states) < self.states_per_cell:
+            states.append(session.save_state())
+            return
+        slot = int(rng.integers(stats.seen_states))
+        if slot < self.states_per_cell:
+            states[slot] = session.save_state()
+
+    def end_episode(self, level_path: str, x: float, is_dead: bool):
+        if is_dead:
+            self._cell_stats(level_path, self.cell_of(x)).deaths += 1
+
+    @property
+    def started_from_archive(self) -> bool:
+        return self._start_cell is not None
+
+    def episode_info(self, level_path: str) -> Dict[str, float]:
+        cell = -1 if self._start_cell is None else self._start_cell
+        stats = self.stats.get((level_path, cell), CellStats())
+        return {
+            "archive_start": self.started_from_archive,
+            "archive_start_cell": cell,
+            "archive_cell_death_rate": float(stats.death_rate) if cell >= 0 else 0.0,
+            "archive_cell_starts": stats.starts,
+            "archive_cell_sample_prob": self._start_probability,
+            "archive_cells": sum(1 for path, _ in self.states if path == level_path),
+            "archive_states": sum(len(states) for (path, _), states in self.states.items() if path == level_path),
+        }
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {f"{path}:{cell}": asdict(stats) for (path, cell), stats in sorted(self.stats.items())}
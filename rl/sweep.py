@@ -0,0 +1,306 @@
+"""Hyperparameter sweeps over `train_ppo.py` with asynchronous successive halving.
+
+A search space file (JSON) lists fixed `train_ppo` args and sampled ones;
+names prefixed with `env:` become `--env-param` reward overrides. Every
+trial starts on the smallest budget rung; a trial is promoted (resumed from
+its last model for the extra timesteps) once it ranks in the top `1/eta` of
+the results at its rung by rolling win rate, so weak trials stop early
+without waiting for a full synchronous bracket. Trials run as subprocesses,
+each pinned to its own CPU set with matching thread limits, and every result
+goes into `sweep_index.json` / `sweep_index.csv`.
+"""
+
+import csv
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from rl.run_comparison import load_run_metrics
+
+DISTRIBUTIONS = ("choice", "uniform", "log_uniform", "int_uniform")
+ENV_PREFIX = "env:"
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@dataclass
+class Trial:
+    trial_id: int
+    params: Dict[str, object]
+    rung: int = -1
+    status: str = "pending"
+    timesteps: int = 0
+    win_rate: Optional[float] = None
+    mean_reward: Optional[float] = None
+    episodes: int = 0
+    rung_results: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def load_search_space(path: str):
+    """Return `(fixed_args, space)` from a sweep JSON file."""
+
+    with open(path, "r", encoding="utf-8") as file_obj:
+        spec = json.load(file_obj)
+    space = spec.get("space", {})
+    for name, dimension in space.items():
+        if dimension.get("distribution") not in DISTRIBUTIONS:
+            raise ValueError(f"{name}: distribution must be one of {', '.join(DISTRIBUTIONS)}")
+    return spec.get("args", {}), space
+
+
+def sample_params(space: Dict[str, Dict], rng: np.random.Generator):
+    params = {}
+    for name, dimension in space.items():
+        kind = dimension["distribution"]
+        if kind == "choice":
+            values = dimension["values"]
+            params[name] = values[int(rng.integers(len(values)))]
+        elif kind == "uniform":
+            params[name] = float(rng.uniform(dimension["low"], dimension["high"]))
+        elif kind == "log_uniform":
+            params[name] = float(np.exp(rng.uniform(np.log(dimension["low"]), np.log(dimension["high"]))))
+        else:
+            params[name] = int(rng.integers(dimension["low"], dimension["high"] + 1))
+    return params
+
+
+def rung_budgets(min_timesteps: int, max_timesteps: int, eta: int):
+    """Cumulative timesteps per rung: min, min*eta, ... capped by (and ending at) max."""
+
+    budgets = []
+    budget = int(min_timesteps)
+    while budget < max_timesteps:
+        budgets.append(budget)
+        budget *= eta
+    budgets.append(int(max_timesteps))
+    return budgets
+
+
+def cli_args(values: Dict[str, object]):
+    args = []
+    for name, value in values.items():
+        if value is None or value is False:
+            continue
+        args.append(f"--{name}")
+        if isinstance(value, list):
+            args.extend(str(item) for item in value)
+        elif value is not True:
+            args.append(str(value))
+    return args
+
+
+def cpu_slots(workers: int, cpus_per_trial: int):
+    """Split the CPUs this process may use into `workers` sets (disjoint while CPUs suffice)."""
+
+    available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    per_trial = min(max(1, int(cpus_per_trial)), len(available))
+    return [
+        [available[(index * per_trial + offset) % len(available)] for offset in range(per_trial)]
+        for index in range(workers)
+    ]
+
+
+class SweepRunner:
+    """Schedules trials over a fixed pool of subprocess slots (asynchronous successive halving)."""
+
+    def __init__(
+        self,
+        sweep_dir: str,
+        space: Dict[str, Dict],
+        fixed_args: Dict[str, object],
+        n_trials: int,
+        workers: int,
+        cpus_per_trial: int = 1,
+        min_timesteps: int = 50_000,
+        max_timesteps: int = 400_000,
+        eta: int = 3,
+        seed: int = 0,
+        trial_timeout: Optional[float] = None,
+        extra_args: Sequence[str] = (),
+        train_script: str = "train_ppo.py",
+        poll_seconds: float = 2.0,
+    ):
+        self.sweep_dir = Path(sweep_dir)
+        self.space = space
+        self.fixed_args = dict(fixed_args)
+        self.n_trials = int(n_trials)
+        self.cpus_per_trial = max(1, int(cpus_per_trial))
+        self.slots = cpu_slots(max(1, int(workers)), self.cpus_per_trial)
+        self.budgets = rung_budgets(min_timesteps, max_timesteps, max(2, int(eta)))
+        self.eta = max(2, int(eta))
+        self.seed = int(seed)
+        self.trial_timeout = trial_timeout
+        self.extra_args = list(extra_args)
+        self.train_script = train_script
+        self.poll_seconds = float(poll_seconds)
+        self.rng = np.random.default_rng(self.seed)
+        self.trials: List[Trial] = []
+        self._promoted = set()
+        self._running: Dict[int, Dict] = {}
+
+    def trial_dir(self, trial: Trial):
+        return self.sweep_dir / f"trial_{trial.trial_id:03d}"
+
+    def command(self, trial: Trial, rung: int):
+        train_args = dict(self.fixed_args)
+        train_args.update({name: value for name, value in trial.params.items() if not name.startswith(ENV_PREFIX)})
+        start = 0 if rung == 0 else self.budgets[rung - 1]
+        train_args.update(
+            {
+                "timesteps": self.budgets[rung] - start,
+                "run-name": f"rung_{rung}",
+                "log-dir": str(self.trial_dir(trial)),
+                "seed": self.seed + trial.trial_id,
+            }
+        )
+        if rung > 0:
+            train_args["load-model"] = str(self.trial_dir(trial) / f"rung_{rung - 1}" / "models" / "final_model.zip")
+        command = [sys.executable, self.train_script] + cli_args(train_args)
+        for name, value in trial.params.items():
+            if name.startswith(ENV_PREFIX):
+                command += ["--env-param", f"{name[len(ENV_PREFIX):]}={value}"]
+        return command + self.extra_args
+
+    def _next_job(self):
+        # Promotions first, from the highest rung down: they refine the most promising trials.
+        for rung in range(len(self.budgets) - 2, -1, -1):
+            finished = [
+                trial
+                for trial in self.trials
+                if len(trial.rung_results) > rung and trial.rung_results[rung].get("win_rate") is not None
+            ]
+            quota = len(finished) // self.eta
+            ranked = sorted(
+                finished,
+                key=lambda trial: (trial.rung_results[rung]["win_rate"], trial.rung_results[rung]["mean_reward"]),
+                reverse=True,
+            )
+            for trial in ranked[:quota]:
+                if (trial.trial_id, rung) not in self._promoted and trial.status == "paused":
+                    self._promoted.add((trial.trial_id, rung))
+                    return trial, rung + 1
+        if len(self.trials) < self.n_trials:
+            trial = Trial(trial_id=len(self.trials), params=sample_params(self.space, self.rng))
+            self.trials.append(trial)
+            return trial, 0
+        return None
+
+    def _launch(self, trial: Trial, rung: int, slot: int):
+        run_dir = self.trial_dir(trial) / f"rung_{rung}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        cpus = self.slots[slot]
+        env = os.environ.copy()
+        for name in THREAD_ENV_VARS:
+            env[name] = str(self.cpus_per_trial)
+        preexec = (lambda: os.sched_setaffinity(0, cpus)) if hasattr(os, "sched_setaffinity") else None
+        log_file = open(run_dir / "train.log", "w", encoding="utf-8")
+        process = subprocess.Popen(
+            self.command(trial, rung), stdout=log_file, stderr=subprocess.STDOUT, env=env, preexec_fn=preexec
+        )
+        trial.status = "running"
+        trial.rung = rung
+        self._running[slot] = {
+            "trial": trial,
+            "rung": rung,
+            "process": process,
+            "log_file": log_file,
+            "started": time.monotonic(),
+            "run_dir": run_dir,
+        }
+        logger.info(f"Trial {trial.trial_id} rung {rung} ({self.budgets[rung]} steps) on CPUs {cpus}")
+
+    def _finish(self, slot: int, returncode: Optional[int]):
+        job = self._running.pop(slot)
+        job["log_file"].close()
+        trial, rung, run_dir = job["trial"], job["rung"], job["run_dir"]
+        result = {"rung": rung, "timesteps": self.budgets[rung], "seconds": time.monotonic() - job["started"]}
+        if returncode != 0:
+            trial.status = "failed"
+            trial.error = "timeout" if returncode is None else f"exit code {returncode} (see {run_dir / 'train.log'})"
+        else:
+            metrics = load_run_metrics(str(run_dir), str(run_dir / "metrics"), str(run_dir))
+            if metrics.error == "empty episode log":
+                # No episode finished within the budget: rank it last instead of failing it.
+                metrics.error, metrics.final_success_rate, metrics.mean_reward = None, 0.0, -math.inf
+            if metrics.error is not None:
+                trial.status = "failed"
+                trial.error = metrics.error
+            else:
+                result.update(
+                    {
+                        "win_rate": metrics.final_success_rate,
+                        "mean_reward": metrics.mean_reward,
+                        "episodes": metrics.episodes,
+                    }
+                )
+                trial.win_rate = metrics.final_success_rate
+                trial.mean_reward = metrics.mean_reward
+                trial.episodes += metrics.episodes
+                trial.timesteps = self.budgets[rung]
+                trial.status = "completed" if rung == len(self.budgets) - 1 else "paused"
+        trial.rung_results.append(result)
+        logger.info(f"Trial {trial.trial_id} rung {rung}: {trial.status}, win_rate={trial.win_rate}")
+        self.write_index()
+
+    def run(self):
+        self.sweep_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            while True:
+                for slot, job in list(self._running.items()):
+                    returncode = job["process"].poll()
+                    timed_out = self.trial_timeout is not None and time.monotonic() - job["started"] > self.trial_timeout
+                    if returncode is None and timed_out:
+                        job["process"].kill()
+                        job["process"].wait()
+                        self._finish(slot, None)
+                    elif returncode is not None:
+                        self._finish(slot, returncode)
+                free_slots = [slot for slot in range(len(self.slots)) if slot not in self._running]
+                for slot in free_slots:
+                    job = self._next_job()
+                    if job is None:
+                        break
+                    self._launch(*job, slot)
+                if not self._running:
+                    break
+                time.sleep(self.poll_seconds)
+        finally:
+            for job in self._running.values():
+                job["process"].kill()
+                job["log_file"].close()
+            for trial in self.trials:
+                if trial.status in {"paused", "running"}:
+                    trial.status = "stopped"
+            self.write_index()
+        return self.trials
+
+    def write_index(self):
+        with open(self.sweep_dir / "sweep_index.json", "w", encoding="utf-8") as file_obj:
+            json.dump(
+                {"budgets": self.budgets, "eta": self.eta, "space": self.space, "trials": [asdict(trial) for trial in self.trials]},
+                file_obj,
+                indent=2,
+            )
+        param_names = list(self.space)
+        ranked = sorted(
+            self.trials,
+            key=lambda trial: (trial.timesteps, -math.inf if trial.win_rate is None else trial.win_rate),
+            reverse=True,
+        )
+        with open(self.sweep_dir / "sweep_index.csv", "w", encoding="utf-8", newline="") as file_obj:
+            writer = csv.writer(file_obj)
+            writer.writerow(["trial_id", "status", "rung", "timesteps", "win_rate", "mean_reward", "episodes"] + param_names)
+            for trial in ranked:
+                writer.writerow(
+                    [trial.trial_id, trial.status, trial.rung, trial.timesteps, trial.win_rate, trial.mean_reward, trial.episodes]
+                    + [trial.params.get(name) for name in param_names]
+                )
@@ -0,0 +1,233 @@
+"""Training throughput telemetry: env steps/sec, wall-time split, resets and RSS.
+
+`TimedVecEnv` accumulates the time spent inside `step`/`reset` of the wrapped
+vec env, `ResetTimingWrapper` reports per-env reset latency through `info`
+(so it also works in subprocess workers), and `ThroughputCallback` is a
+`CallbackList` that times its children and splits each reporting interval
+into env stepping, policy inference (rollout time not spent in the env or in
+callbacks), PPO updates (time between rollouts) and callbacks. With
+`OverlappedPPO` the updates run on a background thread during collection, so
+its own train time is reported instead; that part overlaps the others and the
+fractions can add up to more than 1. Only a few `perf_counter` calls are
+added per step.
+"""
+
+import csv
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import gymnasium as gym
+from stable_baselines3.common.callbacks import BaseCallback, CallbackList
+from stable_baselines3.common.vec_env import VecEnvWrapper
+
+TELEMETRY_COLUMNS = [
+    "wall_time",
+    "num_timesteps",
+    "steps_per_second",
+    "env_seconds",
+    "inference_seconds",
+    "update_seconds",
+    "callback_seconds",
+    "resets",
+    "reset_ms_mean",
+    "rss_mb",
+    "children_rss_mb",
+]
+
+
+def process_rss_mb():
+    """Return `(own_rss_mb, children_rss_mb)`; children are e.g. subproc env workers."""
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        process = psutil.Process()
+        children = 0
+        for child in process.children(recursive=True):
+            try:
+                children += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return process.memory_info().rss / 2**20, children / 2**20
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as file_obj:
+            return int(file_obj.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 0.0
+    except (OSError, ValueError, AttributeError):
+        # Peak instead of current RSS; ru_maxrss is bytes on macOS and KiB elsewhere.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (2**20 if sys.platform == "darwin" else 2**10), 0.0
+
+
+class ResetTimingWrapper(gym.Wrapper):
+    """Adds `reset_seconds` to the info of the first step after each reset."""
+
+    def __init__(self, env):
+        super().__init__(env)
+        self._pending_reset_seconds: Optional[float] = None
+
+    def reset(self, **kwargs):
+        started = time.perf_counter()
+        result = self.env.reset(**kwargs)
+        self._pending_reset_seconds = time.perf_counter() - started
+        return result
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        if self._pending_reset_seconds is not None:
+            info = dict(info)
+            info["reset_seconds"] = self._pending_reset_seconds
+            self._pending_reset_seconds = None
+        return obs, reward, terminated, truncated, info
+
+
+class TimedVecEnv(VecEnvWrapper):
+    """Counts wall time spent inside the wrapped vec env and the resets it reports."""
+
+    def __init__(self, venv):
+        super().__init__(venv)
+        self.env_seconds = 0.0
+        self.resets = 0
+        self.reset_seconds = 0.0
+        self._step_started = 0.0
+
+    def reset(self):
+        started = time.perf_counter()
+        obs = self.venv.reset()
+        self.env_seconds += time.perf_counter() - started
+        return obs
+
+    def step_async(self, actions):
+        self._step_started = time.perf_counter()
+        self.venv.step_async(actions)
+
+    def step_wait(self):
+        obs, rewards, dones, infos = self.venv.step_wait()
+        self.env_seconds += time.perf_counter() - self._step_started
+        for info in infos:
+            if "reset_seconds" in info:
+                self.resets += 1
+                self.reset_seconds += info["reset_seconds"]
+        return obs, rewards, dones, infos
+
+
+class ThroughputCallback(CallbackList):
+    """`CallbackList` that also reports throughput every `interval_seconds` to TensorBoard and CSV."""
+
+    def __init__(self, callbacks: List[BaseCallback], metrics_dir: str, interval_seconds: float = 30.0, filename: str = "throughput.csv"):
+        super().__init__(callbacks)
+        self.metrics_file = Path(metrics_dir) / filename
+        self.interval_seconds = float(interval_seconds)
+        self._csv_file = None
+        self._csv_writer = None
+        self._callback_seconds = 0.0
+        self._update_seconds = 0.0
+        self._rollout_ended: Optional[float] = None
+        self._mark = None
+
+    def _timed_env(self) -> Optional[TimedVecEnv]:
+        env = self.training_env
+        while env is not None:
+            if isinstance(env, TimedVecEnv):
+                return env
+            env = getattr(env, "venv", None)
+        return None
+
+    def _snapshot(self):
+        env = self._timed_env()
+        return {
+            "time": time.perf_counter(),
+            "timesteps": self.num_timesteps,
+            "env_seconds": env.env_seconds if env is not None else 0.0,
+            "resets": env.resets if env is not None else 0,
+            "reset_seconds": env.reset_seconds if env is not None else 0.0,
+            "callback_seconds": self._callback_seconds,
+            "update_seconds": self._update_seconds,
+            "overlap_train_seconds": getattr(self.model, "train_seconds_total", None),
+        }
+
+    def _on_training_start(self) -> None:
+        super()._on_training_start()
+        self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not self.metrics_file.exists()
+        self._csv_file = open(self.metrics_file, "a", newline="", encoding="utf-8")
+        self._csv_writer = csv.writer(self._csv_file)
+        if write_header:
+            self._csv_writer.writerow(TELEMETRY_COLUMNS)
+        self._mark = self._snapshot()
+
+    def _on_rollout_start(self) -> None:
+        if self._rollout_ended is not None:
+            self._update_seconds += time.perf_counter() - self._rollout_ended
+            self._rollout_ended = None
+        super()._on_rollout_start()
+
+    def _on_rollout_end(self) -> None:
+        super()._on_rollout_end()
+        self._rollout_ended = time.perf_counter()
+
+    def _on_step(self) -> bool:
+        started = time.perf_counter()
+        continue_training = super()._on_step()
+        self._callback_seconds += time.perf_counter() - started
+        if self.interval_seconds > 0 and started - self._mark["time"] >= self.interval_seconds:
+            self.report()
+        return continue_training
+
+    def report(self):
+        current = self._snapshot()
+        previous, self._mark = self._mark, current
+        elapsed = max(1e-9, current["time"] - previous["time"])
+        env_seconds = current["env_seconds"] - previous["env_seconds"]
+        callback_seconds = current["callback_seconds"] - previous["callback_seconds"]
+        update_seconds = current["update_seconds"] - previous["update_seconds"]
+        inference_seconds = max(0.0, elapsed - env_seconds - callback_seconds - update_seconds)
+        if current["overlap_train_seconds"] is not None:
+            # Between rollouts OverlappedPPO only waits for its train thread; count the thread instead.
+            update_seconds = current["overlap_train_seconds"] - previous["overlap_train_seconds"]
+        resets = current["resets"] - previous["resets"]
+        reset_ms = 1000.0 * (current["reset_seconds"] - previous["reset_seconds"]) / resets if resets else 0.0
+        steps_per_second = (current["timesteps"] - previous["timesteps"]) / elapsed
+        rss_mb, children_rss_mb = process_rss_mb()
+
+        self.logger.record("throughput/steps_per_second", steps_per_second)
+        self.logger.record("throughput/env_fraction", env_seconds / elapsed)
+        self.logger.record("throughput/inference_fraction", inference_seconds / elapsed)
+        self.logger.record("throughput/update_fraction", update_seconds / elapsed)
+        self.logger.record("throughput/callback_fraction", callback_seconds / elapsed)
+        self.logger.record("throughput/resets", resets)
+        self.logger.record("throughput/reset_ms_mean", reset_ms)
+        self.logger.record("throughput/rss_mb", rss_mb)
+        if children_rss_mb:
+            self.logger.record("throughput/children_rss_mb", children_rss_mb)
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(
+                [
+                    round(time.time(), 3),
+                    current["timesteps"],
+                    round(steps_per_second, 2),
+                    round(env_seconds, 4),
+                    round(inference_seconds, 4),
+                    round(update_seconds, 4),
+                    round(callback_seconds, 4),
+                    resets,
+                    round(reset_ms, 3),
+                    round(rss_mb, 1),
+                    round(children_rss_mb, 1),
+                ]
+            )
+            self._csv_file.flush()
+
+    def _on_training_end(self) -> None:
+        super()._on_training_end()
+        if self._mark is not None and self.num_timesteps > self._mark["timesteps"]:
+            self.report()
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
@@ -1,50 +1,66 @@
 """Custom SB3 callback that persists per-episode metrics to CSV and TensorBoard."""
 
 import csv
+import time
 from collections import deque
 from pathlib import Path
 
 from stable_baselines3.common.callbacks import BaseCallback
 
+from rl.episode_log import EPISODE_COLUMN_NAMES, ColumnarEpisodeWriter
+
 
 class EpisodeMetricsCallback(BaseCallback):
-    """Collects episode-level diagnostics for later plotting and comparisons."""
+    """Collects episode-level diagnostics for later plotting and comparisons.
+
+    Rows are buffered and written through one file handle that stays open for
+    the whole `learn` call; the buffer is flushed every `flush_rows` rows or
+    `flush_seconds` seconds, whichever comes first, and on training end.
+    """
 
-    def __init__(self, metrics_dir: str, filename: str = "episodes.csv", window_size: int = 100, verbose: int = 0):
+    def __init__(
+        self,
+        metrics_dir: str,
+        filename: str = "episodes.csv",
+        window_size: int = 100,
+        verbose: int = 0,
+        episode_log: str = "csv",
+        flush_rows: int = 512,
+        flush_seconds: float = 10.0,
+    ):
         super().__init__(verbose)
+        if episode_log not in {"csv", "columnar", "both"}:
+            raise ValueError(f"Unsupported episode_log: {episode_log}")
         self.metrics_dir = Path(metrics_dir)
         self.filename = filename
         self.window_size = window_size
+        self.episode_log = episode_log
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_seconds = float(flush_seconds)
         self._rows = []
         self._recent_wins = deque(maxlen=window_size)
+        self._csv_file = None
+        self._csv_writer = None
+        self._columnar_writer = None
+        self._last_flush = time.monotonic()
+
+    @property
+    def columnar_dir(self):
+        return self.metrics_dir / (Path(self.filename).stem + ".cols")
 
     def _on_training_start(self) -> None:
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
         self.metrics_file = self.metrics_dir / self.filename
-        if not self.metrics_file.exists():
-            self._write_header()
-
-    def _write_header(self):
-        with open(self.metrics_file, "w", newline="", encoding="utf-8") as file_obj:
-            writer = csv.writer(file_obj)
-            writer.writerow(
-                [
-                    "num_timesteps",
-                    "episode_reward",
-                    "episode_length",
-                    "is_win",
-                    "is_dead",
-                    "max_progress_x",
-                    "goal_distance",
-                    "checkpoint_index",
-                    "jump_rate",
-                    "noop_rate",
-                    "left_rate",
-                    "right_rate",
-                    "hazard_ignore_rate",
-                    "hazard_reaction_rate",
-                ]
-            )
+        if self.episode_log in {"csv", "both"}:
+            write_header = not self.metrics_file.exists()
+            self._csv_file = open(self.metrics_file, "a", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._csv_file)
+            if write_header:
+                self._csv_writer.writerow(EPISODE_COLUMN_NAMES)
+                self._csv_file.flush()
+        if self.episode_log in {"columnar", "both"}:
+            self._columnar_writer = ColumnarEpisodeWriter(str(self.columnar_dir)).open()
+        self._last_flush = time.monotonic()
 
     def _on_step(self) -> bool:
         infos = self.locals.get("infos", [])
@@ -84,7 +100,10 @@ class EpisodeMetricsCallback(BaseCallback):
                 hazard_reaction_rate,
             ]
             self._rows.append(row)
-            self._recent_wins.append(is_win)
+            # Episodes started from the start-state archive skip part of the level; keep them out
+            # of the rolling win rate that curriculum stages advance on.
+            if not info.get("archive_start", False):
+                self._recent_wins.append(is_win)
 
             self.logger.record("rollout/episode_reward", reward)
             self.logger.record("rollout/episode_length", length)
@@ -97,12 +116,64 @@ class EpisodeMetricsCallback(BaseCallback):
             self.logger.record("rollout/right_rate", right_rate)
             self.logger.record("rollout/hazard_ignore_rate", hazard_ignore_rate)
             self.logger.record("rollout/hazard_reaction_rate", hazard_reaction_rate)
-            self.logger.record("rollout/win_rate_100", sum(self._recent_wins) / len(self._recent_wins))
+            self.logger.record("rollout/win_rate_100", self.win_rate)
+
+            level_path = info.get("level_path")
+            if level_path is not None:
+                level_key = f"levels/{Path(level_path).stem}"
+                self.logger.record(f"{level_key}/failure_rate", float(info.get("level_failure_rate", 0.0)))
+                self.logger.record(f"{level_key}/progress_mean", float(info.get("level_progress_mean", 0.0)))
+                self.logger.record(f"{level_key}/sample_prob", float(info.get("level_sample_prob", 0.0)))
+
+            if "archive_cells" in info:
+                self.logger.record("archive/cells", float(info["archive_cells"]))
+                self.logger.record("archive/states", float(info["archive_states"]))
+                if info.get("archive_start", False):
+                    self.logger.record("archive/start_cell", float(info["archive_start_cell"]))
+                    self.logger.record("archive/start_cell_death_rate", float(info["archive_cell_death_rate"]))
+                    self.logger.record("archive/start_cell_sample_prob", float(info["archive_cell_sample_prob"]))
+
+        if self._rows and (
+            len(self._rows) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self._flush()
+
+        return True
+
+    @property
+    def win_rate(self):
+        """Win rate over the last `window_size` finished episodes (0.0 before the first one)."""
+
+        if not self._recent_wins:
+            return 0.0
+        return sum(self._recent_wins) / len(self._recent_wins)
+
+    @property
+    def window_episodes(self):
+        return len(self._recent_wins)
 
+    def _flush(self):
         if self._rows:
-            with open(self.metrics_file, "a", newline="", encoding="utf-8") as file_obj:
-                writer = csv.writer(file_obj)
-                writer.writerows(self._rows)
+            if self._csv_writer is not None:
+                self._csv_writer.writerows(self._rows)
+                self._csv_file.flush()
+            if self._columnar_writer is not None:
+                self._columnar_writer.extend(self._rows)
+                self._columnar_writer.flush()
             self._rows.clear()
+        self._last_flush = time.monotonic()
 
-        return True
+    def _on_training_end(self) -> None:
+        self.close()
+
+    def close(self):
+        """Write buffered rows and close the logs; safe to call more than once."""
+
+        self._flush()
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        if self._columnar_writer is not None:
+            self._columnar_writer.close()
+            self._columnar_writer = None
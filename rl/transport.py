@@ -0,0 +1,87 @@
+"""Length-prefixed pickle frames over TCP or Unix domain sockets.
+
+Addresses are `host:port` for TCP or `unix:/path/to.sock`. Frames are
+unauthenticated pickles, so only expose a learner on trusted networks.
+"""
+
+import os
+import pickle
+import socket
+import struct
+import time
+from typing import Optional
+
+_HEADER = struct.Struct("!Q")
+
+
+def parse_address(address: str):
+    """Return `(socket_family, sockaddr)` for a `host:port` or `unix:/path` address."""
+
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Expected host:port or unix:/path, got {address!r}")
+    return socket.AF_INET, (host, int(port))
+
+
+def listen(address: str, backlog: int = 16) -> socket.socket:
+    family, sockaddr = parse_address(address)
+    server = socket.socket(family, socket.SOCK_STREAM)
+    if family == socket.AF_UNIX:
+        if os.path.exists(sockaddr):
+            os.unlink(sockaddr)
+    else:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(sockaddr)
+    server.listen(backlog)
+    return server
+
+
+def connect(address: str, timeout: float = 60.0) -> socket.socket:
+    """Connect to `address`, retrying until `timeout` so actors may start before the learner."""
+
+    family, sockaddr = parse_address(address)
+    deadline = time.monotonic() + timeout
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(sockaddr)
+        except OSError:
+            sock.close()
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.2)
+            continue
+        if family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+
+def send_frame(sock: socket.socket, message):
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytearray]:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            return None
+        received += count
+    return buffer
+
+
+def recv_frame(sock: socket.socket):
+    """Return the next message, or None once the peer closed the connection."""
+
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    payload = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+    return pickle.loads(payload)
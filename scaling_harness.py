@@ -0,0 +1,80 @@
+"""Measure how GameSession reset/step/observation cost scales with level width and entity density."""
+
+import argparse
+import csv
+import json
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+from rl.scaling import fit_sweeps, format_report, results_as_dicts, run_sweep
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Synthesize levels of growing size/density and fit cost curves.")
+    parser.add_argument("--widths", type=int, nargs="+", default=[70, 140, 280, 560, 1120], help="Level widths in tiles.")
+    parser.add_argument(
+        "--enemy-densities",
+        type=float,
+        nargs="+",
+        default=[0.01, 0.03, 0.1, 0.2, 0.4],
+        help="Fraction of columns with a ground enemy (at --base-width).",
+    )
+    parser.add_argument(
+        "--block-densities",
+        type=float,
+        nargs="+",
+        default=[0.05, 0.15, 0.3, 0.6],
+        help="Fraction of columns with a platform block (at --base-width).",
+    )
+    parser.add_argument("--base-width", type=int, default=280, help="Width used by the density sweeps.")
+    parser.add_argument("--base-enemy-density", type=float, default=0.03)
+    parser.add_argument("--base-block-density", type=float, default=0.15)
+    parser.add_argument("--steps", type=int, default=300, help="Timed steps per level.")
+    parser.add_argument("--resets", type=int, default=5, help="Timed resets per level.")
+    parser.add_argument("--frame-skip", type=int, default=2)
+    parser.add_argument("--output-dir", default=f"runs/scaling_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    output_dir = Path(args.output_dir)
+    level_dir = output_dir / "levels"
+    sweeps = {
+        "width": [
+            {"width_tiles": width, "enemy_density": args.base_enemy_density, "block_density": args.base_block_density}
+            for width in args.widths
+        ],
+        "enemies": [
+            {"width_tiles": args.base_width, "enemy_density": density, "block_density": args.base_block_density}
+            for density in args.enemy_densities
+        ],
+        "blocks": [
+            {"width_tiles": args.base_width, "enemy_density": args.base_enemy_density, "block_density": density}
+            for density in args.block_densities
+        ],
+    }
+    results = []
+    for name, configs in sweeps.items():
+        logger.info(f"Scaling sweep '{name}': {len(configs)} levels")
+        results.extend(run_sweep(name, configs, level_dir, args.steps, args.resets, args.frame_skip, seed=args.seed))
+    fits = fit_sweeps(results)
+
+    rows = results_as_dicts(results)
+    with open(output_dir / "scaling_results.csv", "w", encoding="utf-8", newline="") as file_obj:
+        writer = csv.DictWriter(file_obj, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(output_dir / "scaling_report.json", "w", encoding="utf-8") as file_obj:
+        json.dump({"settings": vars(args), "results": rows, "fits": fits}, file_obj, indent=2)
+    report = format_report(results, fits)
+    (output_dir / "scaling_report.txt").write_text(report, encoding="utf-8")
+    print(report)
+    print(f"Results in: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
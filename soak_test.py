@@ -0,0 +1,108 @@
+"""Soak PirateGameEnv with random/adversarial play in parallel and check gameplay invariants."""
+
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from rl.soak import ACTION_MODES, TIMELINE_COLUMNS, SoakSettings, replay_trace, soak_worker
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Long randomized soak test of the game env with invariant checks.")
+    parser.add_argument("--levels", nargs="+", default=None, help="Level files to cycle through (default: level*.txt).")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel soak processes (one env each).")
+    parser.add_argument("--steps", type=int, default=1_000_000, help="Env steps per worker.")
+    parser.add_argument("--action-mode", default="mixed", choices=list(ACTION_MODES))
+    parser.add_argument("--action-preset", default="full", choices=["forward", "simple", "full"])
+    parser.add_argument("--obs-profile", default="balanced", choices=["balanced", "legacy"])
+    parser.add_argument("--frame-skip", type=int, default=2)
+    parser.add_argument("--max-episode-steps", type=int, default=1800)
+    parser.add_argument("--max-bullets", type=int, default=64, help="Live bullets above this count are a violation.")
+    parser.add_argument(
+        "--solid-grace-frames",
+        type=int,
+        default=1,
+        help="Frames the player may overlap a solid (landing overshoot) before it is a violation; 0 = strict.",
+    )
+    parser.add_argument("--max-rss-growth-mb", type=float, default=256.0, help="RSS growth per worker that counts as a leak.")
+    parser.add_argument("--max-violations", type=int, default=5, help="Stop a worker after this many violations.")
+    parser.add_argument("--max-replays", type=int, default=400, help="Replay budget for shrinking one violation trace.")
+    parser.add_argument("--report-seconds", type=float, default=30.0, help="Cadence of the steps/sec + RSS timeline.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default=f"runs/soak_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    parser.add_argument("--replay", default=None, metavar="TRACE", help="Replay one violation trace JSON and exit.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.replay:
+        result = replay_trace(args.replay)
+        if result is None:
+            print(f"{args.replay}: no violation (fixed or not reproducible)")
+            return
+        print(f"{args.replay}: {result[0]} at step {result[2]}: {result[1]}")
+        sys.exit(1)
+
+    level_paths = args.levels or sorted(glob.glob("level*.txt"))
+    if not level_paths:
+        raise FileNotFoundError("No level files to soak.")
+    settings = SoakSettings(
+        level_paths=level_paths,
+        frame_skip=args.frame_skip,
+        max_episode_steps=args.max_episode_steps,
+        action_preset=args.action_preset,
+        obs_profile=args.obs_profile,
+        action_mode=args.action_mode,
+        max_bullets=args.max_bullets,
+        solid_grace_frames=args.solid_grace_frames,
+    )
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, args.workers)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(
+                soak_worker,
+                worker_id,
+                settings,
+                args.steps,
+                args.seed,
+                str(output_dir),
+                args.report_seconds,
+                args.max_violations,
+                args.max_rss_growth_mb,
+                args.max_replays,
+            )
+            for worker_id in range(workers)
+        ]
+        summaries = [future.result() for future in futures]
+
+    with open(output_dir / "soak_timeline.csv", "w", newline="", encoding="utf-8") as merged:
+        writer = csv.writer(merged)
+        writer.writerow(TIMELINE_COLUMNS)
+        for worker_id in range(workers):
+            with open(output_dir / f"timeline_worker_{worker_id}.csv", "r", encoding="utf-8") as file_obj:
+                writer.writerows(list(csv.reader(file_obj))[1:])
+    violations = [violation for summary in summaries for violation in summary["violations"]]
+    with open(output_dir / "soak_summary.json", "w", encoding="utf-8") as file_obj:
+        json.dump({"settings": vars(args), "levels": level_paths, "workers": summaries}, file_obj, indent=2)
+
+    total_steps = sum(summary["steps"] for summary in summaries)
+    print(f"Soaked {total_steps} steps over {workers} workers ({sum(s['steps_per_second'] for s in summaries):.0f} steps/s total)")
+    for violation in violations:
+        print(f"VIOLATION {violation['invariant']}: {violation['message']} -> {violation['trace']}")
+    print(f"Results in: {output_dir}")
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
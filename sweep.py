@@ -0,0 +1,89 @@
+"""CLI entrypoint for parallel hyperparameter sweeps over train_ppo.py."""
+
+import argparse
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+from rl.sweep import SweepRunner, load_search_space, sample_params
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Run a train_ppo.py sweep with asynchronous successive halving.",
+        epilog="Unrecognized arguments are passed to every train_ppo.py trial unchanged.",
+    )
+    parser.add_argument("--space", required=True, help="Sweep JSON with fixed 'args' and sampled 'space' entries.")
+    parser.add_argument("--trials", type=int, default=100, help="Number of sampled configurations.")
+    parser.add_argument(
+        "--cpus-per-trial",
+        type=int,
+        default=1,
+        help="CPUs each trial is pinned to; also sets OMP/MKL/OpenBLAS thread counts.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Concurrent trials (default: available CPUs // --cpus-per-trial).",
+    )
+    parser.add_argument("--min-timesteps", type=int, default=50_000, help="Budget of the first rung.")
+    parser.add_argument("--max-timesteps", type=int, default=400_000, help="Budget of the last rung.")
+    parser.add_argument("--eta", type=int, default=3, help="Keep the top 1/eta at each rung; budgets grow by eta.")
+    parser.add_argument("--trial-timeout", type=float, default=None, help="Kill a rung after this many seconds.")
+    parser.add_argument("--sweep-name", default=f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    parser.add_argument("--log-dir", default="runs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dry-run", action="store_true", help="Print the first sampled trial commands and exit.")
+    return parser.parse_known_args()
+
+
+def main():
+    args, train_args = parse_args()
+    fixed_args, space = load_search_space(args.space)
+    available = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    workers = args.workers or max(1, available // max(1, args.cpus_per_trial))
+    sweep_dir = Path(args.log_dir) / args.sweep_name
+    runner = SweepRunner(
+        str(sweep_dir),
+        space,
+        fixed_args,
+        n_trials=args.trials,
+        workers=workers,
+        cpus_per_trial=args.cpus_per_trial,
+        min_timesteps=args.min_timesteps,
+        max_timesteps=args.max_timesteps,
+        eta=args.eta,
+        seed=args.seed,
+        trial_timeout=args.trial_timeout,
+        extra_args=train_args,
+    )
+    if args.dry_run:
+        from rl.sweep import Trial
+
+        print(f"Rung budgets: {runner.budgets}, workers: {workers}, CPU sets: {runner.slots}")
+        for trial_id in range(min(3, args.trials)):
+            trial = Trial(trial_id=trial_id, params=sample_params(space, runner.rng))
+            print(" ".join(runner.command(trial, 0)))
+        return
+
+    sweep_dir.mkdir(parents=True, exist_ok=True)
+    with open(sweep_dir / "sweep_config.json", "w", encoding="utf-8") as file_obj:
+        json.dump({**vars(args), "workers": workers, "train_args": train_args}, file_obj, indent=2, sort_keys=True)
+    trials = runner.run()
+    completed = sorted(
+        (trial for trial in trials if trial.status == "completed"),
+        key=lambda trial: trial.win_rate,
+        reverse=True,
+    )
+    logger.info(f"Sweep finished: {len(completed)}/{len(trials)} trials reached {runner.budgets[-1]} steps")
+    for trial in completed[:5]:
+        print(f"trial_{trial.trial_id:03d}: win_rate={trial.win_rate:.3f} mean_reward={trial.mean_reward:.2f} {trial.params}")
+    print(f"Sweep index: {sweep_dir / 'sweep_index.csv'}")
+
+
+if __name__ == "__main__":
+    main()
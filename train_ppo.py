@@ -6,24 +6,21 @@ import random
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import numpy as np
-import torch
 from loguru import logger
-from stable_baselines3 import PPO
-from stable_baselines3.common.callbacks import CallbackList, CheckpointCallback, EvalCallback
-from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.utils import get_schedule_fn, set_random_seed
-from stable_baselines3.common.vec_env import DummyVecEnv
 
-from rl.pirate_game_env import PirateGameEnv
-from rl.training_metrics import EpisodeMetricsCallback
+# torch, stable-baselines3 and the game modules are imported where they are first used,
+# so `--help` and freshly spawned env workers don't pay for the whole training stack.
+if TYPE_CHECKING:
+    from stable_baselines3 import PPO
 
 
 def detect_device():
     """Pick the fastest available backend on the current machine."""
 
+    import torch
+
     if torch.backends.mps.is_available():
         return "mps"
     if torch.cuda.is_available():
@@ -38,10 +35,27 @@ def make_env(
     frame_skip: int,
     action_preset: str,
     obs_profile: str,
+    level_pool: Optional[list] = None,
+    level_sampling: str = "prioritized",
+    reward_overrides: Optional[dict] = None,
+    cpu_affinity: Optional[list] = None,
+    start_archive: Optional[dict] = None,
 ):
-    """Create one monitored environment factory for SB3 vectorized wrappers."""
+    """Create one monitored environment factory for SB3 vectorized wrappers.
+
+    `cpu_affinity` pins the process that runs the factory (a subproc env worker).
+    """
 
     def _factory():
+        from stable_baselines3.common.monitor import Monitor
+
+        if cpu_affinity:
+            from rl.resources import pin_current_process
+
+            pin_current_process(cpu_affinity, torch_threads=1)
+
+        from rl.pirate_game_env import PirateGameEnv
+
         env = PirateGameEnv(
             level_path=level_path,
             headless=headless,
@@ -50,13 +64,39 @@ def make_env(
             frame_skip=frame_skip,
             action_preset=action_preset,
             obs_profile=obs_profile,
+            level_pool=level_pool,
+            level_sampling=level_sampling,
+            reward_overrides=reward_overrides,
+            start_archive=start_archive,
         )
-        return Monitor(env)
+        from rl.telemetry import ResetTimingWrapper
+
+        return ResetTimingWrapper(Monitor(env))
 
     return _factory
 
 
-def build_vec_env(args, level_path: str, num_envs: int, seed: int):
+def build_vec_env(
+    args,
+    level_path: str,
+    num_envs: int,
+    seed: int,
+    level_pool: Optional[list] = None,
+    level_sampling: str = "prioritized",
+    timed: bool = False,
+    start_archive: Optional[dict] = None,
+):
+    """Build the training/eval vec env; `timed` wraps it in `TimedVecEnv` for throughput telemetry.
+
+    `start_archive` gives every env its own start-state archive (training envs only).
+    """
+
+    from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+
+    num_envs = max(1, int(num_envs))
+    use_subproc = args.vec_env == "subproc" and num_envs > 1
+    plan = args.resource_plan or {}
+    env_cores = plan.get("env_cores") if use_subproc else None
     factories = [
         make_env(
             level_path,
@@ -65,20 +105,85 @@ def build_vec_env(args, level_path: str, num_envs: int, seed: int):
             args.frame_skip,
             args.action_preset,
             args.obs_profile,
+            level_pool,
+            level_sampling,
+            args.reward_overrides,
+            env_cores[index % len(env_cores)] if env_cores else None,
+            start_archive,
         )
-        for _ in range(max(1, int(num_envs)))
+        for index in range(num_envs)
     ]
-    vec_env = DummyVecEnv(factories)
+    vec_env = SubprocVecEnv(factories) if use_subproc else DummyVecEnv(factories)
+    if timed:
+        from rl.telemetry import TimedVecEnv
+
+        vec_env = TimedVecEnv(vec_env)
     vec_env.seed(int(seed))
     return vec_env
 
 
+def build_eval_env(args, level_path: str, seed: int, level_pool: Optional[list] = None):
+    """Single-env eval vec env, or None when evaluation runs in a background process."""
+
+    if args.eval_mode == "async":
+        return None
+    # Evaluation cycles through a level pool so every level is scored alike. Wrapped like the
+    # training env under telemetry, since EvalCallback warns when the two vec env types differ.
+    return build_vec_env(args, level_path, 1, seed, level_pool, "sequential", timed=args.telemetry_seconds > 0)
+
+
+def async_eval_options(args, level_path: str, seed: int, level_pool: Optional[list] = None):
+    if args.eval_mode != "async":
+        return None
+    return {
+        "env_kwargs": {
+            "level_path": level_path,
+            "headless": True,
+            "render_mode": "none",
+            "max_episode_steps": args.max_episode_steps,
+            "frame_skip": args.frame_skip,
+            "action_preset": args.action_preset,
+            "obs_profile": args.obs_profile,
+            "level_pool": level_pool,
+            "level_sampling": "sequential",
+            "reward_overrides": args.reward_overrides,
+        },
+        "n_envs": args.eval_envs,
+        "seed": seed,
+    }
+
+
+def start_archive_settings(args) -> Optional[dict]:
+    """`StartStateArchive` keyword arguments from the CLI, or None without `--start-archive`."""
+
+    if not args.start_archive:
+        return None
+    return {
+        "cell_width": args.archive_cell_width,
+        "states_per_cell": args.archive_states_per_cell,
+        "start_prob": args.archive_start_prob,
+        "death_weight": args.archive_death_weight,
+    }
+
+
 def parse_optional_float(value: Optional[str]):
     if value is None:
         return None
     return float(value)
 
 
+def parse_env_params(values):
+    """Turn repeated `NAME=VALUE` strings into a reward-override dict."""
+
+    overrides = {}
+    for item in values or []:
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"Expected NAME=VALUE, got {item!r}")
+        overrides[name.strip()] = float(value)
+    return overrides
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Train PPO agent for the 2D Jump'n'Run game.")
     parser.add_argument("--level-path", default="level.txt")
@@ -103,11 +208,70 @@ def parse_args():
     parser.add_argument("--max-episode-steps", type=int, default=1800)
     parser.add_argument("--eval-freq", type=int, default=10_000)
     parser.add_argument("--eval-episodes", type=int, default=10)
+    parser.add_argument(
+        "--eval-mode",
+        default="sync",
+        choices=["sync", "async"],
+        help="'async' evaluates policy snapshots in a background process while training continues.",
+    )
+    parser.add_argument("--eval-envs", type=int, default=4, help="Envs stepped together by the async evaluator.")
     parser.add_argument("--checkpoint-freq", type=int, default=50_000)
+    parser.add_argument(
+        "--checkpoint-writer",
+        default="background",
+        choices=["sync", "background"],
+        help="'background' copies weights on the training thread and writes checkpoint zips from a writer thread.",
+    )
+    parser.add_argument(
+        "--checkpoint-keep-last",
+        type=int,
+        default=0,
+        help="Prune periodic checkpoints to this many per directory (newest first); 0 (default) keeps every checkpoint.",
+    )
+    parser.add_argument(
+        "--checkpoint-keep-best",
+        type=int,
+        default=3,
+        help="With --checkpoint-keep-last, also keep the checkpoints with the best latest eval mean reward.",
+    )
+    parser.add_argument(
+        "--no-checkpoint-thinning",
+        action="store_true",
+        help="Do not keep one older checkpoint per power-of-two age bucket.",
+    )
+    parser.add_argument(
+        "--checkpoint-tensor-store",
+        action="store_true",
+        help=(
+            "Share unchanged weight tensors of stage/final models in models/tensors/. Those zips then need "
+            "rl.checkpoints.open_checkpoint (not plain PPO.load) and must stay next to their store."
+        ),
+    )
     parser.add_argument("--learning-rate", type=float, default=2.5e-4)
     parser.add_argument("--n-steps", type=int, default=1024)
     parser.add_argument("--batch-size", type=int, default=256)
     parser.add_argument("--num-envs", type=int, default=1, help="Number of parallel environments for training.")
+    parser.add_argument(
+        "--vec-env",
+        default="dummy",
+        choices=["dummy", "subproc"],
+        help="Step training envs in this process or in one worker process each.",
+    )
+    parser.add_argument(
+        "--resources",
+        default="auto",
+        choices=["auto", "autotune", "off"],
+        help="Plan torch threads and core affinity ('autotune' times candidate layouts first; 'off' leaves defaults).",
+    )
+    parser.add_argument(
+        "--concurrent-runs",
+        type=int,
+        default=1,
+        help="Training runs sharing this machine; each plans within its 1/N share of the cores.",
+    )
+    parser.add_argument("--run-slot", type=int, default=0, help="Which core share (0..concurrent-runs-1) this run uses.")
+    parser.add_argument("--torch-threads", type=int, default=None, help="Override the planned torch intra-op threads.")
+    parser.add_argument("--autotune-steps", type=int, default=4096, help="Timesteps measured per autotune candidate.")
     parser.add_argument("--gamma", type=float, default=0.99)
     parser.add_argument("--gae-lambda", type=float, default=0.95)
     parser.add_argument("--ent-coef", type=float, default=0.005)
@@ -141,6 +305,52 @@ def parse_args():
         action="store_true",
         help="Show SB3 progress bar (small overhead).",
     )
+    parser.add_argument(
+        "--episode-log",
+        default="csv",
+        choices=["csv", "columnar", "both"],
+        help="Episode metrics format: CSV, memory-mappable columnar log (metrics/episodes.cols), or both.",
+    )
+    parser.add_argument(
+        "--metrics-flush-seconds",
+        type=float,
+        default=10.0,
+        help="Maximum time buffered episode rows wait before being written to disk.",
+    )
+    parser.add_argument(
+        "--telemetry-seconds",
+        type=float,
+        default=30.0,
+        help="Cadence of throughput telemetry (steps/s, time split, resets, RSS) in metrics/throughput.csv; 0 = off.",
+    )
+    parser.add_argument(
+        "--memory-monitor",
+        action="store_true",
+        help=(
+            "Track memory growth per env reset (tracemalloc, live game objects) and RSS per stage in metrics/. "
+            "Tracing slows the process it runs in; use --vec-env subproc to keep it out of the learner."
+        ),
+    )
+    parser.add_argument("--memory-every-resets", type=int, default=50, help="Resets between memory samples per process.")
+    parser.add_argument(
+        "--memory-growth-kb",
+        type=float,
+        default=64.0,
+        help="Warn when traced memory grows by more than this many KiB per reset.",
+    )
+    parser.add_argument(
+        "--profile",
+        default="off",
+        choices=["off", "cprofile", "sampling"],
+        help="Profile a window of the run into <run>/profiles (.prof and collapsed stacks), env workers included.",
+    )
+    parser.add_argument("--profile-start", type=int, default=10_000, help="Timestep at which the profile window opens.")
+    parser.add_argument(
+        "--profile-steps",
+        type=int,
+        default=10_000,
+        help="Timesteps covered by the profile window; 0 = until the run ends.",
+    )
     parser.add_argument(
         "--curriculum",
         action="store_true",
@@ -158,6 +368,121 @@ def parse_args():
         default=120_000,
         help="Number of timesteps on medium level before full level.",
     )
+    parser.add_argument(
+        "--curriculum-levels",
+        nargs="+",
+        default=None,
+        metavar="LEVEL",
+        help=(
+            "Ordered level files for a win-rate driven curriculum. Each stage but the last advances once "
+            "the win rate reaches --curriculum-threshold; the last stage uses the remaining --timesteps."
+        ),
+    )
+    parser.add_argument(
+        "--curriculum-threshold",
+        type=float,
+        default=0.8,
+        help="Win rate needed to leave a --curriculum-levels stage.",
+    )
+    parser.add_argument(
+        "--curriculum-signal",
+        default="rollout",
+        choices=["rollout", "eval"],
+        help="Win-rate source: rolling training episodes (window 100) or the latest evaluation.",
+    )
+    parser.add_argument(
+        "--curriculum-min-steps",
+        type=int,
+        default=20_000,
+        help="Minimum timesteps per --curriculum-levels stage before the threshold is checked.",
+    )
+    parser.add_argument(
+        "--curriculum-max-steps",
+        type=int,
+        default=200_000,
+        help="Maximum timesteps per --curriculum-levels stage before advancing anyway.",
+    )
+    parser.add_argument(
+        "--curriculum-min-episodes",
+        type=int,
+        default=20,
+        help="Minimum episodes in the rolling window before the rollout win rate is trusted.",
+    )
+    parser.add_argument(
+        "--level-pool",
+        nargs="+",
+        default=None,
+        metavar="LEVEL",
+        help="Train on several levels at once; each episode picks one (see --level-sampling).",
+    )
+    parser.add_argument(
+        "--level-sampling",
+        default="prioritized",
+        choices=["prioritized", "uniform", "sequential"],
+        help="Level choice per episode: favor recently failed/high-variance levels, uniform, or round-robin.",
+    )
+    parser.add_argument(
+        "--start-archive",
+        action="store_true",
+        help="Start some training episodes from saved states deeper in the level (Go-Explore style resets).",
+    )
+    parser.add_argument(
+        "--archive-start-prob",
+        type=float,
+        default=0.5,
+        help="Share of training resets that start from the archive once it has states.",
+    )
+    parser.add_argument(
+        "--archive-death-weight",
+        type=float,
+        default=0.7,
+        help="Blend of archive cell choice: 0 = uniform over cells, 1 = proportional to cell death rate.",
+    )
+    parser.add_argument("--archive-cell-width", type=float, default=240.0, help="Progress cell width in px (60 px per tile).")
+    parser.add_argument("--archive-states-per-cell", type=int, default=8, help="Saved states kept per cell (reservoir).")
+    parser.add_argument(
+        "--env-param",
+        action="append",
+        default=None,
+        metavar="NAME=VALUE",
+        help="Override a PirateGameEnv reward constant (e.g. checkpoint_bonus=4.0); repeatable.",
+    )
+    parser.add_argument(
+        "--overlap-training",
+        action="store_true",
+        help="Collect the next rollout with the previous policy while PPO optimizes the current one.",
+    )
+    parser.add_argument(
+        "--actor-learner",
+        action="store_true",
+        help="Learn from rollout actors that connect over sockets instead of stepping envs in this process.",
+    )
+    parser.add_argument(
+        "--learner-address",
+        default="127.0.0.1:5555",
+        help="Learner listen address (host:port or unix:/path). Use 0.0.0.0:<port> for actors on other nodes.",
+    )
+    parser.add_argument("--actors", type=int, default=2, help="Rollout actors the learner waits for.")
+    parser.add_argument(
+        "--local-actors",
+        type=int,
+        default=None,
+        help="Actors spawned on this machine by the learner (default: --actors; 0 = all remote).",
+    )
+    parser.add_argument("--actor-envs", type=int, default=4, help="Envs stepped by each rollout actor.")
+    parser.add_argument(
+        "--max-policy-lag",
+        type=int,
+        default=1,
+        help="Policy versions an actor batch may lag behind the learner before it is dropped.",
+    )
+    parser.add_argument(
+        "--actor-connect",
+        default=None,
+        metavar="ADDRESS",
+        help="Run only as a rollout actor for the learner at ADDRESS; env settings come from the learner.",
+    )
+    parser.add_argument("--actor-id", default=None, help="Actor name reported to the learner (default: host-pid).")
     parser.add_argument(
         "--load-model",
         default=None,
@@ -169,7 +494,27 @@ def parse_args():
         default=42,
         help="Global random seed for reproducible training/evaluation behavior.",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    args.resource_plan = None
+    try:
+        args.reward_overrides = parse_env_params(args.env_param)
+    except ValueError as exc:
+        parser.error(f"--env-param: {exc}")
+    if args.reward_overrides:
+        from rl.pirate_game_env import REWARD_PARAMETERS
+
+        unknown = sorted(set(args.reward_overrides) - set(REWARD_PARAMETERS))
+        if unknown:
+            parser.error(f"--env-param: unknown reward parameter(s) {', '.join(unknown)}")
+    if args.curriculum and args.curriculum_levels:
+        parser.error("--curriculum and --curriculum-levels are mutually exclusive.")
+    if args.level_pool and (args.curriculum or args.curriculum_levels):
+        parser.error("--level-pool cannot be combined with a curriculum.")
+    if args.actor_learner and (args.curriculum or args.curriculum_levels):
+        parser.error("--actor-learner cannot be combined with a curriculum.")
+    if args.actor_learner and args.overlap_training:
+        parser.error("--overlap-training does not apply to --actor-learner (actors already overlap).")
+    return args
 
 
 def configure_game_logging(level: str):
@@ -187,12 +532,75 @@ def warn_if_loading_model(args):
 
 
 def seed_everything(seed: int):
+    import numpy as np
+    import torch
+    from stable_baselines3.common.utils import set_random_seed
+
     seed = int(seed)
     random.seed(seed)
     np.random.seed(seed)
     set_random_seed(seed, using_cuda=torch.cuda.is_available())
 
 
+def measure_layout(args, device: str, plan) -> float:
+    """Steps/sec of a short PPO run with `plan`'s vec-env backend, threads and affinity."""
+
+    import copy
+    import time
+
+    from stable_baselines3 import PPO
+
+    from rl.resources import pin_current_process
+
+    trial_args = copy.copy(args)
+    trial_args.vec_env = plan.vec_env
+    trial_args.resource_plan = plan.to_dict()
+    pin_current_process(plan.learner_cores, plan.torch_threads)
+    vec_env = build_vec_env(
+        trial_args,
+        args.level_path,
+        args.num_envs,
+        args.seed,
+        args.level_pool,
+        args.level_sampling,
+        start_archive=start_archive_settings(args),
+    )
+    try:
+        model = PPO(
+            "MlpPolicy",
+            vec_env,
+            n_steps=args.n_steps,
+            batch_size=args.batch_size,
+            device=device,
+            seed=args.seed,
+            verbose=0,
+        )
+        started = time.perf_counter()
+        model.learn(total_timesteps=args.autotune_steps)
+        return model.num_timesteps / (time.perf_counter() - started)
+    finally:
+        vec_env.close()
+
+
+def configure_resources(args, device: str):
+    """Pick and apply a `ResourcePlan`; returns it as a dict for `config.json`."""
+
+    if args.resources == "off":
+        return None
+    from rl.resources import apply_plan, autotune, candidate_plans, plan_resources
+
+    if args.resources == "autotune":
+        plans = candidate_plans(args.num_envs, args.concurrent_runs, args.run_slot)
+        if args.torch_threads:
+            plans = [plan for plan in plans if plan.torch_threads == args.torch_threads] or plans
+        plan = autotune(plans, lambda candidate: measure_layout(args, device, candidate))
+        args.vec_env = plan.vec_env
+    else:
+        plan = plan_resources(args.num_envs, args.vec_env, args.concurrent_runs, args.run_slot, args.torch_threads)
+    apply_plan(plan)
+    return plan.to_dict()
+
+
 def write_run_config(args, run_dir: Path, device: str):
     """Persist all resolved CLI settings for reproducible reruns and debugging."""
 
@@ -204,8 +612,36 @@ def write_run_config(args, run_dir: Path, device: str):
         json.dump(config_data, file_obj, indent=2, sort_keys=True)
 
 
-def build_callbacks(run_dir: Path, eval_env, eval_freq: int, eval_episodes: int, checkpoint_freq: int):
-    """Create eval/checkpoint/custom-metrics callbacks for one stage."""
+def build_callbacks(
+    run_dir: Path,
+    eval_env,
+    eval_freq: int,
+    eval_episodes: int,
+    checkpoint_freq: int,
+    episode_log: str = "csv",
+    metrics_flush_seconds: float = 10.0,
+    stage_control: Optional[dict] = None,
+    async_eval: Optional[dict] = None,
+    checkpoint_manager=None,
+    telemetry_seconds: float = 0.0,
+    profile_window=None,
+):
+    """Create eval/checkpoint/custom-metrics callbacks for one stage.
+
+    `stage_control` holds `WinRateStageCallback` settings; when given, the stage ends
+    as soon as its win-rate threshold or step budget is reached. `async_eval` (from
+    `async_eval_options`) replaces the blocking `EvalCallback` with `AsyncEvalCallback`.
+    Periodic checkpoints go through `checkpoint_manager` (retention + background writes)
+    when given, otherwise through SB3's `CheckpointCallback`. With `telemetry_seconds > 0`
+    the list is a `ThroughputCallback` writing `metrics/throughput.csv` at that cadence.
+    `profile_window` (shared by all stages) is advanced with the model's timesteps.
+    The returned list exposes the `WinRateStageCallback` (or None) as `stage_callback`.
+    """
+
+    from stable_baselines3.common.callbacks import CallbackList, CheckpointCallback, EvalCallback
+
+    from rl.checkpoints import ManagedCheckpointCallback
+    from rl.training_metrics import EpisodeMetricsCallback
 
     checkpoints_dir = run_dir / "checkpoints"
     eval_dir = run_dir / "eval"
@@ -213,33 +649,95 @@ def build_callbacks(run_dir: Path, eval_env, eval_freq: int, eval_episodes: int,
     for path in [checkpoints_dir, eval_dir, metrics_dir]:
         path.mkdir(parents=True, exist_ok=True)
 
-    return CallbackList(
-        [
-            EvalCallback(
-                eval_env,
-                best_model_save_path=str(checkpoints_dir),
-                log_path=str(eval_dir),
-                eval_freq=eval_freq,
-                n_eval_episodes=eval_episodes,
-                deterministic=True,
-                render=False,
-            ),
-            CheckpointCallback(
-                save_freq=checkpoint_freq,
-                save_path=str(checkpoints_dir),
-                name_prefix="ppo_checkpoint",
-                save_replay_buffer=False,
-                save_vecnormalize=False,
-            ),
-            EpisodeMetricsCallback(metrics_dir=str(metrics_dir), filename="episodes.csv", window_size=100),
-        ]
+    if async_eval is not None:
+        from rl.async_eval import AsyncEvalCallback
+
+        eval_callback = AsyncEvalCallback(
+            best_model_save_path=str(checkpoints_dir),
+            log_path=str(eval_dir),
+            eval_freq=eval_freq,
+            n_eval_episodes=eval_episodes,
+            deterministic=True,
+            **async_eval,
+        )
+    else:
+        eval_callback = EvalCallback(
+            eval_env,
+            best_model_save_path=str(checkpoints_dir),
+            log_path=str(eval_dir),
+            eval_freq=eval_freq,
+            n_eval_episodes=eval_episodes,
+            deterministic=True,
+            render=False,
+        )
+    metrics_callback = EpisodeMetricsCallback(
+        metrics_dir=str(metrics_dir),
+        filename="episodes.csv",
+        window_size=100,
+        episode_log=episode_log,
+        flush_seconds=metrics_flush_seconds,
+    )
+    if checkpoint_manager is not None:
+        checkpoint_callback = ManagedCheckpointCallback(
+            checkpoint_manager,
+            save_freq=checkpoint_freq,
+            save_path=str(checkpoints_dir),
+            name_prefix="ppo_checkpoint",
+            eval_callback=eval_callback,
+        )
+    else:
+        checkpoint_callback = CheckpointCallback(
+            save_freq=checkpoint_freq,
+            save_path=str(checkpoints_dir),
+            name_prefix="ppo_checkpoint",
+            save_replay_buffer=False,
+            save_vecnormalize=False,
+        )
+    callbacks = [eval_callback, checkpoint_callback, metrics_callback]
+    stage_callback = None
+    if stage_control is not None:
+        from rl.curriculum import WinRateStageCallback
+
+        stage_callback = WinRateStageCallback(metrics_callback=metrics_callback, eval_callback=eval_callback, **stage_control)
+        callbacks.append(stage_callback)
+    if profile_window is not None:
+        from rl.profiling import ProfileCallback
+
+        callbacks.append(ProfileCallback(profile_window))
+    if telemetry_seconds > 0:
+        from rl.telemetry import ThroughputCallback
+
+        callback_list = ThroughputCallback(callbacks, str(metrics_dir), telemetry_seconds)
+    else:
+        callback_list = CallbackList(callbacks)
+    callback_list.stage_callback = stage_callback
+    callback_list.metrics_callback = metrics_callback
+    return callback_list
+
+
+def build_checkpoint_manager(args):
+    from rl.checkpoints import CheckpointManager
+
+    return CheckpointManager(
+        keep_last=args.checkpoint_keep_last,
+        keep_best=args.checkpoint_keep_best,
+        log_thinning=not args.no_checkpoint_thinning,
+        background=args.checkpoint_writer == "background",
+        tensor_store=args.checkpoint_tensor_store,
     )
 
 
 def build_model(args, train_env, device: str, tensorboard_dir: Path):
+    from stable_baselines3 import PPO
+
+    if args.overlap_training:
+        from rl.overlapped_ppo import OverlappedPPO as PPO  # noqa: F811
+
     if args.load_model:
+        from rl.checkpoints import open_checkpoint
+
         model = PPO.load(
-            args.load_model,
+            open_checkpoint(args.load_model),
             env=train_env,
             device=device,
             tensorboard_log=str(tensorboard_dir),
@@ -264,9 +762,11 @@ def build_model(args, train_env, device: str, tensorboard_dir: Path):
     )
 
 
-def apply_loaded_model_overrides(model: PPO, args):
+def apply_loaded_model_overrides(model: "PPO", args):
     """Re-apply selected CLI hyperparameters after loading a checkpoint."""
 
+    from stable_baselines3.common.utils import get_schedule_fn
+
     lr = float(args.learning_rate)
     model.learning_rate = lr
     model.lr_schedule = get_schedule_fn(lr)
@@ -292,14 +792,16 @@ def apply_loaded_model_overrides(model: PPO, args):
         )
 
 
-def apply_stage_entropy(model: PPO, value: Optional[float], stage_name: str):
+def apply_stage_entropy(model: "PPO", value: Optional[float], stage_name: str):
     if value is None:
         return
     model.ent_coef = float(value)
     logger.info(f"Set ent_coef for stage '{stage_name}' to {model.ent_coef}")
 
 
-def apply_stage_learning_rate(model: PPO, value: float, stage_name: str):
+def apply_stage_learning_rate(model: "PPO", value: float, stage_name: str):
+    from stable_baselines3.common.utils import get_schedule_fn
+
     lr = float(value)
     model.learning_rate = lr
     model.lr_schedule = get_schedule_fn(lr)
@@ -309,7 +811,116 @@ def apply_stage_learning_rate(model: PPO, value: float, stage_name: str):
     logger.info(f"Set learning_rate for stage '{stage_name}' to {lr}")
 
 
-def train_stage(model: PPO, timesteps: int, callbacks, progress_bar: bool, reset_num_timesteps: bool):
+def switch_level(model: "PPO", train_env, eval_env, level_path: str, seed: int):
+    """Move the existing train/eval vec envs to another level instead of rebuilding them.
+
+    `PirateGameEnv` keeps a `level_path` passed through reset options, so one
+    vec-env-wide reset is enough. The fresh observations replace the model's
+    rollout state, exactly as `set_env` + `learn` would after a rebuild.
+    """
+
+    import numpy as np
+
+    for vec_env, env_seed in [(train_env, seed), (eval_env, seed + 1_000)]:
+        if vec_env is None:
+            continue
+        vec_env.set_options({"level_path": level_path})
+        vec_env.seed(int(env_seed))
+    model._last_obs = train_env.reset()
+    model._last_episode_starts = np.ones((train_env.num_envs,), dtype=bool)
+    if eval_env is not None:
+        eval_env.reset()
+    logger.info(f"Switched train/eval envs to level '{level_path}'")
+
+
+def actor_env_kwargs(args):
+    return {
+        "level_path": args.level_path,
+        "headless": True,
+        "render_mode": "none",
+        "max_episode_steps": args.max_episode_steps,
+        "frame_skip": args.frame_skip,
+        "action_preset": args.action_preset,
+        "obs_profile": args.obs_profile,
+        "level_pool": args.level_pool,
+        "level_sampling": args.level_sampling,
+        "reward_overrides": args.reward_overrides,
+        "start_archive": start_archive_settings(args),
+    }
+
+
+def run_actor_learner(args, model: "PPO", run_dir: Path, checkpoint_manager, profile_window=None):
+    """Serve PPO updates to `--actors` socket actors, spawning `--local-actors` of them here."""
+
+    import multiprocessing
+
+    from rl.actor_learner import ActorLearner
+    from rl.rollout_actor import run_actor
+
+    learner = ActorLearner(
+        model,
+        args.learner_address,
+        args.actors,
+        actor_env_kwargs(args),
+        args.actor_envs,
+        seed=args.seed,
+        max_policy_lag=args.max_policy_lag,
+    )
+    local_count = args.actors if args.local_actors is None else min(args.local_actors, args.actors)
+    context = multiprocessing.get_context("spawn")
+    local_actors = [
+        context.Process(target=run_actor, args=(args.learner_address, f"local-{index}"), daemon=True)
+        for index in range(local_count)
+    ]
+    learner.listen()
+    try:
+        for process in local_actors:
+            process.start()
+        learner.accept_actors()
+        checkpoints_dir = run_dir / "checkpoints"
+        checkpoints_dir.mkdir(parents=True, exist_ok=True)
+        learner.learn(args.timesteps, checkpoint_manager, args.checkpoint_freq, str(checkpoints_dir), profile_window)
+    finally:
+        learner.close()
+        for process in local_actors:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+
+def configure_profiling(args, run_dir: Path):
+    """Return the learner's profile window and ask env workers / actors to profile theirs.
+
+    Child processes count their own env steps, so their window is the run's
+    window divided by the number of processes sharing the timesteps.
+    """
+
+    if args.profile == "off":
+        return None
+    from rl.profiling import ProfileWindow, enable_process_profiling
+
+    profiles_dir = run_dir / "profiles"
+    stop = args.profile_start + args.profile_steps if args.profile_steps > 0 else None
+    processes = args.actors if args.actor_learner else args.num_envs
+    enable_process_profiling(
+        args.profile,
+        str(profiles_dir),
+        args.profile_start // processes,
+        None if stop is None else max(1, stop // processes),
+        name="actor" if args.actor_learner else "env_worker",
+    )
+    return ProfileWindow(args.profile, str(profiles_dir), args.profile_start, stop, name="learner")
+
+
+def log_stage_memory(args, run_dir: Path, stage: str, model: "PPO"):
+    if not args.memory_monitor or model is None:
+        return
+    from rl.memory import record_stage_memory
+
+    record_stage_memory(str(run_dir / "metrics"), stage, model.num_timesteps)
+
+
+def train_stage(model: "PPO", timesteps: int, callbacks, progress_bar: bool, reset_num_timesteps: bool):
     if timesteps <= 0:
         return
     model.learn(
@@ -323,6 +934,26 @@ def train_stage(model: PPO, timesteps: int, callbacks, progress_bar: bool, reset
 def main():
     args = parse_args()
     configure_game_logging(args.game_log_level)
+    if args.actor_connect:
+        import os
+        import socket
+
+        from rl.rollout_actor import run_actor
+
+        if args.profile != "off":
+            from rl.profiling import enable_process_profiling
+
+            stop = args.profile_start + args.profile_steps if args.profile_steps > 0 else None
+            enable_process_profiling(
+                args.profile,
+                str(Path(args.log_dir) / "actor_profiles"),
+                args.profile_start,
+                stop,
+                name="actor",
+                include_current=True,
+            )
+        run_actor(args.actor_connect, args.actor_id or f"{socket.gethostname()}-{os.getpid()}")
+        return
     warn_if_loading_model(args)
     run_dir = Path(args.log_dir) / args.run_name
     tensorboard_dir = run_dir / "tb"
@@ -333,29 +964,142 @@ def main():
         path.mkdir(parents=True, exist_ok=True)
 
     device = detect_device()
+    # Planned (and possibly autotuned) before seeding so tuning runs don't shift the RNG streams.
+    args.resource_plan = configure_resources(args, device)
     seed_everything(args.seed)
     write_run_config(args, run_dir, device)
+    checkpoint_manager = build_checkpoint_manager(args)
+    profile_window = configure_profiling(args, run_dir)
+    if args.memory_monitor:
+        from rl.memory import enable_process_memory_monitor
+
+        # Set before any env exists so subproc workers (and in-process envs) pick it up. The
+        # learner only traces itself when its training envs run in-process; tracing slows torch too.
+        in_process = not args.actor_learner and not (args.vec_env == "subproc" and args.num_envs > 1)
+        if in_process:
+            logger.warning("Memory monitor traces the learner process (in-process envs); expect training to run several times slower.")
+        enable_process_memory_monitor(
+            str(run_dir / "metrics"),
+            args.memory_every_resets,
+            args.memory_growth_kb,
+            name="env_worker",
+            include_parent=in_process,
+        )
     model = None
     interrupted = False
+    # Every vec env built here; stages reuse them and they are closed once training ends.
+    open_envs = []
+    # Episode logs buffer rows; they are flushed in `finally` too so an interrupt or crash keeps them.
+    open_metrics = []
 
     try:
-        if args.curriculum:
+        if args.curriculum_levels:
+            # Stage schedule: listed levels in order, each left as soon as it is mastered.
+            stage_log = []
+            remaining_steps = args.timesteps
+            for stage_index, level_path in enumerate(args.curriculum_levels):
+                if remaining_steps <= 0:
+                    break
+                stage_name = f"{stage_index:02d}_{Path(level_path).stem}"
+                is_last_stage = stage_index == len(args.curriculum_levels) - 1
+                stage_steps = remaining_steps if is_last_stage else min(args.curriculum_max_steps, remaining_steps)
+                stage_control = None
+                if not is_last_stage:
+                    stage_control = {
+                        "threshold": args.curriculum_threshold,
+                        "min_steps": args.curriculum_min_steps,
+                        "max_steps": stage_steps,
+                        "signal": args.curriculum_signal,
+                        "min_episodes": args.curriculum_min_episodes,
+                    }
+
+                stage_seed = args.seed + 2_000 * stage_index
+                if model is None:
+                    train_env = build_vec_env(
+                        args,
+                        level_path,
+                        args.num_envs,
+                        stage_seed,
+                        timed=args.telemetry_seconds > 0,
+                        start_archive=start_archive_settings(args),
+                    )
+                    eval_env = build_eval_env(args, level_path, stage_seed + 1_000)
+                    open_envs.extend([train_env, eval_env])
+                    model = build_model(args, train_env, device, tensorboard_dir / "curriculum")
+                else:
+                    switch_level(model, train_env, eval_env, level_path, stage_seed)
+                stage_callbacks = build_callbacks(
+                    run_dir / f"curriculum_{stage_name}",
+                    eval_env,
+                    args.eval_freq,
+                    args.eval_episodes,
+                    args.checkpoint_freq,
+                    args.episode_log,
+                    args.metrics_flush_seconds,
+                    stage_control,
+                    async_eval_options(args, level_path, stage_seed + 1_000),
+                    checkpoint_manager,
+                    args.telemetry_seconds,
+                    profile_window,
+                )
+                open_metrics.append(stage_callbacks.metrics_callback)
+                apply_stage_learning_rate(model, args.learning_rate, stage_name)
+                apply_stage_entropy(model, args.ent_coef, stage_name)
+
+                start_steps = 0 if stage_index == 0 else model.num_timesteps
+                train_stage(model, stage_steps, stage_callbacks, args.progress_bar, reset_num_timesteps=stage_index == 0)
+                used_steps = model.num_timesteps - start_steps
+                remaining_steps -= used_steps
+                checkpoint_manager.save(model, str(models_dir / f"curriculum_{stage_name}_model"))
+                log_stage_memory(args, run_dir, stage_name, model)
+
+                stage_callback = stage_callbacks.stage_callback
+                win_rate = stage_callback.current_win_rate()[0] if stage_callback is not None else None
+                stage_log.append(
+                    {
+                        "stage": stage_name,
+                        "level_path": level_path,
+                        "timesteps": int(used_steps),
+                        "end_timesteps": int(model.num_timesteps),
+                        "win_rate": win_rate,
+                        "reason": stage_callback.stop_reason if stage_callback is not None else "final_stage",
+                    }
+                )
+                logger.info(f"Curriculum stage '{stage_name}' finished after {used_steps} steps: {stage_log[-1]}")
+                with open(run_dir / "curriculum_stages.json", "w", encoding="utf-8") as file_obj:
+                    json.dump(stage_log, file_obj, indent=2)
+        elif args.curriculum:
             # Stage schedule: easy -> medium -> full.
             easy_steps = min(args.curriculum_easy_steps, args.timesteps)
             remaining_after_easy = max(0, args.timesteps - easy_steps)
             medium_steps = min(args.curriculum_medium_steps, remaining_after_easy)
             full_steps = max(0, remaining_after_easy - medium_steps)
 
-            easy_train_env = build_vec_env(args, args.easy_level_path, args.num_envs, args.seed)
-            easy_eval_env = build_vec_env(args, args.easy_level_path, 1, args.seed + 1_000)
+            train_env = build_vec_env(
+                args,
+                args.easy_level_path,
+                args.num_envs,
+                args.seed,
+                timed=args.telemetry_seconds > 0,
+                start_archive=start_archive_settings(args),
+            )
+            eval_env = build_eval_env(args, args.easy_level_path, args.seed + 1_000)
+            open_envs.extend([train_env, eval_env])
             easy_callbacks = build_callbacks(
                 run_dir / "curriculum_easy",
-                easy_eval_env,
+                eval_env,
                 args.eval_freq,
                 args.eval_episodes,
                 args.checkpoint_freq,
+                args.episode_log,
+                args.metrics_flush_seconds,
+                async_eval=async_eval_options(args, args.easy_level_path, args.seed + 1_000),
+                checkpoint_manager=checkpoint_manager,
+                telemetry_seconds=args.telemetry_seconds,
+                profile_window=profile_window,
             )
-            model = build_model(args, easy_train_env, device, tensorboard_dir / "easy")
+            open_metrics.append(easy_callbacks.metrics_callback)
+            model = build_model(args, train_env, device, tensorboard_dir / "easy")
             apply_stage_learning_rate(model, args.learning_rate, "easy")
             apply_stage_entropy(
                 model,
@@ -363,19 +1107,25 @@ def main():
                 "easy",
             )
             train_stage(model, easy_steps, easy_callbacks, args.progress_bar, reset_num_timesteps=True)
-            model.save(str(models_dir / "curriculum_easy_model"))
+            checkpoint_manager.save(model, str(models_dir / "curriculum_easy_model"))
+            log_stage_memory(args, run_dir, "easy", model)
 
             if medium_steps > 0:
-                medium_train_env = build_vec_env(args, args.medium_level_path, args.num_envs, args.seed + 2_000)
-                medium_eval_env = build_vec_env(args, args.medium_level_path, 1, args.seed + 3_000)
-                model.set_env(medium_train_env)
+                switch_level(model, train_env, eval_env, args.medium_level_path, args.seed + 2_000)
                 medium_callbacks = build_callbacks(
                     run_dir / "curriculum_medium",
-                    medium_eval_env,
+                    eval_env,
                     args.eval_freq,
                     args.eval_episodes,
                     args.checkpoint_freq,
+                    args.episode_log,
+                    args.metrics_flush_seconds,
+                    async_eval=async_eval_options(args, args.medium_level_path, args.seed + 3_000),
+                    checkpoint_manager=checkpoint_manager,
+                    telemetry_seconds=args.telemetry_seconds,
+                    profile_window=profile_window,
                 )
+                open_metrics.append(medium_callbacks.metrics_callback)
                 apply_stage_learning_rate(model, args.learning_rate, "medium")
                 apply_stage_entropy(
                     model,
@@ -383,19 +1133,25 @@ def main():
                     "medium",
                 )
                 train_stage(model, medium_steps, medium_callbacks, args.progress_bar, reset_num_timesteps=False)
-                model.save(str(models_dir / "curriculum_medium_model"))
+                checkpoint_manager.save(model, str(models_dir / "curriculum_medium_model"))
+                log_stage_memory(args, run_dir, "medium", model)
 
             if full_steps > 0:
-                full_train_env = build_vec_env(args, args.level_path, args.num_envs, args.seed + 4_000)
-                full_eval_env = build_vec_env(args, args.level_path, 1, args.seed + 5_000)
-                model.set_env(full_train_env)
+                switch_level(model, train_env, eval_env, args.level_path, args.seed + 4_000)
                 full_callbacks = build_callbacks(
                     run_dir / "curriculum_full",
-                    full_eval_env,
+                    eval_env,
                     args.eval_freq,
                     args.eval_episodes,
                     args.checkpoint_freq,
+                    args.episode_log,
+                    args.metrics_flush_seconds,
+                    async_eval=async_eval_options(args, args.level_path, args.seed + 5_000),
+                    checkpoint_manager=checkpoint_manager,
+                    telemetry_seconds=args.telemetry_seconds,
+                    profile_window=profile_window,
                 )
+                open_metrics.append(full_callbacks.metrics_callback)
                 apply_stage_learning_rate(model, args.learning_rate, "full")
                 apply_stage_entropy(
                     model,
@@ -403,25 +1159,70 @@ def main():
                     "full",
                 )
                 train_stage(model, full_steps, full_callbacks, args.progress_bar, reset_num_timesteps=False)
+                log_stage_memory(args, run_dir, "full", model)
+        elif args.actor_learner:
+            # Only provides spaces for the model; transitions come from the actors.
+            train_env = build_vec_env(args, args.level_path, 1, args.seed)
+            open_envs.append(train_env)
+            model = build_model(args, train_env, device, tensorboard_dir / "actor_learner")
+            apply_stage_learning_rate(model, args.learning_rate, "main")
+            apply_stage_entropy(model, args.ent_coef, "main")
+            run_actor_learner(args, model, run_dir, checkpoint_manager, profile_window)
+            log_stage_memory(args, run_dir, "actor_learner", model)
         else:
-            train_env = build_vec_env(args, args.level_path, args.num_envs, args.seed)
-            eval_env = build_vec_env(args, args.level_path, 1, args.seed + 1_000)
-            callbacks = build_callbacks(run_dir, eval_env, args.eval_freq, args.eval_episodes, args.checkpoint_freq)
+            train_env = build_vec_env(
+                args,
+                args.level_path,
+                args.num_envs,
+                args.seed,
+                args.level_pool,
+                args.level_sampling,
+                timed=args.telemetry_seconds > 0,
+                start_archive=start_archive_settings(args),
+            )
+            eval_env = build_eval_env(args, args.level_path, args.seed + 1_000, args.level_pool)
+            open_envs.extend([train_env, eval_env])
+            callbacks = build_callbacks(
+                run_dir,
+                eval_env,
+                args.eval_freq,
+                args.eval_episodes,
+                args.checkpoint_freq,
+                args.episode_log,
+                args.metrics_flush_seconds,
+                async_eval=async_eval_options(args, args.level_path, args.seed + 1_000, args.level_pool),
+                checkpoint_manager=checkpoint_manager,
+                telemetry_seconds=args.telemetry_seconds,
+                profile_window=profile_window,
+            )
+            open_metrics.append(callbacks.metrics_callback)
             model = build_model(args, train_env, device, tensorboard_dir / "main")
             apply_stage_learning_rate(model, args.learning_rate, "main")
             apply_stage_entropy(model, args.ent_coef, "main")
             train_stage(model, args.timesteps, callbacks, args.progress_bar, reset_num_timesteps=True)
+            log_stage_memory(args, run_dir, "main", model)
     except KeyboardInterrupt:
         interrupted = True
         print("Training interrupted by user.")
+    finally:
+        for vec_env in open_envs:
+            if vec_env is not None:
+                vec_env.close()
+        if profile_window is not None:
+            profile_window.close()
+        for metrics_callback in open_metrics:
+            metrics_callback.close()
+        # The writer is a daemon thread; without this, a crash would drop the queued stage checkpoints.
+        # Saves after close() are written synchronously.
+        checkpoint_manager.close()
 
     if model is not None:
         if interrupted:
             interrupted_path = models_dir / "interrupted_model"
-            model.save(str(interrupted_path))
+            checkpoint_manager.save(model, str(interrupted_path))
             print(f"Interrupted model saved to: {interrupted_path}.zip")
         else:
-            model.save(str(models_dir / "final_model"))
+            checkpoint_manager.save(model, str(models_dir / "final_model"))
             print(f"Training complete. Artifacts in: {run_dir}")
 
     print(f"Selected device: {device}")
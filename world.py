@@ -21,13 +21,50 @@
 import os
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 import pygame
+from loguru import logger
 
-from enemy import *
-from object import *
+from enemy import Enemy
+from object import Chest
 
-bg_img = pygame.image.load('img/background_img/bg.jpg')
-bg_img = pygame.transform.scale(bg_img, (1520, 800))
 position = (0, 0)
+_image_cache = {}   # lazily loaded background/block images shared by all worlds in this process
+
+
+def load_background():
+    """load_background:
+        * loads and scales the background image on first use and caches it for the process
+
+    Args:
+        none
+
+    Returns:
+        * pygame.Surface: scaled background image
+
+    """
+
+    if "background" not in _image_cache:
+        bg_img = pygame.image.load('img/background_img/bg.jpg')
+        _image_cache["background"] = pygame.transform.scale(bg_img, (1520, 800))
+    return _image_cache["background"]
+
+
+def load_block_image(block_size):
+    """load_block_image:
+        * loads and scales the block image on first use per block size
+
+    Args:
+        * block_size (int): size of the blocks
+
+    Returns:
+        * pygame.Surface: scaled block image
+
+    """
+
+    key = ("block", block_size)
+    if key not in _image_cache:
+        block_img = pygame.image.load('img/ground_img/spaceground.png')
+        _image_cache[key] = pygame.transform.scale(block_img, (block_size, block_size))
+    return _image_cache[key]
 
 
 class World:
@@ -81,8 +118,7 @@ class World:
         self.chunkEnemyGroup = pygame.sprite.Group()        # pygamegroup for enemies in chunks near player
         self.chestGroup = pygame.sprite.Group()     # pygamegroup for chests
 
-        self.block_img = pygame.image.load('img/ground_img/spaceground.png')    # load block image
-        self.block_img = pygame.transform.scale(self.block_img, (block_size, block_size))   # scale block image
+        self.block_img = load_block_image(block_size)    # load (cached) block image scaled to block size
 
         self.initializeWorld()
         logger.info("Created world object")
@@ -175,7 +211,7 @@ class World:
         """
 
         self.check_player_collision_bottomblock(self.player.playerPos)
-        screen.blit(bg_img, position)       # renders background image
+        screen.blit(load_background(), position)       # renders background image
         self.update(screen) 
 
 